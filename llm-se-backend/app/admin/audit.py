@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.admin.documents import require_admin
+from app.audit.logger import audit_writer_stats
+from app.auth.authentication import authenticate_user
+from app.config import AUDIT_INDEX_ENABLED
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _require_index():
+    if not AUDIT_INDEX_ENABLED:
+        raise HTTPException(
+            status_code=404,
+            detail="Audit index disabled (AUDIT_INDEX_ENABLED=0)",
+        )
+
+
+@router.get("/audit")
+def list_audit_events(
+    username: Optional[str] = None,
+    department: Optional[str] = None,
+    decision_mode: Optional[str] = Query(None, description="answer | soft_answer | no_info"),
+    source: Optional[str] = Query(None, description="PDF filename, e.g. GAN.pdf"),
+    llm_called: Optional[bool] = None,
+    since: Optional[datetime] = Query(None, description="UTC, inclusive"),
+    until: Optional[datetime] = Query(None, description="UTC, exclusive"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Paginated audit events (newest first) from the indexed store,
+    e.g. all queries by user X last week that hit source Y.
+    """
+    require_admin(user)
+    _require_index()
+
+    from app.audit.store import query_events
+
+    return query_events(
+        page=page,
+        page_size=page_size,
+        username=username,
+        department=department,
+        decision_mode=decision_mode,
+        source=source,
+        llm_called=llm_called,
+        since=since,
+        until=until,
+    )
+
+
+@router.get("/audit/summary")
+def audit_summary(
+    group_by: str = Query("department", pattern="^(department|username|decision_mode)$"),
+    username: Optional[str] = None,
+    department: Optional[str] = None,
+    source: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="UTC, inclusive"),
+    until: Optional[datetime] = Query(None, description="UTC, exclusive"),
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Aggregate counts per group, e.g. LLM-call rate per department.
+    """
+    require_admin(user)
+    _require_index()
+
+    from app.audit.store import aggregate_events
+
+    return {
+        "group_by": group_by,
+        "groups": aggregate_events(
+            group_by=group_by,
+            username=username,
+            department=department,
+            source=source,
+            since=since,
+            until=until,
+        ),
+    }
+
+
+@router.get("/audit/writer")
+def audit_writer(
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Queue depth and written / dropped counters of the audit writer.
+    """
+    require_admin(user)
+
+    return audit_writer_stats()
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+
+from app.auth.authentication import authenticate_user
+from app.admin.documents import require_admin
+from app.config import ANSWER_CACHE_ENABLED, EMBED_CACHE_ENABLED, USER_CACHE_ENABLED
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/cache/stats")
+def cache_stats(
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Hit / miss counters of the in-process caches.
+    """
+    require_admin(user)
+
+    embeddings = {"enabled": EMBED_CACHE_ENABLED}
+    if EMBED_CACHE_ENABLED:
+        from app.embeddings.cache import get_embedding_cache
+
+        embeddings.update(get_embedding_cache().stats())
+
+    answers = {"enabled": ANSWER_CACHE_ENABLED}
+    if ANSWER_CACHE_ENABLED:
+        from app.llm.answer_cache import get_answer_cache
+
+        answers.update(get_answer_cache().stats())
+
+    users = {"enabled": USER_CACHE_ENABLED}
+    if USER_CACHE_ENABLED:
+        from app.auth.user_cache import get_user_cache
+
+        users.update(get_user_cache().stats())
+
+    return {
+        "embeddings": embeddings,
+        "answers": answers,
+        "users": users,
+    }
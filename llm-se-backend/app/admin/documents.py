@@ -1,8 +1,24 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query
-from collections import defaultdict
 
+from app.admin.registry import (
+    list_registered_documents,
+    record_permissions,
+    remove_document,
+)
 from app.auth.authentication import authenticate_user
-from app.retrieval.chroma_client import get_chroma_collection
+from app.config import CHROMA_PARTITIONED, CHROMA_WRITE_BATCH_SIZE, LEXICAL_ENABLED
+from app.models.admin_documents import DocumentPermissionsUpdate
+from app.retrieval.corpus import bump_corpus_version
+from app.retrieval.lexical import get_lexical_index
+from app.retrieval.partitions import (
+    all_collections,
+    corpus_count,
+    list_partitions,
+    partition_name,
+    write_collection,
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -17,37 +33,29 @@ def require_admin(user: dict):
 
 @router.get("/documents")
 def list_documents(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    sort: str = Query("source", pattern="^(source|ingested_at|chunk_count|size_bytes|owner_department)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    owner_department: Optional[str] = None,
     user: dict = Depends(authenticate_user),
 ):
     """
     Admin-only.
-    Lists all documents currently stored in Chroma,
-    grouped by source (PDF filename).
+    Lists ingested documents (one per source PDF filename) from the
+    SQL document registry: chunk count, RBAC metadata, content hash,
+    byte size and ingest time. Paginated and sortable; Chroma is not
+    touched.
     """
     require_admin(user)
 
-    collection = get_chroma_collection()
-
-    results = collection.get(include=["metadatas"])
-    metadatas = results.get("metadatas", [])
-
-    documents = defaultdict(lambda: {
-        "chunks": 0,
-        "owner_department": None,
-        "min_role_level": None,
-        "min_clearance_level": None,
-    })
-
-    for meta in metadatas:
-        source = meta.get("source", "unknown")
-        documents[source]["chunks"] += 1
-        documents[source]["owner_department"] = meta.get("owner_department")
-        documents[source]["min_role_level"] = meta.get("min_role_level")
-        documents[source]["min_clearance_level"] = meta.get("min_clearance_level")
-
-    return {
-        "documents": documents
-    }
+    return list_registered_documents(
+        page=page,
+        page_size=page_size,
+        sort=sort,
+        order=order,
+        owner_department=owner_department,
+    )
 
 
 @router.delete("/documents")
@@ -57,19 +65,24 @@ def delete_document(
 ):
     """
     Admin-only.
-    Deletes all chunks belonging to a document (by source filename).
+    Deletes all chunks belonging to a document (by source filename),
+    from every partition in partitioned mode.
     """
     require_admin(user)
 
-    collection = get_chroma_collection()
+    before = corpus_count()
 
-    before = collection.count()
+    for collection in all_collections():
+        collection.delete(
+            where={"source": {"$eq": source}}
+        )
 
-    collection.delete(
-        where={"source": {"$eq": source}}
-    )
+    after = corpus_count()
 
-    after = collection.count()
+    if LEXICAL_ENABLED:
+        get_lexical_index().delete_source(source)
+    remove_document(source)
+    bump_corpus_version()
 
     return {
         "status": "deleted",
@@ -77,3 +90,106 @@ def delete_document(
         "before": before,
         "after": after,
     }
+
+
+@router.patch("/documents/permissions")
+def update_document_permissions(
+    payload: DocumentPermissionsUpdate,
+    source: str = Query(..., description="PDF filename, e.g. GAN.pdf"),
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Re-classifies a document by rewriting the RBAC metadata of all
+    its chunks in place (batched collection.update); in partitioned
+    mode the chunks move to the partition of the new access tier.
+    No re-parsing, no embedding calls.
+    """
+    require_admin(user)
+
+    changes = payload.model_dump(exclude_none=True)
+    if not changes:
+        raise HTTPException(
+            status_code=400,
+            detail="Nothing to update",
+        )
+
+    include = ["metadatas", "documents", "embeddings"] if CHROMA_PARTITIONED else ["metadatas"]
+    updated = 0
+
+    # Read everything first: moved chunks must not be visited twice.
+    found = [
+        (collection, collection.get(where={"source": {"$eq": source}}, include=include))
+        for collection in all_collections()
+    ]
+
+    for collection, results in found:
+        ids = results.get("ids", [])
+
+        for start in range(0, len(ids), CHROMA_WRITE_BATCH_SIZE):
+            end = start + CHROMA_WRITE_BATCH_SIZE
+            batch_ids = ids[start:end]
+            metadatas = [{**meta, **changes} for meta in results["metadatas"][start:end]]
+
+            target = write_collection(metadatas[0])
+            if target.name == collection.name:
+                collection.update(ids=batch_ids, metadatas=metadatas)
+            else:
+                # New access tier → the chunks move to another partition,
+                # stored embeddings included.
+                target.upsert(
+                    ids=batch_ids,
+                    documents=results["documents"][start:end],
+                    embeddings=results["embeddings"][start:end],
+                    metadatas=metadatas,
+                )
+                collection.delete(ids=batch_ids)
+
+        updated += len(ids)
+
+    if not updated:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Document not found: {source}",
+        )
+
+    if LEXICAL_ENABLED:
+        get_lexical_index().update_source_metadata(source, changes)
+    record_permissions(source, changes)
+    bump_corpus_version()
+
+    return {
+        "status": "updated",
+        "source": source,
+        "chunks_updated": updated,
+        "metadata": changes,
+    }
+
+
+@router.get("/documents/partitions")
+def list_document_partitions(
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Partition collections (CHROMA_PARTITIONED) with their access
+    tier and chunk count.
+    """
+    require_admin(user)
+
+    if not CHROMA_PARTITIONED:
+        return {"partitioned": False, "partitions": []}
+
+    return {
+        "partitioned": True,
+        "partitions": [
+            {
+                "collection": partition_name(key),
+                "owner_department": key[0],
+                "min_role_level": key[1],
+                "min_clearance_level": key[2],
+                "chunks": collection.count(),
+            }
+            for key, collection in sorted(list_partitions().items())
+        ],
+    }
@@ -1,20 +1,34 @@
+import hashlib
 import os
-import uuid
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException
-from pypdf import PdfReader
 
+from app.admin.pdf_extract import count_pages, extract_pages
+from app.admin.registry import record_ingest
 from app.auth.authentication import authenticate_user
-from app.retrieval.chroma_client import get_chroma_collection
+from app.config import (
+    CHROMA_WRITE_BATCH_SIZE,
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    INGEST_PAGES_PER_TASK,
+    LEXICAL_ENABLED,
+    SAMPLES_DIR,
+)
+from app.retrieval.corpus import bump_corpus_version
+from app.retrieval.lexical import get_lexical_index
+from app.retrieval.partitions import all_collections, corpus_count, write_collection
 from app.models.admin_ingest import PdfIngestRequest
-from app.embeddings.hf_client import embed_text  # ✅ NEW IMPORT
+from app.telemetry.tracing import stage, timed_iter
+from app.embeddings.embedder import embed_batch
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-CHUNK_SIZE = 900
-CHUNK_OVERLAP = 180
+class IngestCancelled(Exception):
+    """
+    Raised from a progress callback to stop an ingest between steps.
+    """
 
 
 def chunk_text(text: str):
@@ -27,39 +41,96 @@ def chunk_text(text: str):
     return chunks
 
 
-@router.post("/ingest/pdf")
-def ingest_pdf(
-    payload: PdfIngestRequest,
-    user: dict = Depends(authenticate_user),
-):
+class StreamingChunker:
     """
-    Admin-only PDF ingestion.
+    Incremental version of chunk_text over page-by-page input.
 
-    payload:
-    {
-        "pdf_filename": "attention.pdf",
-        "metadata": {
-            "owner_department": "shared",
-            "min_role_level": 2,
-            "min_clearance_level": 2
-        }
-    }
+    Produces exactly the chunks chunk_text would produce for the
+    concatenated text ("page\n" per page), while holding only the
+    unconsumed tail of the text. Each chunk carries the first and
+    last page it overlaps.
     """
 
-    if user["role_level"] < 3:
-        raise HTTPException(
-            status_code=403,
-            detail="Admin privileges required",
-        )
+    def __init__(self):
+        self._buffer = ""
+        self._base = 0        # global offset of _buffer[0]
+        self._next_start = 0  # global offset of the next chunk
+        self._pages: List[Tuple[int, int]] = []  # (global start offset, page_number)
+
+        self.pages_extracted = 0
+        self.has_text = False
+
+    def _pages_for(self, start: int, end: int) -> Tuple[int, int]:
+        first = last = None
+        for offset, page_number in self._pages:
+            if offset >= end:
+                break
+            if first is None or offset <= start:
+                first = page_number
+            last = page_number
+        return first, last
+
+    def _emit(self, end_limit: int) -> List[Tuple[str, int, int]]:
+        chunks = []
+        while self._next_start < end_limit:
+            start = self._next_start
+            end = start + CHUNK_SIZE
+            text = self._buffer[start - self._base:end - self._base]
+            page_start, page_end = self._pages_for(start, start + len(text))
+            chunks.append((text, page_start, page_end))
+            self._next_start = end - CHUNK_OVERLAP
+
+        # Drop text and page spans no later chunk can reach.
+        drop = self._next_start - self._base
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._base = self._next_start
+        while len(self._pages) > 1 and self._pages[1][0] <= self._base:
+            self._pages.pop(0)
+
+        return chunks
+
+    def feed(self, page_number: int, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Adds one page; returns the chunks that are now complete.
+        """
+        self.pages_extracted += 1
+        if not text:
+            return []
+
+        if text.strip():
+            self.has_text = True
 
-    pdf_filename = payload.pdf_filename
-    metadata = payload.metadata
+        self._pages.append((self._base + len(self._buffer), page_number))
+        self._buffer += text + "\n"
 
-    BASE_DIR = os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # Only full-length chunks are final before the end of input.
+        total = self._base + len(self._buffer)
+        return self._emit(total - CHUNK_SIZE + 1)
+
+    def finish(self) -> List[Tuple[str, int, int]]:
+        """
+        Flushes the remaining (shorter) tail chunks.
+        """
+        return self._emit(self._base + len(self._buffer))
+
+
+def chunk_id(source: str, content: str, occurrence: int = 0) -> str:
+    """
+    Deterministic chunk id: same source + same chunk text → same id.
+
+    `occurrence` separates identical chunks repeated within one
+    document (boilerplate pages).
+    """
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    digest = hashlib.sha256(
+        f"{source}\0{content_hash}\0{occurrence}".encode("utf-8")
     )
-    SAMPLES_DIR = os.path.join(BASE_DIR, "samples")
-    pdf_path = os.path.join(SAMPLES_DIR, pdf_filename)
+    return digest.hexdigest()[:32]
+
+
+def resolve_pdf_path(pdf_filename: str) -> str:
+    pdf_path = os.path.join(SAMPLES_DIR, os.path.basename(pdf_filename))
 
     if not os.path.exists(pdf_path):
         raise HTTPException(
@@ -67,24 +138,87 @@ def ingest_pdf(
             detail=f"PDF not found: {pdf_filename}",
         )
 
-    reader = PdfReader(pdf_path)
+    return pdf_path
 
-    full_text = ""
-    for page in reader.pages:
-        text = page.extract_text()
-        if text:
-            full_text += text + "\n"
 
-    if not full_text.strip():
-        raise HTTPException(
-            status_code=400,
-            detail="No text extracted from PDF (OCR not enabled yet)",
-        )
+def run_pdf_ingest(
+    pdf_filename: str,
+    metadata: Dict,
+    progress: Optional[Callable[..., None]] = None,
+    incremental: bool = False,
+) -> Dict:
+    """
+    Extract → chunk → embed → write one PDF into Chroma.
+
+    Pages stream (in order, from a process pool for large PDFs)
+    straight into the chunker; chunks are embedded and written in
+    groups of CHROMA_WRITE_BATCH_SIZE, so memory stays bounded by
+    the group size rather than the document size. Each chunk's
+    metadata records its page_start / page_end.
 
-    chunks = chunk_text(full_text)
+    Chunk ids are deterministic (see chunk_id), so re-ingesting a
+    source replaces it instead of duplicating it:
+    - full mode: every chunk is re-embedded and upserted
+    - incremental mode: only chunks not already stored are embedded;
+      unchanged chunks only get their metadata refreshed if it differs
+    In both modes chunks that disappeared from the PDF are deleted.
+    With CHROMA_PARTITIONED chunks go to the partition matching
+    `metadata`; copies of the source in other partitions are removed.
+    The BM25 index (app.retrieval.lexical) is updated alongside every
+    Chroma write; the document registry row (app.admin.registry) is
+    refreshed last.
 
-    collection = get_chroma_collection()
-    before = collection.count()
+    Chunks already stored keep their old metadata until every group
+    has been embedded and written: RBAC changes are applied in one pass
+    at the end, and only then are stale chunks and other-partition
+    copies deleted. A run that fails or is cancelled before that
+    removes the chunks it added and puts back any metadata it changed,
+    so the source never ends up half under the old and half under the
+    new permissions.
+
+    `progress(stage, **counters)` is called after every group
+    (pages extracted, chunks embedded, chunks written). It may raise
+    IngestCancelled.
+    """
+
+    def report(stage: str, **counters):
+        if progress is not None:
+            progress(stage, **counters)
+
+    pdf_path = resolve_pdf_path(pdf_filename)
+    pages_total = count_pages(pdf_path)
+    report("extracting", pages_total=pages_total, pages_extracted=0)
+
+    collection = write_collection(metadata)
+    lexical = get_lexical_index() if LEXICAL_ENABLED else None
+    before = corpus_count()
+
+    existing = collection.get(
+        where={"source": {"$eq": pdf_filename}},
+        include=["metadatas"],
+    )
+    existing_meta = dict(zip(existing.get("ids", []), existing.get("metadatas", [])))
+
+    # Partitioned mode: copies left in other partitions by an earlier
+    # ingest with other RBAC metadata (deleted at the very end). The
+    # BM25 index has one row per chunk id, so their metadata is what
+    # it must keep until then.
+    other_copies = []
+    for other in all_collections():
+        if other.name == collection.name:
+            continue
+        copies = other.get(where={"source": {"$eq": pdf_filename}}, include=["metadatas"])
+        if copies.get("ids"):
+            other_copies.append((other, copies["ids"], copies["metadatas"]))
+
+    # Metadata each id currently has in the index (the target partition
+    # wins over older copies).
+    prior_meta = {
+        cid: meta
+        for _, ids, metadatas in other_copies
+        for cid, meta in zip(ids, metadatas)
+    }
+    prior_meta.update(existing_meta)
 
     enriched_metadata = {
         **metadata,
@@ -98,20 +232,236 @@ def ingest_pdf(
         f"It contains technical and explanatory information.\n\n"
     )
 
-    embeddings = [embed_text(SEMANTIC_PREFIX + chunk) for chunk in chunks]
-    collection.add(
-        ids=[str(uuid.uuid4()) for _ in chunks],
-        documents=chunks,
-        embeddings=embeddings,
-        metadatas=[enriched_metadata] * len(chunks),
-    )
+    chunker = StreamingChunker()
+    occurrences: Dict[str, int] = {}
+    seen_ids = set()
+    added_ids: List[str] = []
+    # New metadata for stored chunks, written after the last group
+    deferred_meta: Dict[str, Dict] = {}
+    applied_ids: List[str] = []
+    pending: List[Tuple[str, int, int]] = []
+    counts = {"chunks": 0, "embedded": 0, "written": 0, "unchanged": 0, "updated": 0}
+
+    def flush(group: List[Tuple[str, int, int]]):
+        ids, texts, metadatas = [], [], []
+        for text, page_start, page_end in group:
+            occurrence = occurrences.get(text, 0)
+            occurrences[text] = occurrence + 1
+            ids.append(chunk_id(pdf_filename, text, occurrence))
+            texts.append(text)
+            metadatas.append(
+                {**enriched_metadata, "page_start": page_start, "page_end": page_end}
+            )
+        seen_ids.update(ids)
+        counts["chunks"] += len(group)
+
+        for cid, meta in zip(ids, metadatas):
+            if cid in prior_meta and prior_meta[cid] != meta:
+                deferred_meta[cid] = meta
 
-    after = collection.count()
+        if incremental:
+            fresh = [i for i, cid in enumerate(ids) if cid not in existing_meta]
+            counts["unchanged"] += len(ids) - len(fresh)
+        else:
+            fresh = list(range(len(ids)))
+
+        if fresh:
+            with stage("ingest", "embed", chunks=len(fresh)):
+                embeddings = embed_batch([SEMANTIC_PREFIX + texts[i] for i in fresh])
+            counts["embedded"] += len(fresh)
+            report(
+                "embedding",
+                pages_extracted=chunker.pages_extracted,
+                chunks_total=counts["chunks"],
+                chunks_embedded=counts["embedded"],
+            )
+
+            fresh_ids = [ids[i] for i in fresh]
+            with stage("ingest", "chroma_write", chunks=len(fresh)):
+                collection.upsert(
+                    ids=fresh_ids,
+                    documents=[texts[i] for i in fresh],
+                    embeddings=embeddings,
+                    metadatas=[existing_meta.get(ids[i], metadatas[i]) for i in fresh],
+                )
+            added_ids.extend(cid for cid in fresh_ids if cid not in existing_meta)
+            if lexical is not None:
+                with stage("ingest", "lexical_write", chunks=len(fresh)):
+                    lexical.add(
+                        fresh_ids,
+                        [texts[i] for i in fresh],
+                        [prior_meta.get(ids[i], metadatas[i]) for i in fresh],
+                    )
+            counts["written"] += len(fresh)
+
+        report(
+            "writing",
+            chunks_total=counts["chunks"],
+            chunks_written=counts["written"],
+        )
+
+    removed_ids: List[str] = []
+    try:
+        for page_number, text in timed_iter("ingest", "extract", extract_pages(pdf_path, pages_total)):
+            pending.extend(chunker.feed(page_number, text))
+
+            # Hold chunks back until real text shows up, so a
+            # text-less PDF is rejected before anything is written.
+            while chunker.has_text and len(pending) >= CHROMA_WRITE_BATCH_SIZE:
+                flush(pending[:CHROMA_WRITE_BATCH_SIZE])
+                pending = pending[CHROMA_WRITE_BATCH_SIZE:]
+
+            if page_number % INGEST_PAGES_PER_TASK == 0:
+                report("extracting", pages_extracted=chunker.pages_extracted)
+
+        if not chunker.has_text:
+            raise HTTPException(
+                status_code=400,
+                detail="No text extracted from PDF (OCR not enabled yet)",
+            )
+
+        pending.extend(chunker.finish())
+        report("extracting", pages_extracted=chunker.pages_extracted)
+
+        for start in range(0, len(pending), CHROMA_WRITE_BATCH_SIZE):
+            flush(pending[start:start + CHROMA_WRITE_BATCH_SIZE])
+
+        # Every group is in: switch stored chunks to the new metadata.
+        deferred_ids = list(deferred_meta)
+        for start in range(0, len(deferred_ids), CHROMA_WRITE_BATCH_SIZE):
+            batch = deferred_ids[start:start + CHROMA_WRITE_BATCH_SIZE]
+            applied_ids.extend(batch)
+            in_collection = [cid for cid in batch if cid in existing_meta]
+            if in_collection:
+                with stage("ingest", "chroma_write"):
+                    collection.update(
+                        ids=in_collection,
+                        metadatas=[deferred_meta[cid] for cid in in_collection],
+                    )
+            if lexical is not None:
+                lexical.update_metadata(batch, [deferred_meta[cid] for cid in batch])
+            counts["updated"] += len(in_collection)
+
+        # Deletions last; they are not undone if a later one fails.
+        stale_ids = [cid for cid in existing_meta if cid not in seen_ids]
+        for start in range(0, len(stale_ids), CHROMA_WRITE_BATCH_SIZE):
+            batch = stale_ids[start:start + CHROMA_WRITE_BATCH_SIZE]
+            collection.delete(ids=batch)
+            removed_ids.extend(batch)
+            if lexical is not None:
+                lexical.delete(batch)
+
+        for other, ids, _ in other_copies:
+            for start in range(0, len(ids), CHROMA_WRITE_BATCH_SIZE):
+                batch = ids[start:start + CHROMA_WRITE_BATCH_SIZE]
+                other.delete(ids=batch)
+                removed_ids.extend(batch)
+                if lexical is not None:
+                    lexical.delete([cid for cid in batch if cid not in seen_ids])
+
+    except BaseException:
+        # Cancelled, or an embedding / Chroma error part-way: chunks added
+        # by this run must not stay searchable without a registry row, and
+        # chunks already switched to the new metadata go back to the old.
+        try:
+            for start in range(0, len(applied_ids), CHROMA_WRITE_BATCH_SIZE):
+                batch = applied_ids[start:start + CHROMA_WRITE_BATCH_SIZE]
+                in_collection = [cid for cid in batch if cid in existing_meta]
+                if in_collection:
+                    collection.update(
+                        ids=in_collection,
+                        metadatas=[existing_meta[cid] for cid in in_collection],
+                    )
+                if lexical is not None:
+                    lexical.update_metadata(batch, [prior_meta[cid] for cid in batch])
+
+            for start in range(0, len(added_ids), CHROMA_WRITE_BATCH_SIZE):
+                collection.delete(ids=added_ids[start:start + CHROMA_WRITE_BATCH_SIZE])
+            if lexical is not None:
+                # Ids also stored in another partition keep their BM25 row.
+                lexical.delete([cid for cid in added_ids if cid not in prior_meta])
+        except Exception as e:
+            print(
+                f"⚠️ Rollback of {pdf_filename} failed "
+                f"({len(added_ids)} added, {len(applied_ids)} re-permissioned chunks):",
+                e,
+            )
+        raise
+    finally:
+        if counts["written"] or counts["updated"] or removed_ids:
+            bump_corpus_version()
+
+    after = corpus_count()
+
+    with stage("ingest", "registry"):
+        record_ingest(
+            source=pdf_filename,
+            metadata=metadata,
+            chunk_count=counts["chunks"],
+            pages=chunker.pages_extracted,
+            pdf_path=pdf_path,
+        )
 
     return {
         "status": "ingested",
         "source": pdf_filename,
-        "chunks_added": len(chunks),
+        "mode": "incremental" if incremental else "full",
+        "pages": chunker.pages_extracted,
+        "chunks_total": counts["chunks"],
+        "chunks_added": len(added_ids),
+        "chunks_embedded": counts["embedded"],
+        "chunks_unchanged": counts["unchanged"],
+        "chunks_metadata_updated": counts["updated"],
+        "chunks_removed": len(removed_ids),
         "before": before,
         "after": after,
     }
+
+
+@router.post("/ingest/pdf", status_code=202)
+def ingest_pdf(
+    payload: PdfIngestRequest,
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only PDF ingestion (background job).
+
+    payload:
+    {
+        "pdf_filename": "attention.pdf",
+        "metadata": {
+            "owner_department": "shared",
+            "min_role_level": 2,
+            "min_clearance_level": 2
+        },
+        "incremental": false
+    }
+
+    incremental=true embeds only chunks that changed since the
+    last ingest of the same source.
+
+    Returns a job id immediately; poll GET /admin/ingest/jobs/{job_id}.
+    """
+
+    if user["role_level"] < 3:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin privileges required",
+        )
+
+    resolve_pdf_path(payload.pdf_filename)
+
+    from app.admin.jobs import submit_ingest_job
+
+    job = submit_ingest_job(
+        pdf_filename=payload.pdf_filename,
+        metadata=payload.metadata,
+        requested_by=user["username"],
+        incremental=payload.incremental,
+    )
+
+    return {
+        "status": "queued",
+        "job_id": job["id"],
+        "source": payload.pdf_filename,
+    }
@@ -0,0 +1,337 @@
+import json
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.admin.documents import require_admin
+from app.admin.ingest import IngestCancelled, run_pdf_ingest
+from app.auth.authentication import authenticate_user
+from app.config import INGEST_MAX_WORKERS
+from app.db.database import SessionLocal
+from app.db.models import IngestJob
+from app.telemetry.tracing import stage
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+ACTIVE_STATUSES = ("queued", "running")
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=INGEST_MAX_WORKERS,
+                    thread_name_prefix="ingest-job",
+                )
+    return _executor
+
+
+def job_to_dict(job: IngestJob) -> Dict:
+    return {
+        "id": job.id,
+        "pdf_filename": job.pdf_filename,
+        "metadata": json.loads(job.metadata_json),
+        "requested_by": job.requested_by,
+        "incremental": bool(job.incremental),
+        "status": job.status,
+        "stage": job.stage,
+        "cancel_requested": bool(job.cancel_requested),
+        "progress": {
+            "pages_total": job.pages_total,
+            "pages_extracted": job.pages_extracted,
+            "chunks_total": job.chunks_total,
+            "chunks_embedded": job.chunks_embedded,
+            "chunks_written": job.chunks_written,
+        },
+        "result": json.loads(job.result_json) if job.result_json else None,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+# =========================
+# WORKER
+# =========================
+def _claim(job_id: str) -> bool:
+    """
+    queued → running, atomically, so a job is only run by one worker
+    even when several uvicorn processes resume the same queue.
+    """
+    db: Session = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        claimed = (
+            db.query(IngestJob)
+            .filter(IngestJob.id == job_id, IngestJob.status == "queued")
+            .update(
+                {
+                    IngestJob.status: "running",
+                    IngestJob.worker: WORKER_ID,
+                    IngestJob.started_at: now,
+                    IngestJob.updated_at: now,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return claimed == 1
+    finally:
+        db.close()
+
+
+def _finish(job_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+    db: Session = SessionLocal()
+    try:
+        job = db.get(IngestJob, job_id)
+        if job is None:
+            return
+        now = datetime.utcnow()
+        job.status = status
+        job.stage = status
+        job.result_json = json.dumps(result) if result is not None else None
+        job.error = error
+        job.finished_at = now
+        job.updated_at = now
+        db.commit()
+    finally:
+        db.close()
+
+
+def _progress_callback(job_id: str):
+    def progress(stage: str, **counters):
+        db: Session = SessionLocal()
+        try:
+            job = db.get(IngestJob, job_id)
+            if job is None:
+                raise IngestCancelled()
+
+            job.stage = stage
+            for name, value in counters.items():
+                setattr(job, name, value)
+            job.updated_at = datetime.utcnow()
+            db.commit()
+
+            if job.cancel_requested:
+                raise IngestCancelled()
+        finally:
+            db.close()
+
+    return progress
+
+
+def _run_job(job_id: str):
+    if not _claim(job_id):
+        return
+
+    db: Session = SessionLocal()
+    try:
+        job = db.get(IngestJob, job_id)
+        pdf_filename = job.pdf_filename
+        metadata = json.loads(job.metadata_json)
+        incremental = bool(job.incremental)
+    finally:
+        db.close()
+
+    try:
+        with stage("ingest", "job", job_id=job_id, source=pdf_filename):
+            result = run_pdf_ingest(
+                pdf_filename=pdf_filename,
+                metadata=metadata,
+                progress=_progress_callback(job_id),
+                incremental=incremental,
+            )
+    except IngestCancelled:
+        _finish(job_id, "cancelled")
+    except HTTPException as e:
+        _finish(job_id, "failed", error=str(e.detail))
+    except Exception as e:
+        _finish(job_id, "failed", error=f"{type(e).__name__}: {e}")
+    else:
+        _finish(job_id, "succeeded", result=result)
+
+
+def submit_ingest_job(
+    pdf_filename: str,
+    metadata: Dict,
+    requested_by: str,
+    incremental: bool = False,
+) -> Dict:
+    """
+    Persists a queued ingest job and hands it to the worker pool.
+    """
+    db: Session = SessionLocal()
+    try:
+        job = IngestJob(
+            id=str(uuid.uuid4()),
+            pdf_filename=pdf_filename,
+            metadata_json=json.dumps(metadata),
+            requested_by=requested_by,
+            incremental=incremental,
+            status="queued",
+            stage="queued",
+        )
+        db.add(job)
+        db.commit()
+        job_dict = job_to_dict(job)
+    finally:
+        db.close()
+
+    _get_executor().submit(_run_job, job_dict["id"])
+
+    return job_dict
+
+
+def _worker_alive(worker: Optional[str]) -> bool:
+    if not worker or ":" not in worker:
+        return False
+
+    host, pid = worker.rsplit(":", 1)
+    if host != socket.gethostname():
+        # Cannot probe another host; treat as alive.
+        return True
+
+    try:
+        os.kill(int(pid), 0)
+    except (ProcessLookupError, ValueError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def resume_ingest_jobs():
+    """
+    Startup hook: re-queue jobs whose worker process is gone
+    (e.g. after a restart) and submit every queued job.
+    """
+    db: Session = SessionLocal()
+    try:
+        orphaned = (
+            db.query(IngestJob)
+            .filter(IngestJob.status == "running")
+            .all()
+        )
+        for job in orphaned:
+            if job.worker != WORKER_ID and not _worker_alive(job.worker):
+                job.status = "queued"
+                job.stage = "queued"
+                job.worker = None
+        db.commit()
+
+        queued_ids = [
+            job_id
+            for (job_id,) in db.query(IngestJob.id)
+            .filter(IngestJob.status == "queued")
+            .order_by(IngestJob.created_at)
+            .all()
+        ]
+    finally:
+        db.close()
+
+    for job_id in queued_ids:
+        _get_executor().submit(_run_job, job_id)
+
+    if queued_ids:
+        print(f"📥 Resumed {len(queued_ids)} ingest job(s)")
+
+
+# =========================
+# ROUTES
+# =========================
+@router.get("/ingest/jobs")
+def list_ingest_jobs(
+    status: Optional[str] = Query(None, description="queued | running | succeeded | failed | cancelled"),
+    limit: int = Query(50, ge=1, le=500),
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Most recent ingest jobs first.
+    """
+    require_admin(user)
+
+    db: Session = SessionLocal()
+    try:
+        q = db.query(IngestJob)
+        if status:
+            q = q.filter(IngestJob.status == status)
+        jobs = q.order_by(IngestJob.created_at.desc()).limit(limit).all()
+        return {"jobs": [job_to_dict(job) for job in jobs]}
+    finally:
+        db.close()
+
+
+@router.get("/ingest/jobs/{job_id}")
+def get_ingest_job(
+    job_id: str,
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Status and stage-level progress of one ingest job.
+    """
+    require_admin(user)
+
+    db: Session = SessionLocal()
+    try:
+        job = db.get(IngestJob, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job_to_dict(job)
+    finally:
+        db.close()
+
+
+@router.post("/ingest/jobs/{job_id}/cancel")
+def cancel_ingest_job(
+    job_id: str,
+    user: dict = Depends(authenticate_user),
+):
+    """
+    Admin-only.
+    Queued jobs are cancelled immediately; running jobs stop at the
+    next progress step and roll back the chunks they wrote.
+    """
+    require_admin(user)
+
+    db: Session = SessionLocal()
+    try:
+        job = db.get(IngestJob, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        if job.status not in ACTIVE_STATUSES:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Job already {job.status}",
+            )
+
+        now = datetime.utcnow()
+        job.cancel_requested = True
+        job.updated_at = now
+        if job.status == "queued":
+            job.status = "cancelled"
+            job.stage = "cancelled"
+            job.finished_at = now
+
+        db.commit()
+        return job_to_dict(job)
+    finally:
+        db.close()
@@ -0,0 +1,85 @@
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+from app.config import (
+    INGEST_EXTRACT_PROCESSES,
+    INGEST_PAGES_PER_TASK,
+    INGEST_PARALLEL_MIN_PAGES,
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: the API process is multi-threaded, fork is unsafe
+                _pool = ProcessPoolExecutor(
+                    max_workers=max(1, INGEST_EXTRACT_PROCESSES),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """
+    Runs in a pool process: text of pages [start, end).
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def count_pages(pdf_path: str) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(pdf_path).pages)
+
+
+def extract_pages(pdf_path: str, pages_total: int) -> Iterator[Tuple[int, str]]:
+    """
+    Yields (page_number, text) in page order, 1-based.
+
+    Large PDFs are split into page ranges extracted on a process
+    pool. At most two ranges per process are in flight, so memory
+    stays bounded even when the consumer (embedding) is slower.
+    """
+
+    if pages_total < INGEST_PARALLEL_MIN_PAGES or INGEST_EXTRACT_PROCESSES <= 1:
+        from pypdf import PdfReader
+
+        reader = PdfReader(pdf_path)
+        for i, page in enumerate(reader.pages, start=1):
+            yield i, page.extract_text() or ""
+        return
+
+    pool = _get_pool()
+    ranges = deque(
+        (start, min(start + INGEST_PAGES_PER_TASK, pages_total))
+        for start in range(0, pages_total, INGEST_PAGES_PER_TASK)
+    )
+    window = max(1, INGEST_EXTRACT_PROCESSES) * 2
+
+    in_flight = deque()
+    try:
+        while ranges or in_flight:
+            while ranges and len(in_flight) < window:
+                start, end = ranges.popleft()
+                in_flight.append(
+                    (start, pool.submit(_extract_page_range, pdf_path, start, end))
+                )
+
+            start, future = in_flight.popleft()
+            for offset, text in enumerate(future.result()):
+                yield start + offset + 1, text
+    finally:
+        for _, future in in_flight:
+            future.cancel()
@@ -0,0 +1,245 @@
+import hashlib
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import CHROMA_PARTITIONED, UPLOAD_CHUNK_BYTES
+from app.db.database import SessionLocal
+from app.db.models import Document, UploadedFile
+
+RBAC_FIELDS = ("owner_department", "min_role_level", "min_clearance_level")
+
+SORT_COLUMNS = {
+    "source": Document.source,
+    "ingested_at": Document.ingested_at,
+    "chunk_count": Document.chunk_count,
+    "size_bytes": Document.size_bytes,
+    "owner_department": Document.owner_department,
+}
+
+REBUILD_PAGE_SIZE = 5000
+
+
+def file_sha256(pdf_path: str) -> str:
+    """
+    SHA-256 of a stored PDF. Reuses the hash recorded at upload time
+    when the file on disk still has the uploaded size.
+    """
+    filename = os.path.basename(pdf_path)
+    size = os.path.getsize(pdf_path)
+
+    db: Session = SessionLocal()
+    try:
+        uploaded = db.query(UploadedFile).filter(UploadedFile.filename == filename).first()
+        if uploaded is not None and uploaded.size_bytes == size:
+            return uploaded.sha256
+    finally:
+        db.close()
+
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _partition_of(doc: Document) -> Optional[str]:
+    if not CHROMA_PARTITIONED or doc.owner_department is None:
+        return None
+
+    from app.retrieval.partitions import partition_name
+
+    return partition_name(
+        (doc.owner_department, doc.min_role_level, doc.min_clearance_level)
+    )
+
+
+def document_to_dict(doc: Document) -> Dict:
+    return {
+        "chunks": doc.chunk_count,
+        "owner_department": doc.owner_department,
+        "min_role_level": doc.min_role_level,
+        "min_clearance_level": doc.min_clearance_level,
+        "pages": doc.pages,
+        "sha256": doc.sha256,
+        "size_bytes": doc.size_bytes,
+        "partition": _partition_of(doc),
+        "ingested_at": doc.ingested_at.isoformat() if doc.ingested_at else None,
+        "updated_at": doc.updated_at.isoformat() if doc.updated_at else None,
+    }
+
+
+def record_ingest(
+    source: str,
+    metadata: Dict,
+    chunk_count: int,
+    pages: Optional[int] = None,
+    pdf_path: Optional[str] = None,
+):
+    """
+    Upserts the registry row after a successful ingest of `source`.
+    """
+    sha256 = size = None
+    if pdf_path is not None and os.path.exists(pdf_path):
+        sha256 = file_sha256(pdf_path)
+        size = os.path.getsize(pdf_path)
+
+    db: Session = SessionLocal()
+    try:
+        doc = db.query(Document).filter(Document.source == source).first()
+        if doc is None:
+            doc = Document(source=source)
+            db.add(doc)
+
+        now = datetime.utcnow()
+        for field in RBAC_FIELDS:
+            setattr(doc, field, metadata.get(field))
+        doc.chunk_count = chunk_count
+        doc.pages = pages
+        doc.sha256 = sha256
+        doc.size_bytes = size
+        doc.ingested_at = now
+        doc.updated_at = now
+        db.commit()
+    finally:
+        db.close()
+
+
+def record_permissions(source: str, changes: Dict):
+    db: Session = SessionLocal()
+    try:
+        doc = db.query(Document).filter(Document.source == source).first()
+        if doc is None:
+            return
+        for field, value in changes.items():
+            if field in RBAC_FIELDS:
+                setattr(doc, field, value)
+        doc.updated_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+
+def remove_document(source: str):
+    db: Session = SessionLocal()
+    try:
+        db.query(Document).filter(Document.source == source).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def list_registered_documents(
+    page: int = 1,
+    page_size: int = 50,
+    sort: str = "source",
+    order: str = "asc",
+    owner_department: Optional[str] = None,
+) -> Dict:
+    column = SORT_COLUMNS[sort]
+    ordering = column.desc() if order == "desc" else column.asc()
+
+    db: Session = SessionLocal()
+    try:
+        stmt = select(Document)
+        count_stmt = select(func.count(Document.id))
+        if owner_department is not None:
+            stmt = stmt.where(Document.owner_department == owner_department)
+            count_stmt = count_stmt.where(Document.owner_department == owner_department)
+
+        total = db.scalar(count_stmt)
+        docs = db.scalars(
+            stmt.order_by(ordering, Document.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        ).all()
+
+        return {
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            # keyed by source (same shape as before); key order follows the sort
+            "documents": {doc.source: document_to_dict(doc) for doc in docs},
+        }
+    finally:
+        db.close()
+
+
+def rebuild_registry_from_chroma(collections) -> int:
+    """
+    Re-derives every registry row from chunk metadata, paging through
+    the collection(s) so memory stays bounded. Used once to populate the
+    registry for a corpus ingested before it existed.
+    Returns the number of sources found.
+    """
+    sources: Dict[str, Dict] = {}
+    for collection in collections:
+        offset = 0
+        while True:
+            results = collection.get(
+                include=["metadatas"],
+                limit=REBUILD_PAGE_SIZE,
+                offset=offset,
+            )
+            metadatas = results.get("metadatas") or []
+            if not metadatas:
+                break
+
+            for meta in metadatas:
+                source = meta.get("source", "unknown")
+                entry = sources.setdefault(source, {"chunks": 0, "pages": 0})
+                entry["chunks"] += 1
+                entry["pages"] = max(entry["pages"], meta.get("page_end") or 0)
+                for field in RBAC_FIELDS:
+                    entry[field] = meta.get(field)
+
+            offset += len(metadatas)
+
+    from app.admin.ingest import SAMPLES_DIR
+
+    for source, entry in sources.items():
+        pdf_path = os.path.join(SAMPLES_DIR, os.path.basename(source))
+        record_ingest(
+            source=source,
+            metadata=entry,
+            chunk_count=entry["chunks"],
+            pages=entry["pages"] or None,
+            pdf_path=pdf_path,
+        )
+
+    return len(sources)
+
+
+def sync_registry_if_empty():
+    """
+    Startup hook: builds the registry from Chroma when the table is
+    empty but the collection is not (existing deployments).
+    """
+    db: Session = SessionLocal()
+    try:
+        registered = db.scalar(select(func.count(Document.id)))
+    finally:
+        db.close()
+
+    if registered:
+        return
+
+    from app.retrieval.partitions import all_collections
+
+    collections = all_collections()
+    if not any(collection.count() for collection in collections):
+        return
+
+    try:
+        found = rebuild_registry_from_chroma(collections)
+    except IntegrityError:
+        # Another worker populated it concurrently.
+        return
+
+    print(f"📚 Document registry built from Chroma: {found} source(s)")
@@ -0,0 +1,224 @@
+"""
+Checks that a failed or cancelled re-ingest leaves a source exactly as
+it was: same chunks, same RBAC metadata in Chroma and in the BM25 index,
+registry row untouched.
+
+Each run uses a scratch DATA_DIR, the benchmark fake embedder and
+groups of 4 chunks, once per storage layout (single collection and
+CHROMA_PARTITIONED):
+
+    python -m app.admin.test_ingest_rollback    (or: python -m pytest app/admin)
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SOURCE = "rollback.pdf"
+OLD = {"owner_department": "AI", "min_role_level": 1, "min_clearance_level": 1}
+NEW = {"owner_department": "HR", "min_role_level": 2, "min_clearance_level": 2}
+
+
+def _pages(version: int):
+    # Version 2 rewrites two pages: some chunks disappear, some are new
+    # (in two different groups), the rest are unchanged.
+    pages = []
+    for i in range(24):
+        topic = f"revised topic {i}" if version == 2 and i in (8, 16) else f"topic {i}"
+        pages.append(
+            f"Page {i} covers {topic} with maintenance step MX-{i:03d}. " * 12
+        )
+    return pages
+
+
+def _write_source(version: int):
+    from app.config import SAMPLES_DIR
+    from benchmarks.corpus import write_pdf
+
+    write_pdf(os.path.join(SAMPLES_DIR, SOURCE), _pages(version))
+
+
+def _snapshot():
+    from app.admin.registry import list_registered_documents
+    from app.retrieval.lexical import get_lexical_index
+    from app.retrieval.partitions import all_collections
+
+    chroma = {}
+    for collection in all_collections():
+        stored = collection.get(where={"source": {"$eq": SOURCE}}, include=["metadatas"])
+        for cid, meta in zip(stored["ids"], stored["metadatas"]):
+            chroma[cid] = (collection.name, meta)
+
+    lexical = sorted(get_lexical_index()._conn.execute(
+        """
+        SELECT chunk_id, owner_department, min_role_level, min_clearance_level
+        FROM chunks WHERE source = ?
+        """,
+        (SOURCE,),
+    ).fetchall())
+
+    registry = list_registered_documents(page_size=500)["documents"].get(SOURCE)
+    return chroma, lexical, registry
+
+
+def _ingest(metadata, incremental=False, progress=None):
+    from app.admin.ingest import run_pdf_ingest
+
+    return run_pdf_ingest(
+        pdf_filename=SOURCE,
+        metadata=metadata,
+        progress=progress,
+        incremental=incremental,
+    )
+
+
+def _expect_unchanged(before, failure, **kwargs):
+    try:
+        _ingest(NEW, **kwargs)
+    except failure:
+        pass
+    else:
+        raise AssertionError(f"ingest did not raise {failure.__name__}")
+
+    after = _snapshot()
+    assert after[0] == before[0], "Chroma chunks / metadata changed"
+    assert after[1] == before[1], "BM25 rows changed"
+    assert after[2] == before[2], "registry row changed"
+
+
+def check_embed_error(before, incremental):
+    import app.admin.ingest as ingest
+
+    embed_batch = ingest.embed_batch
+    calls = {"n": 0}
+
+    def failing_embed(texts):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("embedding backend down")
+        return embed_batch(texts)
+
+    ingest.embed_batch = failing_embed
+    try:
+        _expect_unchanged(before, RuntimeError, incremental=incremental)
+    finally:
+        ingest.embed_batch = embed_batch
+
+
+def check_cancel(before, incremental):
+    from app.admin.ingest import IngestCancelled
+
+    writes = {"n": 0}
+
+    def progress(stage, **counters):
+        if stage == "writing":
+            writes["n"] += 1
+            if writes["n"] == 2:
+                raise IngestCancelled()
+
+    _expect_unchanged(before, IngestCancelled, incremental=incremental, progress=progress)
+
+
+def check_error_while_applying_metadata(before):
+    from app.retrieval.lexical import get_lexical_index
+
+    lexical = get_lexical_index()
+    update_metadata = lexical.update_metadata
+    calls = {"n": 0}
+
+    def failing_update(chunk_ids, metadatas):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("disk full")
+        return update_metadata(chunk_ids, metadatas)
+
+    lexical.update_metadata = failing_update
+    try:
+        _expect_unchanged(before, RuntimeError)
+    finally:
+        lexical.update_metadata = update_metadata
+
+    assert calls["n"] > 2, "metadata was never restored"
+
+
+def run_checks():
+    import app.admin.ingest as ingest
+    from app.config import CHROMA_PARTITIONED
+    from app.db.init_db import init_db
+    from benchmarks.fakes import FakeEmbedder
+
+    init_db()
+    ingest.embed_batch = FakeEmbedder(latency_ms=0, per_text_ms=0).embed_batch
+
+    layout = "partitioned" if CHROMA_PARTITIONED else "single collection"
+
+    _write_source(1)
+    _ingest(OLD)
+    before = _snapshot()
+    assert before[0] and before[1], "nothing ingested"
+
+    _write_source(2)
+    for incremental in (False, True):
+        check_embed_error(before, incremental)
+        check_cancel(before, incremental)
+    check_error_while_applying_metadata(before)
+    print(f"✅ failed re-ingests left {len(before[0])} chunks untouched ({layout})")
+
+    _ingest(NEW)
+    chroma, lexical, registry = _snapshot()
+    new_values = tuple(NEW.values())
+    assert all(
+        tuple(meta[field] for field in NEW) == new_values for _, meta in chroma.values()
+    ), "successful re-ingest left old metadata in Chroma"
+    assert all(row[1:] == new_values for row in lexical), "successful re-ingest left old BM25 metadata"
+    assert len(lexical) == len(chroma)
+    assert registry["owner_department"] == NEW["owner_department"]
+    print(f"✅ successful re-ingest switched all {len(chroma)} chunks ({layout})")
+
+
+def _run_scratch(partitioned: bool):
+    workdir = tempfile.mkdtemp(prefix="llm-se-rollback-")
+    env = {
+        **os.environ,
+        "DATA_DIR": os.path.join(workdir, "data"),
+        "SAMPLES_DIR": os.path.join(workdir, "samples"),
+        "DATABASE_URL": "sqlite:///" + os.path.join(workdir, "users.db"),
+        "CHROMA_PARTITIONED": "true" if partitioned else "false",
+        "CHROMA_SIDECAR_SOCKET": "",
+        "CHROMA_WRITE_BATCH_SIZE": "4",
+        "EMBED_CACHE_ENABLED": "false",
+        "LEXICAL_ENABLED": "true",
+    }
+    os.makedirs(env["DATA_DIR"])
+    os.makedirs(env["SAMPLES_DIR"])
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "app.admin.test_ingest_rollback", "--scratch"],
+            cwd=BACKEND_DIR,
+            env=env,
+            check=True,
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# Each layout runs in its own process: app.config is read at import time.
+
+def test_rollback_single_collection():
+    _run_scratch(partitioned=False)
+
+
+def test_rollback_partitioned():
+    _run_scratch(partitioned=True)
+
+
+if __name__ == "__main__":
+    if "--scratch" in sys.argv:
+        run_checks()
+    else:
+        test_rollback_single_collection()
+        test_rollback_partitioned()
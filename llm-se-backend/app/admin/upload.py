@@ -1,46 +1,371 @@
+import hashlib
 import os
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+import uuid
+from typing import Callable, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
 from app.auth.authentication import authenticate_user
+from app.config import SAMPLES_DIR, UPLOAD_CHUNK_BYTES, UPLOAD_MAX_BYTES
+from app.db.database import SessionLocal
+from app.db.models import UploadedFile
+
+# Multipart framing around the PDF: boundaries, part headers and the
+# few small form fields below.
+FORM_OVERHEAD_BYTES = 64 * 1024
+FORM_FIELDS = ("ingest", "owner_department", "min_role_level", "min_clearance_level")
+FORM_FIELD_MAX_BYTES = 1024
+
+
+def _too_large():
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds upload limit of {UPLOAD_MAX_BYTES} bytes",
+    )
+
+
+class UploadLimitRoute(APIRoute):
+    """
+    Route that answers 413 from the Content-Length header alone, before
+    authentication and before a byte of the body is read.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request):
+            content_length = request.headers.get("content-length")
+            if (
+                content_length
+                and content_length.isdigit()
+                and int(content_length) > UPLOAD_MAX_BYTES + FORM_OVERHEAD_BYTES
+            ):
+                raise _too_large()
+            return await handler(request)
+
+        return limited_handler
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], route_class=UploadLimitRoute)
+
+
+class _UploadForm:
+    """
+    Incremental multipart/form-data parser for upload_pdf.
+
+    The "file" part is written straight to the path returned by
+    `open_file(filename)`, hashed on the way; 413 as soon as it passes
+    UPLOAD_MAX_BYTES. The small text fields are collected in `fields`.
+    """
+
+    def __init__(self, boundary: bytes, open_file: Callable[[str], str]):
+        self.open_file = open_file
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.size = 0
+
+        self._digest = hashlib.sha256()
+        self._file = None
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._disposition: Dict[bytes, bytes] = {}
+        self._value: Optional[bytearray] = None
+
+        self._parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._part_begin,
+                "on_header_field": lambda data, start, end: self._header_field.extend(data[start:end]),
+                "on_header_value": lambda data, start, end: self._header_value.extend(data[start:end]),
+                "on_header_end": self._header_end,
+                "on_headers_finished": self._headers_finished,
+                "on_part_data": self._part_data,
+                "on_part_end": self._part_end,
+            },
+        )
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def write(self, data: bytes):
+        try:
+            self._parser.write(data)
+        except MultipartParseError as e:
+            raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+
+    def finish(self):
+        self.write(b"")
+        self._parser.finalize()
+        if self.filename is None:
+            raise HTTPException(status_code=422, detail="Form field required: file")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # parser callbacks
+    def _part_begin(self):
+        self._disposition = {}
+        self._value = None
+
+    def _header_end(self):
+        if bytes(self._header_field).lower() == b"content-disposition":
+            self._disposition = parse_options_header(bytes(self._header_value))[1]
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _headers_finished(self):
+        name = self._disposition.get(b"name", b"").decode("utf-8", "replace")
+
+        if name == "file":
+            if self.filename is not None:
+                raise HTTPException(status_code=400, detail="Only one file per upload")
+            self.filename = self._disposition.get(b"filename", b"").decode("utf-8", "replace")
+            self._file = open(self.open_file(self.filename), "wb")
+        elif name in FORM_FIELDS:
+            self._value = bytearray()
+
+    def _part_data(self, data: bytes, start: int, end: int):
+        block = data[start:end]
+
+        if self._file is not None:
+            self.size += len(block)
+            if self.size > UPLOAD_MAX_BYTES:
+                raise _too_large()
+            self._digest.update(block)
+            self._file.write(block)
+        elif self._value is not None:
+            self._value.extend(block)
+            if len(self._value) > FORM_FIELD_MAX_BYTES:
+                raise HTTPException(status_code=400, detail="Form field too long")
+
+    def _part_end(self):
+        if self._file is not None:
+            self.close()
+        elif self._value is not None:
+            name = self._disposition[b"name"].decode("utf-8")
+            self.fields[name] = self._value.decode("utf-8", "replace")
+            self._value = None
+
+
+def _form_bool(value: Optional[str]) -> bool:
+    if value is None:
+        return False
+    if value.strip().lower() in ("1", "true", "on", "yes"):
+        return True
+    if value.strip().lower() in ("", "0", "false", "off", "no"):
+        return False
+    raise HTTPException(status_code=422, detail=f"Not a boolean: {value!r}")
+
+
+def _form_int(name: str, value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{name} must be an integer")
+
+
+def _ingest_metadata(fields: Dict[str, str]) -> Optional[Dict]:
+    """
+    Ingest metadata from the form fields, or None without ingest=true.
+    """
+    if not _form_bool(fields.get("ingest")):
+        return None
+
+    owner_department = fields.get("owner_department")
+    min_role_level = _form_int("min_role_level", fields.get("min_role_level"))
+    min_clearance_level = _form_int("min_clearance_level", fields.get("min_clearance_level"))
+
+    if owner_department is None or min_role_level is None or min_clearance_level is None:
+        raise HTTPException(
+            status_code=400,
+            detail="ingest=true requires owner_department, min_role_level and min_clearance_level",
+        )
+
+    return {
+        "owner_department": owner_department,
+        "min_role_level": min_role_level,
+        "min_clearance_level": min_clearance_level,
+    }
+
+
+def _store(filename: str, save_path: str, part_path: str, sha256: str, size: int, username: str):
+    """
+    Records the upload and moves the finished `.part` file into place;
+    409 for content already stored under another name.
+    """
+    db: Session = SessionLocal()
+    try:
+        duplicate = db.query(UploadedFile).filter(UploadedFile.sha256 == sha256).first()
+
+        if duplicate and os.path.exists(os.path.join(SAMPLES_DIR, duplicate.filename)):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Same content already uploaded as: {duplicate.filename}",
+            )
+
+        # Rows whose file was removed from disk (same content, or this
+        # name: save_path does not exist) are forgotten.
+        stale = db.query(UploadedFile).filter(UploadedFile.filename == filename).first()
+        for row in {duplicate, stale} - {None}:
+            db.delete(row)
+        # Deletes before the insert (the unit of work inserts first).
+        db.flush()
+
+        # The row is the claim on name and content: committed before the
+        # file shows up, so a concurrent upload gets the 409 below.
+        record = UploadedFile(
+            filename=filename,
+            sha256=sha256,
+            size_bytes=size,
+            uploaded_by=username,
+        )
+        db.add(record)
+        db.commit()
+
+        try:
+            os.replace(part_path, save_path)
+        except OSError:
+            db.delete(record)
+            db.commit()
+            raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"Concurrent upload of the same name or content: {filename}",
+        )
+    finally:
+        db.close()
 
-router = APIRouter(prefix="/admin", tags=["admin"])
 
+_UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "ingest": {"type": "boolean", "default": False},
+                        "owner_department": {"type": "string"},
+                        "min_role_level": {"type": "integer"},
+                        "min_clearance_level": {"type": "integer"},
+                    },
+                }
+            }
+        },
+    }
+}
 
-@router.post("/upload/pdf")
-def upload_pdf(
-    file: UploadFile = File(...),
+
+@router.post("/upload/pdf", openapi_extra=_UPLOAD_FORM_SCHEMA)
+async def upload_pdf(
+    request: Request,
     user: dict = Depends(authenticate_user),
 ):
     """
     Admin-only PDF upload.
     Saves PDF into /samples directory.
-    Does NOT ingest or embed.
+
+    - A Content-Length above the limit is rejected (413) before the
+      body is read (UploadLimitRoute)
+    - The multipart body is parsed as it arrives: the PDF goes straight
+      to a `.part` file in fixed-size blocks (never fully in memory,
+      never spooled elsewhere first)
+    - SHA-256 computed on the way; identical content already
+      uploaded under another name is rejected (409)
+    - Rejected with 413 once UPLOAD_MAX_BYTES is exceeded
+
+    With ingest=true (plus owner_department, min_role_level,
+    min_clearance_level form fields) the stored file is queued
+    for ingestion right away and the job id is returned.
     """
 
     if user["role_level"] < 3:
         raise HTTPException(status_code=403, detail="Admin privileges required")
 
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body")
 
-    BASE_DIR = os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    )
-    SAMPLES_DIR = os.path.join(BASE_DIR, "samples")
     os.makedirs(SAMPLES_DIR, exist_ok=True)
+    target: Dict[str, str] = {}
 
-    filename = os.path.basename(file.filename)
-    save_path = os.path.join(SAMPLES_DIR, filename)
+    def open_file(name: str) -> str:
+        # Called as soon as the file part's headers arrive.
+        if not name.lower().endswith(".pdf"):
+            raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
-    if os.path.exists(save_path):
-        raise HTTPException(
-            status_code=409,
-            detail=f"File already exists: {filename}",
+        filename = os.path.basename(name)
+        save_path = os.path.join(SAMPLES_DIR, filename)
+
+        if os.path.exists(save_path):
+            raise HTTPException(
+                status_code=409,
+                detail=f"File already exists: {filename}",
+            )
+
+        target["filename"] = filename
+        target["save_path"] = save_path
+        # Unique per request: concurrent uploads of one name never share it.
+        target["part_path"] = f"{save_path}.{uuid.uuid4().hex}.part"
+        return target["part_path"]
+
+    form = _UploadForm(options[b"boundary"], open_file)
+
+    try:
+        buffer = bytearray()
+        async for data in request.stream():
+            buffer.extend(data)
+            if len(buffer) >= UPLOAD_CHUNK_BYTES:
+                await run_in_threadpool(form.write, bytes(buffer))
+                buffer.clear()
+        await run_in_threadpool(form.write, bytes(buffer))
+        await run_in_threadpool(form.finish)
+
+        ingest_metadata = _ingest_metadata(form.fields)
+
+        filename = target["filename"]
+        sha256, size = form.sha256, form.size
+        await run_in_threadpool(
+            _store, filename, target["save_path"], target["part_path"], sha256, size, user["username"]
         )
 
-    with open(save_path, "wb") as f:
-        f.write(file.file.read())
+    finally:
+        form.close()
+        part_path = target.get("part_path")
+        if part_path and os.path.exists(part_path):
+            os.remove(part_path)
 
-    return {
+    response = {
         "status": "uploaded",
         "filename": filename,
+        "sha256": sha256,
+        "size_bytes": size,
     }
+
+    if ingest_metadata is not None:
+        from app.admin.jobs import submit_ingest_job
+
+        job = await run_in_threadpool(
+            submit_ingest_job,
+            pdf_filename=filename,
+            metadata=ingest_metadata,
+            requested_by=user["username"],
+        )
+        response["status"] = "uploaded_and_queued"
+        response["job_id"] = job["id"]
+
+    return response
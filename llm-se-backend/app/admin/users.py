@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.auth.authentication import authenticate_user
+from app.auth.user_cache import get_user_cache
 from app.db.database import SessionLocal
 from app.db.models import User
 from app.models.admin_users import UserCreateRequest, UserUpdateRequest
@@ -58,6 +59,7 @@ def create_user(
 
         db.add(new_user)
         db.commit()
+        get_user_cache().invalidate(payload.username)
 
         return {
             "status": "created",
@@ -102,6 +104,7 @@ def update_user(
             target.is_active = payload.is_active
 
         db.commit()
+        get_user_cache().invalidate(username)
 
         return {
             "status": "updated",
@@ -139,6 +142,7 @@ def delete_user(
 
         db.delete(target)
         db.commit()
+        get_user_cache().invalidate(username)
 
         return {
             "status": "deleted",
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.config import METRICS_ENABLED
+from app.telemetry.metrics import render_prometheus
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """
+    Prometheus scrape endpoint: stage latency histograms, HTTP request
+    durations, decision / LLM counters, in-flight LLM calls, cache hit
+    ratios and audit queue state. Aggregates only, no user data.
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics disabled (METRICS_ENABLED=0)")
+
+    return PlainTextResponse(
+        render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,37 +1,145 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import contextlib
+import json
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.auth.authentication import authenticate_user
-from app.retrieval.retrieve import retrieve_authorized_documents
-from app.models.request import QueryRequest
+from app.config import (
+    ANSWER_CACHE_ENABLED,
+    MERGE_ADJACENT_CHUNKS,
+    PROMPT_CONTEXT_TOKENS,
+    PROMPT_MAX_DOCS,
+    QUERY_BATCH_LLM_CONCURRENCY,
+    QUERY_BATCH_MAX_ITEMS,
+    RERANK_CANDIDATES,
+    RERANK_ENABLED,
+    RERANK_TOP_N,
+)
+from app.embeddings.embedder import aembed_batch
+from app.llm.answer_cache import chunk_fingerprint, get_answer_cache
+from app.llm.context import count_message_tokens, pack_context
+from app.retrieval.diversify import diversify, merge_adjacent
+from app.retrieval.retrieve import (
+    TOP_K,
+    aretrieve_authorized_documents,
+    aretrieve_authorized_documents_batch,
+)
+from app.models.request import BatchQueryRequest, QueryRequest
 from app.gates.decision import decision_mode
-from app.llm.invoke import generate_answer, select_documents_for_prompt
+from app.llm.invoke import (
+    agenerate_answer,
+    astream_answer,
+    build_messages,
+    select_documents_for_prompt,
+)
 from app.audit.logger import log_audit_event
+from app.telemetry.metrics import decisions
+from app.telemetry.tracing import stage
 
 router = APIRouter()
 
 
-@router.post("/query")
-def query(
-    request: QueryRequest,
-    user=Depends(authenticate_user),
-):
+# More (cheap) candidates when a reranker picks the few that reach the LLM.
+RETRIEVAL_TOP_K = max(TOP_K, RERANK_CANDIDATES) if RERANK_ENABLED else TOP_K
+
+
+async def _prompt_documents(query, documents, soft=False):
     """
-    Main query endpoint.
+    Chunks that go into the prompt: near-duplicates dropped (and MMR
+    applied), picked by reranker or score, overlapping neighbours
+    merged into single evidence blocks, then packed into the
+    PROMPT_CONTEXT_TOKENS budget.
 
-    Flow:
-    - Authenticate user
-    - Retrieve authorized documents (RBAC + vector search)
-    - Decide response mode (answer / soft_answer / no_info)
-    - Optionally invoke LLM
-    - Audit log every decision
+    Returns (documents, tokens) with tokens = {"context", "prompt",
+    "budget"}: evidence tokens, all message tokens, the budget.
     """
+    if RERANK_ENABLED:
+        from app.retrieval.rerank import arerank
 
-    documents = retrieve_authorized_documents(
-        query=request.query,
-        user=user,
-    )
+        selected_docs = await arerank(query, diversify(documents), top_n=RERANK_TOP_N)
+    else:
+        selected_docs = select_documents_for_prompt(
+            diversify(documents, k=PROMPT_MAX_DOCS),
+            max_docs=PROMPT_MAX_DOCS,
+        )
+
+    if not selected_docs:
+        selected_docs = sorted(
+            documents,
+            key=lambda d: d.get("similarity", 0),
+            reverse=True,
+        )[:PROMPT_MAX_DOCS]
+
+    if MERGE_ADJACENT_CHUNKS:
+        selected_docs = merge_adjacent(selected_docs)
+
+    selected_docs, context_tokens = pack_context(selected_docs)
+
+    tokens = {
+        "context": context_tokens,
+        "prompt": count_message_tokens(build_messages(query, selected_docs, soft=soft)),
+        "budget": PROMPT_CONTEXT_TOKENS,
+    }
+
+    return selected_docs, tokens
+
+
+def _sources(selected_docs):
+    return [
+        {
+            "source": doc["metadata"]["source"],
+            "similarity": doc["similarity"],
+        }
+        for doc in selected_docs
+    ]
 
-    mode = decision_mode(documents)
+
+def _cache_lookup(user, mode, selected_docs, query_embedding):
+    """
+    Returns (cache_key, cached_answer); cache_key is (fingerprint,
+    corpus version) and is passed back to _cache_store.
+    Disabled cache → (None, None).
+    """
+    if not ANSWER_CACHE_ENABLED:
+        return None, None
+
+    cache = get_answer_cache()
+    fingerprint = chunk_fingerprint([doc["id"] for doc in selected_docs], mode)
+    answer = cache.get(user, fingerprint, query_embedding)
+    return (fingerprint, cache.version), answer
+
+
+def _cache_store(user, cache_key, query_embedding, answer):
+    if cache_key is None:
+        return
+
+    fingerprint, version = cache_key
+    get_answer_cache().put(user, fingerprint, query_embedding, answer, version=version)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _answer(request, user, query_embedding, documents, llm_limit=None, progress=None):
+    """
+    Decision, prompt selection, (cached) LLM call and audit event for
+    one retrieved query; returns the /query response body.
+
+    `llm_limit`: optional semaphore held around the LLM call.
+    `progress`: optional dict filled in as the item advances
+    ("tokens" once the prompt is built, "llm_called" once the LLM call
+    starts), so a caller can audit an item that failed or was
+    cancelled part-way.
+    """
+    if progress is None:
+        progress = {}
+
+    with stage("query", "decision"):
+        mode = decision_mode(documents)
+    decisions.add(1, {"decision_mode": mode})
 
     max_similarity = max(d["similarity"] for d in documents) if documents else None
 
@@ -52,28 +160,28 @@ def query(
             "reason": "insufficient_relevance",
         }
 
-    selected_docs = select_documents_for_prompt(documents)
+    with stage("query", "prompt"):
+        selected_docs, tokens = await _prompt_documents(
+            request.query, documents, soft=(mode == "soft_answer")
+        )
 
-    if not selected_docs:
-        selected_docs = sorted(
-            documents,
-            key=lambda d: d.get("similarity", 0),
-            reverse=True,
-        )[:3]
+    with stage("query", "answer_cache"):
+        cache_key, answer = _cache_lookup(user, mode, selected_docs, query_embedding)
+    cached = answer is not None
+    progress["tokens"] = tokens
 
-    answer = generate_answer(
-        query=request.query,
-        documents=selected_docs,
-        soft=(mode == "soft_answer"),
-    )
+    if not cached:
+        async with llm_limit or contextlib.nullcontext():
+            progress["llm_called"] = True
+            answer = await agenerate_answer(
+                query=request.query,
+                documents=selected_docs,
+                soft=(mode == "soft_answer"),
+            )
 
-    sources = [
-        {
-            "source": doc["metadata"]["source"],
-            "similarity": doc["similarity"],
-        }
-        for doc in selected_docs
-    ]
+        _cache_store(user, cache_key, query_embedding, answer)
+
+    sources = _sources(selected_docs)
 
     log_audit_event(
         request_id=request.request_id,
@@ -81,8 +189,9 @@ def query(
         query=request.query,
         decision_mode=mode,
         max_similarity=max_similarity,
-        llm_called=True,
+        llm_called=not cached,
         sources=sources,
+        tokens=tokens,
     )
 
     return {
@@ -91,5 +200,262 @@ def query(
         "data": {
             "answer": answer,
             "sources": sources,
+            "cached": cached,
+            "tokens": tokens,
         },
     }
+
+
+@router.post("/query")
+async def query(
+    request: QueryRequest,
+    user=Depends(authenticate_user),
+):
+    """
+    Main query endpoint.
+
+    Flow:
+    - Authenticate user
+    - Retrieve authorized documents (RBAC + vector search)
+    - Decide response mode (answer / soft_answer / no_info)
+    - Optionally invoke LLM
+    - Audit log every decision
+
+    Runs on the event loop: embedding and LLM calls use pooled
+    async clients, Chroma runs on its bounded executor.
+
+    Answers are served from the RBAC-scoped answer cache when the
+    same evidence was already used for a (near-)identical question.
+    """
+
+    with stage("query", "embed"):
+        query_embedding = (await aembed_batch([request.query]))[0]
+
+    with stage("query", "retrieve"):
+        documents = await aretrieve_authorized_documents(
+            query=request.query,
+            user=user,
+            query_embedding=query_embedding,
+            top_k=RETRIEVAL_TOP_K,
+        )
+
+    return await _answer(request, user, query_embedding, documents)
+
+
+@router.post("/query/stream")
+async def query_stream(
+    request: QueryRequest,
+    user=Depends(authenticate_user),
+):
+    """
+    Streaming variant of /query (Server-Sent Events).
+
+    Events, in order:
+    - meta   → type, request_id, decision_mode, sources, tokens
+    - token  → {"text": ...} per LLM delta (answer modes only)
+    - error  → LLM failure after the stream started
+    - done   → end of stream
+
+    The audit event is written when the stream closes, including
+    when the client disconnects mid-answer.
+
+    A cached answer is sent as a single token event.
+    """
+
+    with stage("query", "embed"):
+        query_embedding = (await aembed_batch([request.query]))[0]
+
+    with stage("query", "retrieve"):
+        documents = await aretrieve_authorized_documents(
+            query=request.query,
+            user=user,
+            query_embedding=query_embedding,
+            top_k=RETRIEVAL_TOP_K,
+        )
+
+    with stage("query", "decision"):
+        mode = decision_mode(documents)
+    decisions.add(1, {"decision_mode": mode})
+
+    max_similarity = max(d["similarity"] for d in documents) if documents else None
+
+    with stage("query", "prompt"):
+        selected_docs, token_usage = (
+            await _prompt_documents(request.query, documents, soft=(mode == "soft_answer"))
+            if mode != "no_info"
+            else ([], None)
+        )
+    sources = _sources(selected_docs)
+
+    with stage("query", "answer_cache"):
+        cache_key, cached_answer = (
+            _cache_lookup(user, mode, selected_docs, query_embedding)
+            if mode != "no_info"
+            else (None, None)
+        )
+    # Set once the LLM request is actually made (not on an early disconnect).
+    llm_called = False
+
+    async def events():
+        nonlocal llm_called
+        try:
+            if mode == "no_info":
+                yield _sse("meta", {
+                    "type": "no_info",
+                    "request_id": request.request_id,
+                    "decision_mode": mode,
+                    "reason": "insufficient_relevance",
+                    "sources": [],
+                })
+                yield _sse("done", {})
+                return
+
+            yield _sse("meta", {
+                "type": "answer",
+                "request_id": request.request_id,
+                "decision_mode": mode,
+                "sources": sources,
+                "cached": cached_answer is not None,
+                "tokens": token_usage,
+            })
+
+            if cached_answer is not None:
+                yield _sse("token", {"text": cached_answer})
+                yield _sse("done", {})
+                return
+
+            tokens = []
+            llm_called = True
+            try:
+                async for token in astream_answer(
+                    query=request.query,
+                    documents=selected_docs,
+                    soft=(mode == "soft_answer"),
+                ):
+                    tokens.append(token)
+                    yield _sse("token", {"text": token})
+            except Exception as e:
+                yield _sse("error", {"detail": str(e)})
+            else:
+                _cache_store(user, cache_key, query_embedding, "".join(tokens).strip())
+
+            yield _sse("done", {})
+
+        finally:
+            # Runs on client disconnect too; enqueueing never blocks.
+            log_audit_event(
+                request_id=request.request_id,
+                user=user,
+                query=request.query,
+                decision_mode=mode,
+                max_similarity=max_similarity,
+                llm_called=llm_called,
+                sources=sources or None,
+                tokens=token_usage,
+            )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.post("/query/batch")
+async def query_batch(
+    request: BatchQueryRequest,
+    user=Depends(authenticate_user),
+):
+    """
+    Many /query requests of the authenticated user in one call
+    (evaluation jobs, internal tools).
+
+    - All questions are embedded in one batched call
+    - Each readable collection is searched once with every embedding
+      (shared RBAC filter)
+    - Decision mode, prompt selection and answer cache run per item
+    - At most QUERY_BATCH_LLM_CONCURRENCY LLM calls are in flight
+
+    Server-Sent Events:
+    - result → the /query response of one item, in completion order
+      (an item whose LLM call failed gets type "error")
+    - done   → {"count": ...}
+
+    Every item gets its own audit event. Items still running when the
+    client disconnects are cancelled.
+    """
+
+    items = request.queries
+    if not items:
+        raise HTTPException(status_code=400, detail="No queries")
+    if len(items) > QUERY_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {QUERY_BATCH_MAX_ITEMS} queries per batch",
+        )
+
+    queries = [item.query for item in items]
+    with stage("query", "embed", batch=len(queries)):
+        query_embeddings = await aembed_batch(queries)
+
+    with stage("query", "retrieve", batch=len(queries)):
+        documents = await aretrieve_authorized_documents_batch(
+            queries=queries,
+            user=user,
+            query_embeddings=query_embeddings,
+            top_k=RETRIEVAL_TOP_K,
+        )
+
+    llm_limit = asyncio.Semaphore(max(1, QUERY_BATCH_LLM_CONCURRENCY))
+
+    async def run(i):
+        item = items[i]
+        progress = {"llm_called": False, "tokens": None}
+
+        def audit_unfinished():
+            log_audit_event(
+                request_id=item.request_id,
+                user=user,
+                query=item.query,
+                decision_mode=decision_mode(documents[i]),
+                max_similarity=max((d["similarity"] for d in documents[i]), default=None),
+                llm_called=progress["llm_called"],
+                sources=None,
+                tokens=progress["tokens"],
+            )
+
+        try:
+            return await _answer(item, user, query_embeddings[i], documents[i], llm_limit, progress)
+        except asyncio.CancelledError:
+            # Client gone: the item is still audited, then cancelled.
+            audit_unfinished()
+            raise
+        except Exception as e:
+            audit_unfinished()
+            return {
+                "type": "error",
+                "request_id": item.request_id,
+                "detail": str(e),
+            }
+
+    async def events():
+        tasks = [asyncio.create_task(run(i)) for i in range(len(items))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield _sse("result", await next_done)
+            yield _sse("done", {"count": len(tasks)})
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
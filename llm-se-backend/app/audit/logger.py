@@ -1,15 +1,23 @@
-import json
 import os
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+from app.audit.writer import get_audit_writer
+from app.config import AUDIT_INDEX_ENABLED, DATA_DIR
+from app.telemetry.tracing import stage
 
-AUDIT_LOG_PATH = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-    "..",
-    "data",
-    "audit_logs.jsonl",
-)
+
+AUDIT_LOG_PATH = os.path.join(DATA_DIR, "audit_logs.jsonl")
+
+
+def _writer():
+    sinks = []
+    if AUDIT_INDEX_ENABLED:
+        from app.audit.store import index_events
+
+        sinks.append(index_events)
+
+    return get_audit_writer(AUDIT_LOG_PATH, sinks=sinks)
 
 
 def log_audit_event(
@@ -21,9 +29,14 @@ def log_audit_event(
     max_similarity: float | None,
     llm_called: bool,
     sources: List[Dict] | None,
+    tokens: Optional[Dict] = None,
 ):
     """
-    Append a single audit event as JSONL.
+    Queue a single audit event for the background JSONL writer.
+    Returns immediately; see app.audit.writer.
+
+    `tokens`: prompt token usage ({"context", "prompt", "budget"})
+    when a prompt was built.
     """
 
     event = {
@@ -40,9 +53,19 @@ def log_audit_event(
         "max_similarity": max_similarity,
         "llm_called": llm_called,
         "sources": sources or [],
+        "tokens": tokens,
     }
 
-    os.makedirs(os.path.dirname(AUDIT_LOG_PATH), exist_ok=True)
+    with stage("audit", "enqueue"):
+        _writer().enqueue(event)
 
-    with open(AUDIT_LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+
+def audit_writer_stats() -> Dict:
+    return _writer().stats()
+
+
+def close_audit_writer():
+    """
+    Flushes queued events (app shutdown).
+    """
+    _writer().close()
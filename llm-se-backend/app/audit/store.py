@@ -0,0 +1,214 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.db.models import AuditEvent, AuditEventSource
+
+
+def _parse_timestamp(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.utcnow()
+
+
+def index_events(batch: List[Dict]):
+    """
+    Writer sink: bulk-inserts a batch of audit events (and their
+    sources) into the SQL store, in one transaction.
+    """
+    if not batch:
+        return
+
+    rows = []
+    for event in batch:
+        user = event.get("user") or {}
+        tokens = event.get("tokens") or {}
+        rows.append({
+            "timestamp": _parse_timestamp(event.get("timestamp")),
+            "request_id": event.get("request_id"),
+            "username": user.get("username"),
+            "department": user.get("department"),
+            "role_level": user.get("role_level"),
+            "clearance_level": user.get("clearance_level"),
+            "query": event.get("query"),
+            "decision_mode": event.get("decision_mode"),
+            "max_similarity": event.get("max_similarity"),
+            "llm_called": bool(event.get("llm_called")),
+            "context_tokens": tokens.get("context"),
+            "prompt_tokens": tokens.get("prompt"),
+        })
+
+    db: Session = SessionLocal()
+    try:
+        ids = db.scalars(
+            insert(AuditEvent).returning(AuditEvent.id, sort_by_parameter_order=True),
+            rows,
+        ).all()
+
+        source_rows = [
+            {
+                "event_id": event_id,
+                "source": source.get("source"),
+                "similarity": source.get("similarity"),
+            }
+            for event_id, event in zip(ids, batch)
+            for source in (event.get("sources") or [])
+            if source.get("source")
+        ]
+        if source_rows:
+            db.execute(insert(AuditEventSource), source_rows)
+
+        db.commit()
+    finally:
+        db.close()
+
+
+def _filtered(
+    stmt,
+    username: Optional[str] = None,
+    department: Optional[str] = None,
+    decision_mode: Optional[str] = None,
+    source: Optional[str] = None,
+    llm_called: Optional[bool] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    if username is not None:
+        stmt = stmt.where(AuditEvent.username == username)
+    if department is not None:
+        stmt = stmt.where(AuditEvent.department == department)
+    if decision_mode is not None:
+        stmt = stmt.where(AuditEvent.decision_mode == decision_mode)
+    if llm_called is not None:
+        stmt = stmt.where(AuditEvent.llm_called == llm_called)
+    if since is not None:
+        stmt = stmt.where(AuditEvent.timestamp >= since)
+    if until is not None:
+        stmt = stmt.where(AuditEvent.timestamp < until)
+    if source is not None:
+        stmt = stmt.where(
+            AuditEvent.id.in_(
+                select(AuditEventSource.event_id).where(AuditEventSource.source == source)
+            )
+        )
+    return stmt
+
+
+def query_events(
+    page: int = 1,
+    page_size: int = 50,
+    **filters,
+) -> Dict:
+    """
+    Newest-first page of audit events matching `filters`
+    (username, department, decision_mode, source, llm_called, since, until).
+    """
+    db: Session = SessionLocal()
+    try:
+        total = db.scalar(_filtered(select(func.count(AuditEvent.id)), **filters))
+
+        events = db.scalars(
+            _filtered(select(AuditEvent), **filters)
+            .order_by(AuditEvent.timestamp.desc(), AuditEvent.id.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        ).all()
+
+        sources: Dict[int, List[Dict]] = {}
+        if events:
+            for row in db.execute(
+                select(
+                    AuditEventSource.event_id,
+                    AuditEventSource.source,
+                    AuditEventSource.similarity,
+                ).where(AuditEventSource.event_id.in_([e.id for e in events]))
+            ):
+                sources.setdefault(row.event_id, []).append(
+                    {"source": row.source, "similarity": row.similarity}
+                )
+
+        return {
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "events": [
+                {
+                    "id": e.id,
+                    "timestamp": e.timestamp.isoformat(),
+                    "request_id": e.request_id,
+                    "user": {
+                        "username": e.username,
+                        "department": e.department,
+                        "role_level": e.role_level,
+                        "clearance_level": e.clearance_level,
+                    },
+                    "query": e.query,
+                    "decision_mode": e.decision_mode,
+                    "max_similarity": e.max_similarity,
+                    "llm_called": e.llm_called,
+                    "tokens": {
+                        "context": e.context_tokens,
+                        "prompt": e.prompt_tokens,
+                    },
+                    "sources": sources.get(e.id, []),
+                }
+                for e in events
+            ],
+        }
+    finally:
+        db.close()
+
+
+AGGREGATE_GROUPS = {
+    "department": AuditEvent.department,
+    "username": AuditEvent.username,
+    "decision_mode": AuditEvent.decision_mode,
+}
+
+
+def aggregate_events(group_by: str = "department", **filters) -> List[Dict]:
+    """
+    Per-group counts: events, LLM calls, LLM-call rate and
+    answer / soft_answer / no_info split.
+    """
+    column = AGGREGATE_GROUPS[group_by]
+
+    def mode_count(mode: str):
+        return func.sum(case((AuditEvent.decision_mode == mode, 1), else_=0))
+
+    stmt = _filtered(
+        select(
+            column.label("key"),
+            func.count(AuditEvent.id).label("events"),
+            func.sum(case((AuditEvent.llm_called.is_(True), 1), else_=0)).label("llm_calls"),
+            mode_count("answer").label("answer"),
+            mode_count("soft_answer").label("soft_answer"),
+            mode_count("no_info").label("no_info"),
+        ),
+        **filters,
+    ).group_by(column).order_by(func.count(AuditEvent.id).desc())
+
+    db: Session = SessionLocal()
+    try:
+        return [
+            {
+                group_by: row.key,
+                "events": row.events,
+                "llm_calls": int(row.llm_calls or 0),
+                "llm_call_rate": round((row.llm_calls or 0) / row.events, 4) if row.events else None,
+                "decision_modes": {
+                    "answer": int(row.answer or 0),
+                    "soft_answer": int(row.soft_answer or 0),
+                    "no_info": int(row.no_info or 0),
+                },
+            }
+            for row in db.execute(stmt)
+        ]
+    finally:
+        db.close()
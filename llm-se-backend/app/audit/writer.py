@@ -0,0 +1,281 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single-process locking only
+    fcntl = None
+
+from app.config import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL_SECONDS,
+    AUDIT_FSYNC,
+    AUDIT_QUEUE_SIZE,
+    AUDIT_ROTATE_BYTES,
+    AUDIT_ROTATE_INTERVAL,
+)
+from app.telemetry.tracing import stage
+
+_ROTATE_BUCKETS = {
+    "hourly": "%Y%m%dT%H",
+    "daily": "%Y%m%d",
+}
+
+
+class AuditWriter:
+    """
+    Background JSONL writer for audit events.
+
+    - enqueue() never blocks: full queue → event dropped and counted
+    - one thread drains the queue and appends batches of up to
+      `batch_size` events, at least every `flush_interval` seconds
+    - batches and rotation run under an flock on `<path>.lock`, so
+      several uvicorn workers can share one log file
+    - the live file rotates by size and/or hour/day; closed segments
+      are gzip-compressed next to it
+    - every written batch is also passed to each of `sinks`
+      (e.g. the SQL index in app.audit.store)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+        fsync: str = AUDIT_FSYNC,
+        rotate_bytes: int = AUDIT_ROTATE_BYTES,
+        rotate_interval: str = AUDIT_ROTATE_INTERVAL,
+        sinks: Sequence[Callable[[List[Dict]], None]] = (),
+    ):
+        self.path = path
+        self.sinks = list(sinks)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.fsync = fsync == "batch"
+        self.rotate_bytes = rotate_bytes
+        self.rotate_format = _ROTATE_BUCKETS.get(rotate_interval)
+
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+        self.write_errors = 0
+        self.sink_errors = 0
+
+    # -------------------------
+    # producer side
+    # -------------------------
+    def enqueue(self, event: Dict) -> bool:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="audit-writer",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def close(self, timeout: float = 5.0):
+        """
+        Stops the thread after writing everything still queued.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "write_errors": self.write_errors,
+            "sink_errors": self.sink_errors,
+        }
+
+    # -------------------------
+    # consumer side
+    # -------------------------
+    def _drain(self) -> List[Dict]:
+        batch: List[Dict] = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval))
+        except queue.Empty:
+            return batch
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._drain()
+            if not batch:
+                continue
+            # Nothing may end this thread: enqueue() never restarts it,
+            # so every later event would silently be dropped.
+            try:
+                with stage("audit", "write", events=len(batch)):
+                    self._write(batch)
+                with stage("audit", "index", events=len(batch)):
+                    self._run_sinks(batch)
+            except Exception as e:
+                self.write_errors += 1
+                print("⚠️ Audit batch failed:", repr(e))
+
+    def _run_sinks(self, batch: List[Dict]):
+        for sink in self.sinks:
+            try:
+                sink(batch)
+            except Exception as e:
+                self.sink_errors += 1
+                print("⚠️ Audit sink failed:", e)
+
+    def _write(self, batch: List[Dict]):
+        closed_segment = None
+
+        try:
+            payload = "".join(json.dumps(event, default=str) + "\n" for event in batch)
+
+            with open(self.path + ".lock", "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    closed_segment = self._maybe_rotate(incoming=len(payload))
+
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(payload)
+                        if self.fsync:
+                            f.flush()
+                            os.fsync(f.fileno())
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except Exception as e:
+            self.write_errors += 1
+            print("⚠️ Audit write failed:", repr(e))
+            return
+
+        self.written += len(batch)
+        self.batches += 1
+
+        if closed_segment is not None:
+            # Outside the lock: other workers keep writing meanwhile.
+            self._compress(closed_segment)
+
+    # -------------------------
+    # rotation (caller holds the lock)
+    # -------------------------
+    def _maybe_rotate(self, incoming: int) -> Optional[str]:
+        """
+        Renames the live file to a closed segment when it is due.
+        Returns the segment path (compressed later) or None.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+        if st.st_size == 0:
+            return None
+
+        rotate = False
+
+        if self.rotate_bytes > 0 and st.st_size + incoming > self.rotate_bytes:
+            rotate = True
+
+        if self.rotate_format is not None:
+            # The live file belongs to the bucket of its last write.
+            last_bucket = datetime.utcfromtimestamp(st.st_mtime).strftime(self.rotate_format)
+            if last_bucket != datetime.utcnow().strftime(self.rotate_format):
+                rotate = True
+
+        if not rotate:
+            return None
+
+        return self._rotate(st.st_mtime)
+
+    def _rotate(self, last_write: float) -> str:
+        base, ext = os.path.splitext(self.path)
+        stamp = datetime.utcfromtimestamp(last_write).strftime("%Y%m%dT%H%M%S")
+
+        segment = f"{base}-{stamp}{ext}"
+        n = 1
+        while os.path.exists(segment) or os.path.exists(segment + ".gz"):
+            segment = f"{base}-{stamp}-{n}{ext}"
+            n += 1
+
+        os.replace(self.path, segment)
+        self.rotations += 1
+
+        return segment
+
+    def _compress(self, segment: str):
+        try:
+            with open(segment, "rb") as src, gzip.open(segment + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(segment)
+        except OSError as e:
+            print("⚠️ Audit segment compression failed:", e)
+
+
+_writer: Optional[AuditWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer(
+    path: str,
+    sinks: Sequence[Callable[[List[Dict]], None]] = (),
+) -> AuditWriter:
+    """
+    Returns the process-wide audit writer for `path`
+    (`sinks` only apply when it is first created).
+    """
+    global _writer
+
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter(path, sinks=sinks)
+                atexit.register(_writer.close)
+
+    return _writer
@@ -2,8 +2,11 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
+from app.auth.user_cache import get_user_cache
+from app.config import USER_CACHE_ENABLED
 from app.db.database import SessionLocal
 from app.db.models import User
+from app.telemetry.tracing import stage
 
 security = HTTPBearer(auto_error=False)
 
@@ -18,8 +21,16 @@ def authenticate_user(
     - Validates user exists in DB
     - Validates user is active
     - Returns user metadata for RBAC
+
+    Active users are served from a short-lived in-process cache
+    (see app.auth.user_cache); admin changes invalidate it.
     """
 
+    with stage("request", "auth"):
+        return _resolve_user(credentials)
+
+
+def _resolve_user(credentials: HTTPAuthorizationCredentials):
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,6 +51,13 @@ def authenticate_user(
             detail="Invalid authorization token",
         )
 
+    cache = get_user_cache() if USER_CACHE_ENABLED else None
+    if cache is not None:
+        cached = cache.get(username)
+        if cached is not None:
+            return cached
+        generation = cache.generation()
+
     db: Session = SessionLocal()
     try:
         user = db.query(User).filter(User.username == username).first()
@@ -56,12 +74,17 @@ def authenticate_user(
                 detail="User is inactive",
             )
 
-        return {
+        resolved = {
             "username": user.username,
             "department": user.department,
             "role_level": user.role_level,
             "clearance_level": user.clearance_level,
         }
 
+        if cache is not None:
+            cache.put(username, resolved, generation)
+
+        return resolved
+
     finally:
         db.close()
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import (
+    USER_CACHE_MAX_ENTRIES,
+    USER_CACHE_TTL_SECONDS,
+    USERS_VERSION_PATH,
+)
+
+
+def _shared_version() -> str:
+    # The file's contents, not its mtime: two bumps within one timestamp
+    # tick (coarse filesystems) must still look different.
+    if not USERS_VERSION_PATH:
+        return ""
+    try:
+        with open(USERS_VERSION_PATH, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+
+def _bump_shared_version():
+    if not USERS_VERSION_PATH:
+        return
+    os.makedirs(os.path.dirname(USERS_VERSION_PATH), exist_ok=True)
+    tmp_path = f"{USERS_VERSION_PATH}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f"{time.time_ns()}-{uuid.uuid4().hex}")
+    os.replace(tmp_path, USERS_VERSION_PATH)
+
+
+class UserCache:
+    """
+    TTL + LRU cache of active users, keyed by username.
+
+    Only active users are cached; unknown or inactive usernames
+    always go to the DB. Entries are dropped:
+    - after `ttl_seconds`
+    - immediately on invalidate(username) (admin user changes)
+    - on every worker when the shared users_version stamp changes
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = USER_CACHE_TTL_SECONDS,
+        max_entries: int = USER_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._shared_version = _shared_version()
+        # Bumped on every invalidation; a DB read that started under an
+        # older generation must not be cached (it may predate the change).
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _sync_shared(self):
+        version = _shared_version()
+        if version != self._shared_version:
+            self._shared_version = version
+            self._entries.clear()
+            self._generation += 1
+
+    def generation(self) -> int:
+        with self._lock:
+            self._sync_shared()
+            return self._generation
+
+    def get(self, username: str) -> Optional[Dict]:
+        with self._lock:
+            self._sync_shared()
+
+            entry = self._entries.get(username)
+            if entry is not None:
+                user, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(username)
+                    self.hits += 1
+                    return dict(user)
+                del self._entries[username]
+
+            self.misses += 1
+            return None
+
+    def put(self, username: str, user: Dict, generation: int):
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            self._entries[username] = (dict(user), time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: Optional[str] = None):
+        """
+        Drops one user (or everyone) here and tells the other workers.
+        """
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(username, None)
+            self._generation += 1
+
+            _bump_shared_version()
+            self._shared_version = _shared_version()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_cache: Optional[UserCache] = None
+
+
+def get_user_cache() -> UserCache:
+    """
+    Returns the process-wide user cache.
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = UserCache()
+
+    return _cache
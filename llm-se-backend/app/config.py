@@ -0,0 +1,240 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runtime state (Chroma, SQLite databases, caches, audit log) and the
+# uploaded PDFs. Overridable so a scratch copy (e.g. benchmarks) never
+# touches the real data.
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(BASE_DIR, "data"))
+SAMPLES_DIR = os.getenv("SAMPLES_DIR", os.path.join(BASE_DIR, "samples"))
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+# =========================
+# EMBEDDINGS
+# =========================
+# Number of texts sent to the embedding backend per request.
+EMBED_BATCH_SIZE = _env_int("EMBED_BATCH_SIZE", 32)
+
+# Which embedding backend serves embed_batch / embed_text:
+#   "hf"   -> Hugging Face Inference API (remote)
+#   "onnx" -> in-process ONNX Runtime model (local, air-gap friendly)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "hf").strip().lower()
+
+# Directory holding model.onnx + tokenizer.json for the ONNX backend.
+# Must be an export of sentence-transformers/all-mpnet-base-v2 so that
+# vectors stay compatible with the existing enterprise_docs collection.
+EMBED_ONNX_DIR = os.getenv(
+    "EMBED_ONNX_DIR",
+    os.path.join(BASE_DIR, "data", "models", "all-mpnet-base-v2"),
+)
+EMBED_ONNX_MAX_LENGTH = _env_int("EMBED_ONNX_MAX_LENGTH", 384)
+EMBED_ONNX_THREADS = _env_int("EMBED_ONNX_THREADS", os.cpu_count() or 1)
+
+# Content-addressed embedding cache (memory LRU + SQLite on disk).
+EMBED_CACHE_ENABLED = _env_bool("EMBED_CACHE_ENABLED", True)
+EMBED_CACHE_MEMORY_ITEMS = _env_int("EMBED_CACHE_MEMORY_ITEMS", 10_000)
+EMBED_CACHE_DISK_MAX_ITEMS = _env_int("EMBED_CACHE_DISK_MAX_ITEMS", 500_000)
+EMBED_CACHE_PATH = os.getenv(
+    "EMBED_CACHE_PATH",
+    os.path.join(DATA_DIR, "embedding_cache.db"),
+)
+
+# =========================
+# RETRIEVAL
+# =========================
+# Upper bound on concurrent Chroma calls made from async request handlers.
+CHROMA_MAX_WORKERS = _env_int("CHROMA_MAX_WORKERS", 8)
+
+# One collection per (owner_department, min_role_level, min_clearance_level)
+# instead of a single filtered collection. Switching an existing corpus
+# over: python -m app.retrieval.partitions
+CHROMA_PARTITIONED = _env_bool("CHROMA_PARTITIONED", False)
+
+# Multi-worker deployments: one retrieval sidecar process owns the Chroma
+# directory and every worker talks to it over this Unix socket (start it
+# with: python -m app.retrieval.sidecar). Empty → each process opens the
+# PersistentClient itself.
+CHROMA_SIDECAR_SOCKET = os.getenv("CHROMA_SIDECAR_SOCKET", "").strip()
+# Per-call socket timeout; also how long a worker waits for the sidecar
+# to come up.
+CHROMA_SIDECAR_TIMEOUT_SECONDS = float(os.getenv("CHROMA_SIDECAR_TIMEOUT_SECONDS", "30"))
+# Idle connections kept open per worker.
+CHROMA_SIDECAR_POOL_SIZE = _env_int("CHROMA_SIDECAR_POOL_SIZE", CHROMA_MAX_WORKERS)
+
+# BM25 index next to Chroma, fused with vector results (reciprocal rank
+# fusion). Existing corpora: python -m app.retrieval.lexical
+LEXICAL_ENABLED = _env_bool("LEXICAL_ENABLED", True)
+LEXICAL_INDEX_PATH = os.getenv(
+    "LEXICAL_INDEX_PATH",
+    os.path.join(DATA_DIR, "lexical_index.db"),
+)
+LEXICAL_TOP_K = _env_int("LEXICAL_TOP_K", 7)
+RRF_K = _env_int("RRF_K", 60)
+
+# Optional cross-encoder rerank between retrieval and prompt building.
+# RERANK_ONNX_DIR holds model.onnx + tokenizer.json of a cross-encoder
+# (e.g. cross-encoder/ms-marco-MiniLM-L-6-v2). Retrieval then returns
+# RERANK_CANDIDATES chunks and the best RERANK_TOP_N go to the LLM.
+RERANK_ENABLED = _env_bool("RERANK_ENABLED", False)
+RERANK_ONNX_DIR = os.getenv(
+    "RERANK_ONNX_DIR",
+    os.path.join(BASE_DIR, "data", "models", "ms-marco-MiniLM-L-6-v2"),
+)
+RERANK_MAX_LENGTH = _env_int("RERANK_MAX_LENGTH", 512)
+RERANK_CANDIDATES = _env_int("RERANK_CANDIDATES", 20)
+RERANK_TOP_N = _env_int("RERANK_TOP_N", 3)
+# Past this, the request falls back to similarity order.
+RERANK_BUDGET_MS = _env_int("RERANK_BUDGET_MS", 150)
+RERANK_THREADS = _env_int("RERANK_THREADS", 2)
+
+# Evidence de-duplication before prompt building (app.retrieval.diversify).
+# Chunks whose embeddings are at least this similar to a better-ranked
+# chunk are dropped (overlapping neighbours, repeated boilerplate).
+DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.95"))
+# Maximal marginal relevance trade-off for picking prompt chunks:
+# 1.0 = pure relevance (off), lower = more diverse evidence.
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "1.0"))
+# Join overlapping neighbour chunks of one source into one evidence block.
+MERGE_ADJACENT_CHUNKS = _env_bool("MERGE_ADJACENT_CHUNKS", True)
+
+# =========================
+# PROMPT
+# =========================
+# Evidence blocks considered for one prompt (before packing).
+PROMPT_MAX_DOCS = _env_int("PROMPT_MAX_DOCS", 3)
+# Token budget for the evidence part of the prompt; blocks are packed in
+# relevance order and the last one is cut at a sentence boundary.
+# 0 disables packing.
+PROMPT_CONTEXT_TOKENS = _env_int("PROMPT_CONTEXT_TOKENS", 1500)
+# tokenizer.json used for counting (ideally the LLM's own tokenizer);
+# without it tokens are estimated as characters / 4.
+PROMPT_TOKENIZER_PATH = os.getenv(
+    "PROMPT_TOKENIZER_PATH",
+    os.path.join(BASE_DIR, "data", "models", "prompt-tokenizer", "tokenizer.json"),
+)
+
+# =========================
+# BATCH QUERIES
+# =========================
+# Max questions in one /query/batch request.
+QUERY_BATCH_MAX_ITEMS = _env_int("QUERY_BATCH_MAX_ITEMS", 256)
+# LLM calls in flight at once for one batch.
+QUERY_BATCH_LLM_CONCURRENCY = _env_int("QUERY_BATCH_LLM_CONCURRENCY", 4)
+
+# =========================
+# ANSWER CACHE
+# =========================
+# Caches LLM answers per RBAC scope + selected chunks + (near-)same query.
+ANSWER_CACHE_ENABLED = _env_bool("ANSWER_CACHE_ENABLED", True)
+ANSWER_CACHE_MAX_ENTRIES = _env_int("ANSWER_CACHE_MAX_ENTRIES", 2_000)
+ANSWER_CACHE_TTL_SECONDS = _env_int("ANSWER_CACHE_TTL_SECONDS", 3_600)
+# Cosine similarity above which two queries count as the same question.
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+
+# Rewritten whenever the corpus changes; every worker compares its contents
+# to decide whether cached answers are still valid.
+CORPUS_VERSION_PATH = os.getenv(
+    "CORPUS_VERSION_PATH",
+    os.path.join(DATA_DIR, "corpus_version"),
+)
+
+# =========================
+# INGESTION
+# =========================
+# Characters per chunk and characters repeated at the start of the next
+# chunk. Fixed: changing them needs a full re-ingest, and retrieval
+# (merging adjacent chunks) relies on the same overlap.
+CHUNK_SIZE = 900
+CHUNK_OVERLAP = 180
+# Background ingest jobs processed concurrently per worker process.
+INGEST_MAX_WORKERS = _env_int("INGEST_MAX_WORKERS", 2)
+# Chunks per collection.add call (also the "chunks written" progress step).
+CHROMA_WRITE_BATCH_SIZE = _env_int("CHROMA_WRITE_BATCH_SIZE", 256)
+# PDFs with at least this many pages are extracted on a process pool.
+INGEST_PARALLEL_MIN_PAGES = _env_int("INGEST_PARALLEL_MIN_PAGES", 64)
+INGEST_EXTRACT_PROCESSES = _env_int("INGEST_EXTRACT_PROCESSES", os.cpu_count() or 1)
+# Pages handed to one extraction task.
+INGEST_PAGES_PER_TASK = _env_int("INGEST_PAGES_PER_TASK", 16)
+
+# =========================
+# UPLOADS
+# =========================
+UPLOAD_MAX_BYTES = _env_int("UPLOAD_MAX_BYTES", 200 * 1024 * 1024)
+# Read/write/hash step while streaming an upload to disk.
+UPLOAD_CHUNK_BYTES = _env_int("UPLOAD_CHUNK_BYTES", 1024 * 1024)
+
+# =========================
+# AUTH
+# =========================
+# In-process cache of resolved users for authenticate_user.
+USER_CACHE_ENABLED = _env_bool("USER_CACHE_ENABLED", True)
+USER_CACHE_TTL_SECONDS = _env_int("USER_CACHE_TTL_SECONDS", 60)
+USER_CACHE_MAX_ENTRIES = _env_int("USER_CACHE_MAX_ENTRIES", 1_024)
+# Cross-worker invalidation: admin user changes rewrite this file and every
+# worker drops its cache when the stamp changes. Set to "" to disable
+# (other workers then pick changes up after USER_CACHE_TTL_SECONDS).
+USERS_VERSION_PATH = os.getenv(
+    "USERS_VERSION_PATH",
+    os.path.join(DATA_DIR, "users_version"),
+)
+
+# =========================
+# AUDIT
+# =========================
+# Events wait in a bounded queue and are appended in batches by a
+# background thread; when the queue is full new events are dropped
+# (and counted) rather than blocking the request.
+AUDIT_QUEUE_SIZE = _env_int("AUDIT_QUEUE_SIZE", 10_000)
+AUDIT_BATCH_SIZE = _env_int("AUDIT_BATCH_SIZE", 500)
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+# "batch" → fsync after every batch, "none" → leave it to the OS
+AUDIT_FSYNC = os.getenv("AUDIT_FSYNC", "batch").strip().lower()
+# Rotate when the live file exceeds this size (0 disables size rotation).
+AUDIT_ROTATE_BYTES = _env_int("AUDIT_ROTATE_BYTES", 64 * 1024 * 1024)
+# "none" | "hourly" | "daily"
+AUDIT_ROTATE_INTERVAL = os.getenv("AUDIT_ROTATE_INTERVAL", "daily").strip().lower()
+# Also index every audit event into the SQL database (GET /admin/audit).
+AUDIT_INDEX_ENABLED = _env_bool("AUDIT_INDEX_ENABLED", True)
+
+# =========================
+# TELEMETRY
+# =========================
+# Per-stage latency histograms and counters, served at GET /metrics
+# (Prometheus text format).
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+# Export per-stage spans over OTLP/gRPC; endpoint, headers and sampler
+# come from the standard OTEL_EXPORTER_OTLP_* / OTEL_TRACES_SAMPLER vars.
+TRACING_ENABLED = _env_bool("TRACING_ENABLED", bool(os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")))
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "sentinel-backend")
+
+# =========================
+# STARTUP
+# =========================
+# Warm-up run at startup so the first /query does not pay for opening
+# Chroma, loading the HNSW index and the first embedding round trip.
+# GET /ready answers 503 until it has finished.
+WARMUP_ENABLED = _env_bool("WARMUP_ENABLED", True)
+# Comma-separated subset of: chroma, embedding, search, tokenizer, rerank, llm
+WARMUP_STEPS = [
+    step.strip().lower()
+    for step in os.getenv("WARMUP_STEPS", "chroma,embedding,search,tokenizer,rerank,llm").split(",")
+    if step.strip()
+]
+# Hold startup until the warm-up is done (else it runs in the background
+# while the server already accepts requests).
+WARMUP_BLOCKING = _env_bool("WARMUP_BLOCKING", False)
+WARMUP_QUERY = os.getenv("WARMUP_QUERY", "warm up")
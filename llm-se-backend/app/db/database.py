@@ -2,11 +2,11 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.config import DATA_DIR
 
 
 # Local SQLite fallback
-DB_PATH = os.path.join(BASE_DIR, "data", "users.db")
+DB_PATH = os.path.join(DATA_DIR, "users.db")
 SQLITE_URL = f"sqlite:///{DB_PATH}"
 
 # Production Postgres (Render)
@@ -1,9 +1,37 @@
+from sqlalchemy import inspect, text
+
 from app.db.database import engine, Base
 from app.db import models
 
 
+def add_missing_columns():
+    """
+    create_all never alters existing tables: add nullable columns
+    introduced after a table was created (no migration tool here).
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                ))
+                print(f"🛠️ Added column {table.name}.{column.name}")
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
 
 
 if __name__ == "__main__":
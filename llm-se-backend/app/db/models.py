@@ -1,4 +1,15 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    Boolean,
+    DateTime,
+    Text,
+    Float,
+    ForeignKey,
+    Index,
+)
 from datetime import datetime
 
 from app.db.database import Base
@@ -17,3 +28,113 @@ class User(Base):
     is_active = Column(Boolean, default=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class IngestJob(Base):
+    __tablename__ = "ingest_jobs"
+
+    id = Column(String, primary_key=True)
+
+    pdf_filename = Column(String, nullable=False)
+    metadata_json = Column(Text, nullable=False)
+    requested_by = Column(String, nullable=False)
+    incremental = Column(Boolean, default=False)
+
+    # queued → running → succeeded | failed | cancelled
+    status = Column(String, nullable=False, default="queued", index=True)
+    stage = Column(String, nullable=True)
+    cancel_requested = Column(Boolean, default=False)
+
+    pages_total = Column(Integer, default=0)
+    pages_extracted = Column(Integer, default=0)
+    chunks_total = Column(Integer, default=0)
+    chunks_embedded = Column(Integer, default=0)
+    chunks_written = Column(Integer, default=0)
+
+    result_json = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+
+    # host:pid of the worker process running the job
+    worker = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class UploadedFile(Base):
+    __tablename__ = "uploaded_files"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String, unique=True, index=True, nullable=False)
+    sha256 = Column(String, unique=True, index=True, nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    uploaded_by = Column(String, nullable=False)
+
+    uploaded_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+
+    timestamp = Column(DateTime, nullable=False, index=True)
+    request_id = Column(String, index=True)
+
+    username = Column(String, index=True)
+    department = Column(String, index=True)
+    role_level = Column(Integer)
+    clearance_level = Column(Integer)
+
+    query = Column(Text)
+    decision_mode = Column(String, index=True)
+    max_similarity = Column(Float)
+    llm_called = Column(Boolean, index=True)
+
+    context_tokens = Column(Integer, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_audit_events_username_timestamp", "username", "timestamp"),
+        Index("ix_audit_events_department_timestamp", "department", "timestamp"),
+    )
+
+
+class AuditEventSource(Base):
+    __tablename__ = "audit_event_sources"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        ForeignKey("audit_events.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    source = Column(String, nullable=False)
+    similarity = Column(Float)
+
+    __table_args__ = (
+        Index("ix_audit_event_sources_source_event", "source", "event_id"),
+    )
+
+
+class Document(Base):
+    # One row per ingested source (PDF filename)
+    __tablename__ = "documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, unique=True, index=True, nullable=False)
+
+    owner_department = Column(String, index=True)
+    min_role_level = Column(Integer)
+    min_clearance_level = Column(Integer)
+
+    chunk_count = Column(Integer, nullable=False, default=0)
+    pages = Column(Integer, nullable=True)
+    sha256 = Column(String, nullable=True, index=True)
+    size_bytes = Column(BigInteger, nullable=True)
+
+    ingested_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
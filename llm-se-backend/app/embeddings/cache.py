@@ -0,0 +1,223 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import (
+    EMBED_CACHE_DISK_MAX_ITEMS,
+    EMBED_CACHE_MEMORY_ITEMS,
+    EMBED_CACHE_PATH,
+)
+
+# SQLite caps bound parameters per statement; stay well below it.
+_SQL_CHUNK = 500
+
+
+def cache_key(model_name: str, text: str) -> str:
+    """
+    Content address of an embedding: sha256(model_name \\0 text).
+    """
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache.
+
+    - Memory tier: LRU of float32 vectors (max `memory_items`)
+    - Disk tier: SQLite table of float32 blobs (max `disk_max_items`,
+      least recently used rows evicted first)
+    """
+
+    def __init__(
+        self,
+        path: str = EMBED_CACHE_PATH,
+        memory_items: int = EMBED_CACHE_MEMORY_ITEMS,
+        disk_max_items: int = EMBED_CACHE_DISK_MAX_ITEMS,
+    ):
+        self.path = path
+        self.memory_items = memory_items
+        self.disk_max_items = disk_max_items
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Disk rows as far as this process knows; recounted only when it
+        # passes the cap (other workers share the file).
+        self._disk_rows = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        self._disk_rows = self._count_rows()
+
+    def _count_rows(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    # -------------------------
+    # memory tier
+    # -------------------------
+    def _remember(self, key: str, vector: np.ndarray):
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # -------------------------
+    # public API
+    # -------------------------
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Returns {key: vector} for every key found in either tier.
+        """
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            disk_lookup: List[str] = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self.memory_hits += 1
+                elif key not in found:
+                    disk_lookup.append(key)
+
+            if disk_lookup:
+                now = time.time()
+                for start in range(0, len(disk_lookup), _SQL_CHUNK):
+                    chunk = disk_lookup[start:start + _SQL_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+                    if rows:
+                        self._conn.executemany(
+                            "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                            [(now, key) for key, _ in rows],
+                        )
+                self._conn.commit()
+
+            self.misses += sum(1 for key in keys if key not in found)
+
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """
+        Stores vectors in both tiers and enforces the disk limit.
+        """
+        if not items:
+            return
+
+        now = time.time()
+
+        with self._lock:
+            rows = []
+            for key, vector in items.items():
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes(), now))
+
+            # Primary-key lookups: which rows are replaced rather than added.
+            keys = list(items)
+            existing = 0
+            for start in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[start:start + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                existing += self._conn.execute(
+                    f"SELECT COUNT(*) FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchone()[0]
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._disk_rows += len(rows) - existing
+
+            if self._disk_rows > self.disk_max_items:
+                self._disk_rows = self._count_rows()
+                overflow = self._disk_rows - self.disk_max_items
+                if overflow > 0:
+                    self._conn.execute(
+                        """
+                        DELETE FROM embeddings WHERE key IN (
+                            SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?
+                        )
+                        """,
+                        (overflow,),
+                    )
+                    self._disk_rows -= overflow
+                    self.evictions += overflow
+
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "memory_items": len(self._memory),
+                "memory_max_items": self.memory_items,
+                "disk_items": self._disk_rows,
+                "disk_max_items": self.disk_max_items,
+            }
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Returns the process-wide embedding cache.
+    """
+    global _cache
+
+    if _cache is not None:
+        return _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache()
+
+    return _cache
@@ -0,0 +1,130 @@
+import asyncio
+from typing import List, Sequence
+
+import numpy as np
+
+from app.config import EMBED_BATCH_SIZE, EMBED_CACHE_ENABLED, EMBEDDING_BACKEND
+
+# Both backends serve the same model, so vectors are interchangeable
+# and the backend can be switched without re-ingesting.
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+
+EMBEDDING_BACKENDS = ("hf", "onnx")
+
+
+def _backend_embed_batch():
+    if EMBEDDING_BACKEND == "hf":
+        from app.embeddings.hf_client import embed_batch
+    elif EMBEDDING_BACKEND == "onnx":
+        from app.embeddings.onnx_client import embed_batch
+    else:
+        raise RuntimeError(
+            f"Unknown EMBEDDING_BACKEND: {EMBEDDING_BACKEND!r} "
+            f"(expected one of {EMBEDDING_BACKENDS})"
+        )
+    return embed_batch
+
+
+def _cached_keys(texts: List[str]):
+    from app.embeddings.cache import cache_key, get_embedding_cache
+
+    cache = get_embedding_cache()
+    keys = [cache_key(EMBEDDING_MODEL_NAME, text) for text in texts]
+    return cache, keys
+
+
+def _split_misses(keys: List[str], texts: List[str], found: dict) -> dict:
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    return missing
+
+
+def embed_batch(
+    texts: Sequence[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Embeds texts with the configured backend (EMBEDDING_BACKEND).
+
+    When EMBED_CACHE_ENABLED, vectors are looked up in the
+    content-addressed cache first and only misses (deduplicated)
+    are sent to the backend.
+
+    Returns a float32 array of shape (len(texts), dim).
+    """
+
+    texts = list(texts)
+    backend_embed_batch = _backend_embed_batch()
+
+    if not EMBED_CACHE_ENABLED or not texts:
+        return backend_embed_batch(texts, batch_size=batch_size)
+
+    cache, keys = _cached_keys(texts)
+    found = cache.get_many(keys)
+    missing = _split_misses(keys, texts, found)
+
+    if missing:
+        vectors = backend_embed_batch(list(missing.values()), batch_size=batch_size)
+        computed = dict(zip(missing.keys(), vectors))
+        cache.put_many(computed)
+        found.update(computed)
+
+    return np.vstack([found[key] for key in keys])
+
+
+async def _abackend_embed_batch(texts: List[str], batch_size: int) -> np.ndarray:
+    if EMBEDDING_BACKEND == "hf":
+        from app.embeddings.hf_client import aembed_batch
+
+        return await aembed_batch(texts, batch_size=batch_size)
+
+    # Local inference is CPU-bound: keep it off the event loop.
+    return await asyncio.to_thread(
+        _backend_embed_batch(), texts, batch_size=batch_size
+    )
+
+
+async def aembed_batch(
+    texts: Sequence[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Async variant of embed_batch for the request path.
+    Cache I/O runs in a worker thread; HF calls use the async client.
+    """
+
+    texts = list(texts)
+
+    if not EMBED_CACHE_ENABLED or not texts:
+        return await _abackend_embed_batch(texts, batch_size)
+
+    cache, keys = _cached_keys(texts)
+    found = await asyncio.to_thread(cache.get_many, keys)
+    missing = _split_misses(keys, texts, found)
+
+    if missing:
+        vectors = await _abackend_embed_batch(list(missing.values()), batch_size)
+        computed = dict(zip(missing.keys(), vectors))
+        await asyncio.to_thread(cache.put_many, computed)
+        found.update(computed)
+
+    return np.vstack([found[key] for key in keys])
+
+
+async def aprime_backend(text: str) -> np.ndarray:
+    """
+    Embeds `text` straight through the backend, skipping the cache,
+    so the HF connection is open (or the ONNX model loaded) before the
+    first query. Used by the startup warm-up.
+    """
+    return (await _abackend_embed_batch([text], EMBED_BATCH_SIZE))[0]
+
+
+def embed_text(text: str) -> List[float]:
+    """
+    Returns a flat embedding vector (length ~768).
+    """
+
+    return embed_batch([text])[0].tolist()
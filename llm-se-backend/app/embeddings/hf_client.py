@@ -1,53 +1,165 @@
+import asyncio
 import os
-from typing import List
+import threading
+from typing import List, Sequence
 
-from huggingface_hub import InferenceClient
+from huggingface_hub import AsyncInferenceClient, InferenceClient
 import numpy as np
 
-HF_EMBEDDING_MODEL = "sentence-transformers/all-mpnet-base-v2"
+from app.config import EMBED_BATCH_SIZE
+from app.embeddings.embedder import EMBEDDING_MODEL_NAME
 
+HF_EMBEDDING_MODEL = EMBEDDING_MODEL_NAME
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
 
-def embed_text(text: str) -> List[float]:
-    """
-    Returns a flat embedding vector (length ~768).
-    Handles HF responses:
-      - List[float]
-      - List[List[float]]
-      - numpy.ndarray
-    """
 
+def _hf_token() -> str:
     hf_token = os.getenv("HF_API_TOKEN")
     if not hf_token:
         raise RuntimeError("HF_API_TOKEN not set")
+    return hf_token
 
-    client = InferenceClient(
-        model=HF_EMBEDDING_MODEL,
-        token=hf_token,
-    )
 
-    response = client.feature_extraction(text)
+def get_hf_client() -> InferenceClient:
+    """
+    Returns a process-wide InferenceClient.
+
+    The client keeps its HTTP session alive between calls,
+    so batches after the first one skip the TLS handshake.
+    """
+    global _client
+
+    if _client is not None:
+        return _client
 
-    if isinstance(response, np.ndarray):
-        if response.ndim == 2:
-            embedding = response[0].tolist()
-        elif response.ndim == 1:
-            embedding = response.tolist()
-        else:
-            raise RuntimeError(f"Invalid numpy embedding shape: {response.shape}")
+    with _client_lock:
+        if _client is None:
+            _client = InferenceClient(
+                model=HF_EMBEDDING_MODEL,
+                token=_hf_token(),
+            )
 
-    elif isinstance(response, list):
+    return _client
+
+
+def get_async_hf_client() -> AsyncInferenceClient:
+    """
+    Returns a process-wide AsyncInferenceClient (pooled connections),
+    used by the async /query path.
+    """
+    global _async_client
+
+    if _async_client is None:
+        _async_client = AsyncInferenceClient(
+            model=HF_EMBEDDING_MODEL,
+            token=_hf_token(),
+        )
+
+    return _async_client
+
+
+def _to_matrix(response, expected_rows: int) -> np.ndarray:
+    """
+    Normalizes an HF feature-extraction response into a
+    float32 matrix of shape (expected_rows, dim).
+
+    Handles HF responses:
+      - List[float] / 1-D ndarray (single input)
+      - List[List[float]] / 2-D ndarray (one vector per input)
+      - 3-D ndarray (token embeddings, mean-pooled)
+    """
+
+    if isinstance(response, list):
         if len(response) == 0:
             raise RuntimeError("Empty embedding response")
+        response = np.asarray(response, dtype=np.float32)
 
-        if isinstance(response[0], list):
-            embedding = response[0]
-        else:
-            embedding = response
-
-    else:
+    if not isinstance(response, np.ndarray):
         raise RuntimeError(f"Unexpected HF embedding response type: {type(response)}")
 
-    if not embedding or not isinstance(embedding[0], float):
-        raise RuntimeError("Embedding vector is not List[float]")
+    if response.ndim == 1:
+        response = response.reshape(1, -1)
+    elif response.ndim == 3:
+        response = response.mean(axis=1)
+    elif response.ndim != 2:
+        raise RuntimeError(f"Invalid numpy embedding shape: {response.shape}")
+
+    if response.shape[0] != expected_rows or response.shape[1] == 0:
+        raise RuntimeError(
+            f"Embedding batch shape mismatch: got {response.shape}, "
+            f"expected {expected_rows} rows"
+        )
+
+    return response.astype(np.float32, copy=False)
+
+
+def embed_batch(
+    texts: Sequence[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Embeds many texts with one HTTP request per batch.
+
+    Returns a float32 array of shape (len(texts), dim),
+    rows in the same order as `texts`.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    client = get_hf_client()
+
+    blocks = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        response = client.feature_extraction(batch)
+        blocks.append(_to_matrix(response, len(batch)))
+
+    return np.vstack(blocks)
+
+
+async def aembed_batch(
+    texts: Sequence[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Async variant of embed_batch.
+    Batches are sent concurrently over the pooled async client.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    client = get_async_hf_client()
+
+    batches = [
+        texts[start:start + batch_size]
+        for start in range(0, len(texts), batch_size)
+    ]
+    responses = await asyncio.gather(
+        *(client.feature_extraction(batch) for batch in batches)
+    )
+
+    return np.vstack([
+        _to_matrix(response, len(batch))
+        for response, batch in zip(responses, batches)
+    ])
+
+
+def embed_text(text: str) -> List[float]:
+    """
+    Returns a flat embedding vector (length ~768).
+    """
 
-    return embedding
+    return embed_batch([text])[0].tolist()
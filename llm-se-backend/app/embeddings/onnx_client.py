@@ -0,0 +1,147 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+import numpy as np
+
+from app.config import (
+    EMBED_BATCH_SIZE,
+    EMBED_ONNX_DIR,
+    EMBED_ONNX_MAX_LENGTH,
+    EMBED_ONNX_THREADS,
+)
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_TOKENIZER_FILE = "tokenizer.json"
+
+_session = None
+_tokenizer = None
+_executor = None
+_load_lock = threading.Lock()
+
+
+def _load():
+    """
+    Loads the ONNX session, tokenizer and inference thread pool once.
+
+    The model directory must contain an export of
+    sentence-transformers/all-mpnet-base-v2:
+      - model.onnx      (outputs token embeddings or a pooled vector)
+      - tokenizer.json  (HF fast tokenizer)
+    """
+    global _session, _tokenizer, _executor
+
+    if _session is not None:
+        return
+
+    with _load_lock:
+        if _session is not None:
+            return
+
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(EMBED_ONNX_DIR, ONNX_MODEL_FILE)
+        tokenizer_path = os.path.join(EMBED_ONNX_DIR, ONNX_TOKENIZER_FILE)
+
+        if not os.path.exists(model_path) or not os.path.exists(tokenizer_path):
+            raise RuntimeError(
+                f"ONNX embedding model not found in {EMBED_ONNX_DIR} "
+                f"(expected {ONNX_MODEL_FILE} and {ONNX_TOKENIZER_FILE})"
+            )
+
+        tokenizer = Tokenizer.from_file(tokenizer_path)
+        tokenizer.enable_truncation(max_length=EMBED_ONNX_MAX_LENGTH)
+        tokenizer.enable_padding()
+
+        workers = max(1, EMBED_ONNX_THREADS)
+
+        # Parallelism comes from running sub-batches on the pool,
+        # so each run gets a share of the cores instead of all of them.
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // workers)
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+
+        _tokenizer = tokenizer
+        _executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="onnx-embed",
+        )
+        _session = session
+
+        print("🧠 ONNX embedding model loaded:", model_path)
+
+
+def _run(texts: Sequence[str]) -> np.ndarray:
+    """
+    One batched inference call.
+    Mean-pools token embeddings over the attention mask and
+    L2-normalizes, matching the sentence-transformers pipeline.
+    """
+
+    encodings = _tokenizer.encode_batch(list(texts))
+
+    input_ids = np.asarray([e.ids for e in encodings], dtype=np.int64)
+    attention_mask = np.asarray([e.attention_mask for e in encodings], dtype=np.int64)
+
+    feeds = {}
+    for model_input in _session.get_inputs():
+        if model_input.name == "input_ids":
+            feeds["input_ids"] = input_ids
+        elif model_input.name == "attention_mask":
+            feeds["attention_mask"] = attention_mask
+        elif model_input.name == "token_type_ids":
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+    output = _session.run(None, feeds)[0]
+
+    if output.ndim == 3:
+        mask = attention_mask[:, :, None].astype(np.float32)
+        summed = (output * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        output = summed / counts
+    elif output.ndim != 2:
+        raise RuntimeError(f"Invalid ONNX embedding shape: {output.shape}")
+
+    norms = np.linalg.norm(output, axis=1, keepdims=True)
+    output = output / np.clip(norms, 1e-12, None)
+
+    return output.astype(np.float32, copy=False)
+
+
+def embed_batch(
+    texts: Sequence[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Embeds texts in-process.
+
+    Sub-batches of `batch_size` run concurrently on the
+    inference pool; rows are returned in input order.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    _load()
+
+    batches = [
+        texts[start:start + batch_size]
+        for start in range(0, len(texts), batch_size)
+    ]
+
+    if len(batches) == 1:
+        return _run(batches[0])
+
+    return np.vstack(list(_executor.map(_run, batches)))
@@ -1,11 +1,17 @@
 from typing import List, Dict
 
+from app.telemetry.tracing import annotate
+
 HARD_THRESHOLD = 0.50
 SOFT_THRESHOLD = 0.40
 
 TOP_N = 4
 MIN_STRONG = 3
 
+# An exact identifier match still needs this much embedding similarity
+# to lift no_info to soft_answer.
+EXACT_MATCH_FLOOR = 0.25
+
 
 def decision_mode(documents: List[Dict]) -> str:
     """
@@ -14,6 +20,10 @@ def decision_mode(documents: List[Dict]) -> str:
     Logic:
     - Use top-N similarities (not global average)
     - Strong evidence from multiple chunks beats math noise
+    - A chunk containing every identifier in the query (part number,
+      error code — see lexical.identifier_terms) is enough for a
+      soft answer when embeddings score it low, but not below
+      EXACT_MATCH_FLOOR
     """
 
     if not documents:
@@ -38,10 +48,9 @@ def decision_mode(documents: List[Dict]) -> str:
     max_similarity = top_similarities[0]
     strong_count = sum(s >= SOFT_THRESHOLD for s in top_similarities)
 
-    print(
-        f"DECISION: top_similarities={top_similarities}, "
-        f"strong_count={strong_count}, "
-        f"HARD={HARD_THRESHOLD}, SOFT={SOFT_THRESHOLD}"
+    annotate(
+        top_similarities=top_similarities,
+        strong_count=strong_count,
     )
 
     # Strong single signal
@@ -52,4 +61,14 @@ def decision_mode(documents: List[Dict]) -> str:
     if strong_count >= MIN_STRONG:
         return "soft_answer"
 
+    # Exact lexical match on the query's identifiers
+    for doc in documents:
+        if not doc.get("exact_match"):
+            continue
+        try:
+            if float(doc.get("similarity", 0)) >= EXACT_MATCH_FLOOR:
+                return "soft_answer"
+        except (TypeError, ValueError):
+            continue
+
     return "no_info"
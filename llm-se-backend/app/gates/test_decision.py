@@ -0,0 +1,44 @@
+"""
+Checks for the decision gate and the identifier terms behind exact_match.
+
+    python -m app.gates.test_decision    (or: python -m pytest app/gates)
+"""
+
+from app.gates.decision import EXACT_MATCH_FLOOR, SOFT_THRESHOLD, decision_mode
+from app.retrieval.lexical import identifier_terms
+
+
+def _docs(*similarities, exact_match=False):
+    return [
+        {"id": f"c{i}", "similarity": similarity, "exact_match": exact_match}
+        for i, similarity in enumerate(similarities)
+    ]
+
+
+def test_acronyms_are_not_identifiers():
+    assert identifier_terms("What does the CEO say about PTO for HR?") == []
+    assert identifier_terms("WHAT IS THE TRAVEL POLICY") == []
+    assert identifier_terms("follow-up e.g. rules") == []
+
+
+def test_codes_are_identifiers():
+    assert identifier_terms("Error E1042 on part X-200 (v2.1)") == ["e1042", "x-200", "v2.1"]
+    assert identifier_terms("max_retries for SAP-FI") == ["max_retries", "sap-fi"]
+
+
+def test_exact_match_lifts_low_similarity():
+    low = EXACT_MATCH_FLOOR + (SOFT_THRESHOLD - EXACT_MATCH_FLOOR) / 2
+    assert decision_mode(_docs(low)) == "no_info"
+    assert decision_mode(_docs(low, exact_match=True)) == "soft_answer"
+
+
+def test_exact_match_needs_similarity_floor():
+    assert decision_mode(_docs(EXACT_MATCH_FLOOR - 0.05, exact_match=True)) == "no_info"
+    assert decision_mode(_docs(0.0, exact_match=True)) == "no_info"
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print("✅", name)
@@ -0,0 +1,184 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import (
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_SIMILARITY,
+    ANSWER_CACHE_TTL_SECONDS,
+)
+from app.retrieval.corpus import corpus_version
+
+
+def access_scope(user: Dict) -> Tuple:
+    """
+    The part of a user that decides what they may read.
+    Two users with the same scope see exactly the same chunks.
+    """
+    return (
+        user["department"],
+        int(user["role_level"]),
+        int(user["clearance_level"]),
+    )
+
+
+def chunk_fingerprint(chunk_ids: Sequence[str], mode: str) -> str:
+    """
+    Identity of the evidence sent to the LLM (order matters,
+    it changes the prompt) plus the decision mode.
+    """
+    digest = hashlib.sha256(mode.encode("utf-8"))
+    for chunk_id in chunk_ids:
+        digest.update(b"\0")
+        digest.update(str(chunk_id).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """
+    Semantic answer cache, partitioned by RBAC scope.
+
+    Key: (access scope, chunk fingerprint). Each key holds the
+    queries answered from that evidence; a lookup hits when the new
+    query's embedding is within `similarity` (cosine) of one of them.
+
+    Any corpus change (see app.retrieval.corpus) drops every entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = ANSWER_CACHE_TTL_SECONDS,
+        similarity: float = ANSWER_CACHE_SIMILARITY,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+
+        # (scope, fingerprint) -> list of {"vector", "answer", "stored_at"}
+        self._entries: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self._size = 0
+        self._version = corpus_version()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_version(self):
+        version = corpus_version()
+        if version != self._version:
+            self._entries.clear()
+            self._size = 0
+            self._version = version
+            self.invalidations += 1
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(
+        self,
+        user: Dict,
+        fingerprint: str,
+        query_embedding,
+    ) -> Optional[str]:
+        key = (access_scope(user), fingerprint)
+        query_vec = self._unit(query_embedding)
+        now = time.time()
+
+        with self._lock:
+            self._check_version()
+
+            bucket = self._entries.get(key)
+            if bucket:
+                live = [e for e in bucket if now - e["stored_at"] < self.ttl_seconds]
+                self._size -= len(bucket) - len(live)
+                if not live:
+                    del self._entries[key]
+                else:
+                    self._entries[key] = live
+                    self._entries.move_to_end(key)
+
+                    vectors = np.vstack([e["vector"] for e in live])
+                    scores = vectors @ query_vec
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity:
+                        self.hits += 1
+                        return live[best]["answer"]
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        user: Dict,
+        fingerprint: str,
+        query_embedding,
+        answer: str,
+        version: Optional[int] = None,
+    ):
+        """
+        Stores an answer. Pass the `version` seen at lookup time so an
+        answer generated from a corpus that changed meanwhile is dropped.
+        """
+        if self.max_entries <= 0:
+            return
+
+        key = (access_scope(user), fingerprint)
+
+        with self._lock:
+            self._check_version()
+
+            if version is not None and version != self._version:
+                return
+
+            self._entries.setdefault(key, []).append({
+                "vector": self._unit(query_embedding),
+                "answer": answer,
+                "stored_at": time.time(),
+            })
+            self._entries.move_to_end(key)
+            self._size += 1
+
+            while self._size > self.max_entries and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+                "entries": self._size,
+                "max_entries": self.max_entries,
+                "similarity": self.similarity,
+            }
+
+
+_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    """
+    Returns the process-wide answer cache.
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = AnswerCache()
+
+    return _cache
@@ -0,0 +1,141 @@
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.config import PROMPT_CONTEXT_TOKENS, PROMPT_TOKENIZER_PATH
+from app.llm.invoke import evidence_block
+
+# Estimate used when no tokenizer.json is available.
+CHARS_PER_TOKEN = 4
+
+# A truncated last block shorter than this is not worth sending.
+MIN_BLOCK_TOKENS = 32
+
+# End of a sentence: terminal punctuation, optional closing quote/bracket.
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*(?=\s|$)")
+
+_tokenizer = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+
+def _get_tokenizer():
+    global _tokenizer, _tokenizer_loaded
+
+    if _tokenizer_loaded:
+        return _tokenizer
+
+    with _tokenizer_lock:
+        if not _tokenizer_loaded:
+            if os.path.exists(PROMPT_TOKENIZER_PATH):
+                from tokenizers import Tokenizer
+
+                _tokenizer = Tokenizer.from_file(PROMPT_TOKENIZER_PATH)
+                _tokenizer.no_truncation()
+                _tokenizer.no_padding()
+                print("🔢 Prompt tokenizer loaded:", PROMPT_TOKENIZER_PATH)
+            else:
+                print(
+                    "⚠️ Prompt tokenizer not found, estimating tokens as chars /",
+                    CHARS_PER_TOKEN,
+                )
+            _tokenizer_loaded = True
+
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def count_message_tokens(messages: List[Dict]) -> int:
+    """
+    Tokens of the message contents (chat template overhead excluded).
+    """
+    return sum(count_tokens(message["content"]) for message in messages)
+
+
+def _token_cut(text: str, max_tokens: int) -> int:
+    """
+    Character offset where the first `max_tokens` tokens of `text` end.
+    """
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return min(len(text), max_tokens * CHARS_PER_TOKEN)
+
+    offsets = tokenizer.encode(text, add_special_tokens=False).offsets
+    if len(offsets) <= max_tokens:
+        return len(text)
+    return offsets[max_tokens - 1][1]
+
+
+def truncate_at_sentence(text: str, max_tokens: int) -> Optional[str]:
+    """
+    Longest prefix of `text` that ends a sentence and fits in
+    `max_tokens`; None if not even the first sentence fits.
+    """
+    cut = _token_cut(text, max_tokens)
+    if cut >= len(text):
+        return text
+
+    last_end = None
+    for match in _SENTENCE_END.finditer(text, 0, cut):
+        last_end = match.end()
+
+    if last_end is None:
+        return None
+
+    return text[:last_end]
+
+
+def pack_context(
+    documents: List[Dict],
+    budget: int = PROMPT_CONTEXT_TOKENS,
+) -> Tuple[List[Dict], int]:
+    """
+    Fills `budget` tokens of evidence in the given (relevance) order.
+
+    Blocks that fit are kept whole; the first one that does not is
+    cut at a sentence boundary (marked "truncated") if at least
+    MIN_BLOCK_TOKENS remain, and packing stops there.
+
+    Returns (documents to send, evidence tokens used).
+    budget <= 0 → every document, tokens still counted.
+    """
+    packed: List[Dict] = []
+    used = 0
+
+    for doc in documents:
+        # "\n\n" separator between blocks
+        overhead = count_tokens(evidence_block(len(packed) + 1, "")) + (1 if packed else 0)
+        tokens = overhead + count_tokens(doc["content"])
+
+        if budget <= 0 or used + tokens <= budget:
+            packed.append(doc)
+            used += tokens
+            continue
+
+        remaining = budget - used - overhead
+        if remaining >= MIN_BLOCK_TOKENS:
+            content = truncate_at_sentence(doc["content"], remaining)
+            if content:
+                packed.append({**doc, "content": content, "truncated": True})
+                used += overhead + count_tokens(content)
+        break
+
+    if not packed and documents:
+        # Not even one sentence fits: hard-cut the best block at a word.
+        doc = documents[0]
+        overhead = count_tokens(evidence_block(1, ""))
+        cut = _token_cut(doc["content"], max(1, budget - overhead))
+        content = doc["content"][:cut]
+        if cut < len(doc["content"]) and " " in content:
+            content = content[:content.rfind(" ")]
+        packed.append({**doc, "content": content, "truncated": True})
+        used = overhead + count_tokens(content)
+
+    return packed, used
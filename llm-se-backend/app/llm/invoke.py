@@ -1,7 +1,11 @@
 import os
-from typing import List, Dict
+import threading
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict
 
-from groq import Groq
+from app.telemetry.tracing import llm_call
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq, Groq
 
 
 MODEL_NAME = "llama-3.1-8b-instant"
@@ -70,6 +74,41 @@ Tone:
 PROMPT_SIMILARITY_THRESHOLD = 0.55
 
 
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+
+def get_groq_client() -> "Groq":
+    """
+    Returns a process-wide Groq client (keeps its connection pool).
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from groq import Groq
+
+                _client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+
+    return _client
+
+
+def get_async_groq_client() -> "AsyncGroq":
+    """
+    Returns a process-wide AsyncGroq client, reused across requests.
+    """
+    global _async_client
+
+    if _async_client is None:
+        from groq import AsyncGroq
+
+        _async_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+
+    return _async_client
+
+
 def select_documents_for_prompt(documents, max_docs=3):
     """
     Select top-N most relevant documents for LLM grounding.
@@ -79,15 +118,20 @@ def select_documents_for_prompt(documents, max_docs=3):
     if not documents:
         return []
 
+    # Hybrid retrieval ranks by fused score; plain vector search by similarity.
     sorted_docs = sorted(
         documents,
-        key=lambda d: d["similarity"],
+        key=lambda d: d.get("rrf_score", d["similarity"]),
         reverse=True,
     )
 
     return sorted_docs[:max_docs]
 
 
+def evidence_block(index: int, content: str) -> str:
+    return f"[Evidence {index}]\n{content}"
+
+
 def build_user_prompt(query: str, documents: List[Dict]) -> str:
     """
     Build a grounded user prompt using retrieved documents.
@@ -96,7 +140,7 @@ def build_user_prompt(query: str, documents: List[Dict]) -> str:
     context_blocks = []
 
     for i, doc in enumerate(documents, start=1):
-        context_blocks.append(f"[Evidence {i}]\n{doc['content']}")
+        context_blocks.append(evidence_block(i, doc["content"]))
 
     context_text = "\n\n".join(context_blocks)
 
@@ -109,22 +153,20 @@ Question:
 """
 
 
-def generate_answer(
+def build_messages(
     query: str,
     documents: List[Dict],
     soft: bool = False,
-) -> str:
+) -> List[Dict]:
     """
-    Generate a grounded answer using Groq LLM.
+    System + user messages for a grounded completion.
     """
 
-    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
     system_prompt = SYSTEM_PROMPT
     if soft:
         system_prompt = SYSTEM_PROMPT + "\n" + SOFT_MODE_NOTE
 
-    messages = [
+    return [
         {
             "role": "system",
             "content": system_prompt.strip(),
@@ -135,11 +177,75 @@ def generate_answer(
         },
     ]
 
-    response = client.chat.completions.create(
-        model=MODEL_NAME,
-        messages=messages,
-        temperature=TEMPERATURE,
-        max_tokens=MAX_TOKENS,
-    )
+
+def generate_answer(
+    query: str,
+    documents: List[Dict],
+    soft: bool = False,
+) -> str:
+    """
+    Generate a grounded answer using Groq LLM.
+    """
+
+    client = get_groq_client()
+
+    with llm_call():
+        response = client.chat.completions.create(
+            model=MODEL_NAME,
+            messages=build_messages(query, documents, soft),
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+        )
 
     return response.choices[0].message.content.strip()
+
+
+async def agenerate_answer(
+    query: str,
+    documents: List[Dict],
+    soft: bool = False,
+) -> str:
+    """
+    Async variant of generate_answer (shared AsyncGroq client).
+    """
+
+    client = get_async_groq_client()
+
+    with llm_call():
+        response = await client.chat.completions.create(
+            model=MODEL_NAME,
+            messages=build_messages(query, documents, soft),
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+        )
+
+    return response.choices[0].message.content.strip()
+
+
+async def astream_answer(
+    query: str,
+    documents: List[Dict],
+    soft: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Stream a grounded answer token-by-token (Groq streaming completion).
+    Yields content deltas as they arrive.
+    """
+
+    client = get_async_groq_client()
+
+    with llm_call(stream=True):
+        stream = await client.chat.completions.create(
+            model=MODEL_NAME,
+            messages=build_messages(query, documents, soft),
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+            stream=True,
+        )
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
@@ -0,0 +1,202 @@
+"""
+Manual check for streaming answers against a local fake LLM server.
+
+Starts an OpenAI-compatible SSE endpoint on localhost, points the Groq
+client at it (GROQ_BASE_URL) and checks:
+
+- astream_answer: time-to-first-token and the streamed answer
+- POST /query/stream (retrieval stubbed): meta → token… → done order
+  and one audit event written when the stream closes
+- a client that disconnects after meta: audited with llm_called=false
+
+No network access or API key needed.
+
+    python -m app.llm.test_stream
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_TOKENS = ["Attention ", "lets ", "each ", "token ", "weigh ", "every ", "other ", "token."]
+FAKE_TOKEN_DELAY = 0.05
+
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if not body.get("stream"):
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        for i, token in enumerate(FAKE_TOKENS):
+            chunk = {
+                "id": "fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": token} if i == 0 else {"content": token},
+                        "finish_reason": None,
+                    }
+                ],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(FAKE_TOKEN_DELAY)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+DOCUMENTS = [
+    {
+        "id": "attention-1",
+        "content": "Attention relates every token to every other token.",
+        "metadata": {"source": "attention.pdf", "page_start": 1, "page_end": 1},
+        "similarity": 0.9,
+    }
+]
+
+USER = {"username": "stream-check", "department": "AI", "role_level": 1, "clearance_level": 1}
+
+
+def _stub_pipeline():
+    """
+    Replaces embedding, retrieval and the audit writer of app.api.query;
+    returns the list audit events are collected in.
+    """
+    import numpy as np
+
+    import app.api.query as query_api
+
+    async def aembed_batch(texts):
+        return np.ones((len(texts), 8), dtype=np.float32)
+
+    async def aretrieve_authorized_documents(query, user, query_embedding=None, top_k=None):
+        return [{**doc, "embedding": np.ones(8, dtype=np.float32)} for doc in DOCUMENTS]
+
+    audit_events = []
+    query_api.aembed_batch = aembed_batch
+    query_api.aretrieve_authorized_documents = aretrieve_authorized_documents
+    query_api.log_audit_event = lambda **event: audit_events.append(event)
+    return audit_events
+
+
+def _parse_sse(text: str):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def check_astream(base_url: str):
+    from app.llm.invoke import astream_answer
+
+    start = time.perf_counter()
+    first_token_at = None
+    tokens = []
+
+    async for token in astream_answer("What is attention?", DOCUMENTS):
+        if first_token_at is None:
+            first_token_at = time.perf_counter() - start
+        tokens.append(token)
+
+    total = time.perf_counter() - start
+
+    assert tokens == FAKE_TOKENS, tokens
+    print("Fake server:", base_url)
+    print(f"Time to first token: {first_token_at * 1000:.1f} ms")
+    print(f"Total stream time:   {total * 1000:.1f} ms")
+    print("Answer:", "".join(tokens))
+
+
+def check_endpoint(audit_events):
+    from fastapi.testclient import TestClient
+
+    from app.auth.authentication import authenticate_user
+    from app.main import app
+
+    app.dependency_overrides[authenticate_user] = lambda: USER
+    try:
+        response = TestClient(app).post(
+            "/query/stream",
+            json={"request_id": "stream-1", "query": "What is attention?"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200, response.text
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+
+    assert names[0] == "meta" and names[-1] == "done", names
+    assert set(names[1:-1]) == {"token"}, names
+    assert events[0][1]["type"] == "answer", events[0]
+    assert [data["text"] for _, data in events[1:-1]] == FAKE_TOKENS
+
+    assert len(audit_events) == 1, audit_events
+    audit = audit_events.pop()
+    assert audit["request_id"] == "stream-1" and audit["llm_called"] is True, audit
+    assert audit["sources"] == [{"source": "attention.pdf", "similarity": 0.9}], audit
+
+    print("/query/stream events:", " → ".join(dict.fromkeys(names)), f"({len(names) - 2} tokens)")
+
+
+async def check_disconnect(audit_events):
+    from app.api.query import query_stream
+    from app.models.request import QueryRequest
+
+    response = await query_stream(
+        QueryRequest(request_id="stream-2", query="What is attention?"),
+        user=USER,
+    )
+    body = response.body_iterator
+
+    first = await body.__anext__()
+    assert first.startswith("event: meta"), first
+    await body.aclose()
+
+    assert len(audit_events) == 1, audit_events
+    audit = audit_events.pop()
+    assert audit["request_id"] == "stream-2" and audit["llm_called"] is False, audit
+
+    print("Disconnect after meta: audited, llm_called=false")
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGroqHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ.setdefault("GROQ_API_KEY", "fake-key")
+    # Scratch state, no cached answers: every stream reaches the fake LLM.
+    os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="llm-se-stream-")
+    os.environ["ANSWER_CACHE_ENABLED"] = "false"
+
+    try:
+        asyncio.run(check_astream(base_url))
+
+        audit_events = _stub_pipeline()
+        check_endpoint(audit_events)
+        asyncio.run(check_disconnect(audit_events))
+    finally:
+        server.shutdown()
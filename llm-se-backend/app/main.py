@@ -4,16 +4,24 @@ load_dotenv()
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response
 
+from app.api.metrics import router as metrics_router
 from app.api.query import router as query_router
 from app.auth.me import router as auth_me_router
 from app.admin.ingest import router as admin_ingest_router
 from app.admin.documents import router as admin_documents_router
 from app.admin.upload import router as admin_upload_router
 from app.admin.users import router as admin_users_router
-from app.db.database import engine, Base
+from app.admin.cache import router as admin_cache_router
+from app.admin.jobs import router as admin_jobs_router, resume_ingest_jobs
+from app.admin.audit import router as admin_audit_router
+from app.admin.registry import sync_registry_if_empty
+from app.audit.logger import close_audit_writer
+from app.db.init_db import init_db
 from app.db.seed import seed_users_if_empty
+from app.telemetry.tracing import RequestMetricsMiddleware, setup_tracing
+from app.warmup import readiness, start_warmup, stop_warmup
 
 
 app = FastAPI(title="Secure Enterprise LLM Platform")
@@ -31,6 +39,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestMetricsMiddleware)
 
 
 # =========================
@@ -42,6 +51,10 @@ app.include_router(admin_upload_router)
 app.include_router(admin_ingest_router)
 app.include_router(admin_documents_router)
 app.include_router(admin_users_router)
+app.include_router(admin_cache_router)
+app.include_router(admin_jobs_router)
+app.include_router(admin_audit_router)
+app.include_router(metrics_router)
 
 
 # =========================
@@ -49,10 +62,38 @@ app.include_router(admin_users_router)
 # =========================
 @app.get("/health")
 def health():
+    """
+    Liveness: the process is up and serving. Never touches Chroma,
+    the database or the model backends.
+    """
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready():
+    """
+    Readiness: 200 once the startup warm-up has finished, 503 before
+    that and while shutting down.
+    """
+    state = readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
+    setup_tracing()
+    init_db()
     seed_users_if_empty()
+    sync_registry_if_empty()
+    resume_ingest_jobs()
+
+
+@app.on_event("startup")
+async def on_startup_warmup():
+    await start_warmup()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_warmup()
+    close_audit_writer()
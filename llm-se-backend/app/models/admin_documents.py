@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class DocumentPermissionsUpdate(BaseModel):
+    owner_department: Optional[str] = None
+    min_role_level: Optional[int] = None
+    min_clearance_level: Optional[int] = None
@@ -6,3 +6,4 @@ from typing import Dict, Any
 class PdfIngestRequest(BaseModel):
     pdf_filename: str
     metadata: Dict[str, Any]
+    incremental: bool = False
@@ -1,6 +1,12 @@
+from typing import List
+
 from pydantic import BaseModel
 
 
 class QueryRequest(BaseModel):
     request_id: str
     query: str
+
+
+class BatchQueryRequest(BaseModel):
+    queries: List[QueryRequest]
@@ -1,11 +1,56 @@
+import asyncio
+import contextvars
+import functools
 import os
-import chromadb
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import CHROMA_MAX_WORKERS, CHROMA_SIDECAR_SOCKET, DATA_DIR
 
 
 COLLECTION_NAME = "enterprise_docs"
 
 _client = None
 _collection = None
+_executor = None
+
+
+def open_persistent_client():
+    """
+    Opens the Chroma directory (DATA_DIR/chroma) in this process.
+    chromadb is imported here, on first use, to keep startup fast.
+    """
+    import chromadb
+
+    CHROMA_PATH = os.path.join(DATA_DIR, "chroma")
+    os.makedirs(CHROMA_PATH, exist_ok=True)
+
+    client = chromadb.PersistentClient(path=CHROMA_PATH)
+
+    print("🔍 Chroma persist path:", CHROMA_PATH)
+
+    return client
+
+
+def get_chroma_client():
+    """
+    Returns the singleton Chroma client: the PersistentClient, or with
+    CHROMA_SIDECAR_SOCKET a client of the shared retrieval sidecar
+    (same calls, one index in memory for all workers).
+    """
+    global _client
+
+    if _client is not None:
+        return _client
+
+    if CHROMA_SIDECAR_SOCKET:
+        from .sidecar_client import SidecarClient
+
+        _client = SidecarClient(CHROMA_SIDECAR_SOCKET)
+        print("🔌 Chroma served by retrieval sidecar:", CHROMA_SIDECAR_SOCKET)
+    else:
+        _client = open_persistent_client()
+
+    return _client
 
 
 def get_chroma_collection():
@@ -13,28 +58,43 @@ def get_chroma_collection():
     Returns a singleton Chroma collection backed by persistent storage.
 
     IMPORTANT:
-    - Uses PersistentClient (not Client + Settings)
+    - Uses PersistentClient (not Client + Settings), or the retrieval
+      sidecar when CHROMA_SIDECAR_SOCKET is set
     - Path is resolved from project root
     - Must match ingestion scripts EXACTLY
     """
-    global _client, _collection
+    global _collection
 
     if _collection is not None:
         return _collection
 
-    BASE_DIR = os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    )
+    _collection = get_chroma_client().get_or_create_collection(name=COLLECTION_NAME)
 
-    CHROMA_PATH = os.path.join(BASE_DIR, "data", "chroma")
-    os.makedirs(CHROMA_PATH, exist_ok=True)
+    print("🔍 Collection name:", COLLECTION_NAME)
 
-    _client = chromadb.PersistentClient(path=CHROMA_PATH)
+    return _collection
 
-    _collection = _client.get_or_create_collection(name=COLLECTION_NAME)
 
-    print("🔍 Chroma persist path:", CHROMA_PATH)
-    print("🔍 Collection name:", COLLECTION_NAME)
-    print("🔍 Collection count (on load):", _collection.count())
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
 
-    return _collection
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=CHROMA_MAX_WORKERS,
+            thread_name_prefix="chroma",
+        )
+    return _executor
+
+
+async def run_in_chroma_executor(fn, *args, **kwargs):
+    """
+    Runs a blocking Chroma call on a bounded executor so async
+    handlers never stall the event loop (or the shared threadpool).
+    The caller's context goes along (stage spans nest under it).
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _get_executor(),
+        functools.partial(ctx.run, fn, *args, **kwargs),
+    )
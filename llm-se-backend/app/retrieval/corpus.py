@@ -0,0 +1,33 @@
+import os
+import time
+import uuid
+
+from app.config import CORPUS_VERSION_PATH
+
+
+def bump_corpus_version():
+    """
+    Marks the corpus as changed (ingest / delete).
+
+    The stamp lives on disk so every uvicorn worker sees it,
+    not only the one that handled the admin request. Each bump writes
+    a new unique value (replaced atomically), so two bumps within one
+    filesystem timestamp tick still differ.
+    """
+    os.makedirs(os.path.dirname(CORPUS_VERSION_PATH), exist_ok=True)
+    tmp_path = f"{CORPUS_VERSION_PATH}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f"{time.time_ns()}-{uuid.uuid4().hex}")
+    os.replace(tmp_path, CORPUS_VERSION_PATH)
+
+
+def corpus_version() -> str:
+    """
+    Current corpus stamp ("" if the corpus was never changed).
+    One small file read, cheap enough for the request path.
+    """
+    try:
+        with open(CORPUS_VERSION_PATH, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import CHUNK_OVERLAP, DEDUP_SIMILARITY, MMR_LAMBDA
+
+
+def _similarity_matrix(documents: List[Dict]) -> Optional[np.ndarray]:
+    """
+    Cosine similarity between all retrieved chunks, from the
+    embeddings Chroma returned with them. None if any is missing.
+    """
+    if any(doc.get("embedding") is None for doc in documents):
+        return None
+
+    matrix = np.vstack([np.asarray(doc["embedding"], dtype=np.float32) for doc in documents])
+    matrix /= np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+    return matrix @ matrix.T
+
+
+def _relevance(documents: List[Dict]) -> np.ndarray:
+    return np.asarray([doc["similarity"] for doc in documents], dtype=np.float32)
+
+
+def suppress_near_duplicates(
+    documents: List[Dict],
+    threshold: float = DEDUP_SIMILARITY,
+) -> List[Dict]:
+    """
+    Drops every chunk at least `threshold`-similar to a better-ranked
+    kept chunk. Input order (the retrieval ranking) is preserved.
+    """
+    if len(documents) < 2 or threshold >= 1.0:
+        return documents
+
+    sims = _similarity_matrix(documents)
+    if sims is None:
+        return documents
+
+    keep: List[int] = []
+    for i in range(len(documents)):
+        if not keep or sims[i, keep].max() < threshold:
+            keep.append(i)
+
+    return [documents[i] for i in keep]
+
+
+def mmr(
+    documents: List[Dict],
+    k: int,
+    lambda_: float = MMR_LAMBDA,
+) -> List[Dict]:
+    """
+    Maximal marginal relevance: picks `k` chunks, each maximizing
+    lambda * similarity(query) - (1 - lambda) * max similarity to
+    the chunks already picked.
+    """
+    if lambda_ >= 1.0 or len(documents) <= k:
+        return documents
+
+    sims = _similarity_matrix(documents)
+    if sims is None:
+        return documents
+
+    relevance = _relevance(documents)
+    redundancy = np.zeros(len(documents), dtype=np.float32)
+    available = np.ones(len(documents), dtype=bool)
+    picked: List[int] = []
+
+    for _ in range(k):
+        scores = lambda_ * relevance - (1.0 - lambda_) * redundancy
+        scores[~available] = -np.inf
+        j = int(np.argmax(scores))
+        picked.append(j)
+        available[j] = False
+        redundancy = np.maximum(redundancy, sims[j])
+
+    return [documents[i] for i in picked]
+
+
+def diversify(documents: List[Dict], k: Optional[int] = None) -> List[Dict]:
+    """
+    Near-duplicate suppression, then (with MMR_LAMBDA < 1 and a `k`)
+    MMR selection of `k` chunks.
+    """
+    documents = suppress_near_duplicates(documents)
+
+    if k is not None:
+        documents = mmr(documents, k)
+
+    return documents
+
+
+def _follows(first: Dict, second: Dict) -> bool:
+    """
+    True when `second` is the chunk right after `first` in the same
+    source: the chunker repeats the last CHUNK_OVERLAP characters.
+    """
+    if first["metadata"].get("source") != second["metadata"].get("source"):
+        return False
+
+    a, b = first["content"], second["content"]
+    if len(a) < CHUNK_OVERLAP or len(b) < CHUNK_OVERLAP:
+        return False
+
+    return a[-CHUNK_OVERLAP:] == b[:CHUNK_OVERLAP]
+
+
+def _join(first: Dict, second: Dict) -> Dict:
+    meta_a, meta_b = first["metadata"], second["metadata"]
+    metadata = dict(meta_a)
+    if meta_b.get("page_end") is not None:
+        metadata["page_end"] = meta_b["page_end"]
+
+    merged = {
+        **first,
+        "id": f"{first['id']}+{second['id']}",
+        "content": first["content"] + second["content"][CHUNK_OVERLAP:],
+        "metadata": metadata,
+        "similarity": max(first["similarity"], second["similarity"]),
+        "merged_ids": first.get("merged_ids", [first["id"]]) + second.get("merged_ids", [second["id"]]),
+    }
+    for key in ("rrf_score", "rerank_score", "lexical_score"):
+        values = [doc[key] for doc in (first, second) if doc.get(key) is not None]
+        if values:
+            merged[key] = max(values)
+    if first.get("exact_match") or second.get("exact_match"):
+        merged["exact_match"] = True
+
+    return merged
+
+
+def merge_adjacent(documents: List[Dict]) -> List[Dict]:
+    """
+    Joins chunks that directly follow each other in one source into a
+    single evidence block (overlap written once). A block takes the
+    position of its best-ranked chunk.
+    """
+    blocks = list(documents)
+
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(blocks)):
+            for j in range(len(blocks)):
+                if i == j:
+                    continue
+                if _follows(blocks[i], blocks[j]):
+                    block = _join(blocks[i], blocks[j])
+                    keep, drop = min(i, j), max(i, j)
+                    blocks[keep] = block
+                    del blocks[drop]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    return blocks
@@ -0,0 +1,489 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import LEXICAL_INDEX_PATH
+
+# BM25 parameters (Lucene defaults)
+K1 = 1.2
+B = 0.75
+
+# Terms in more than this share of chunks carry ~no BM25 weight
+# and have the longest posting lists; they are skipped at query time.
+MAX_DF_RATIO = 0.5
+
+MAX_QUERY_TERMS = 32
+
+# SQLite caps bound parameters per statement; stay well below it.
+_SQL_CHUNK = 500
+
+# Keeps part numbers / codes like "x-200", "e_1042", "v2.1" as one token.
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:[-_.][A-Za-z0-9]+)*")
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be but by can do does for from has have how i if in
+    is it its me my no not of on or our so that the their them then there
+    these they this to was we were what when where which who why will with
+    you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        token
+        for token in (match.group(0).lower() for match in _TOKEN_RE.finditer(text))
+        if token not in STOPWORDS
+    ]
+
+
+def _is_identifier(token: str) -> bool:
+    if any(ch.isdigit() for ch in token) or "_" in token:
+        return True
+    # "SAP-FI", "Foo.Bar" — but not "follow-up" or "e.g"
+    return ("-" in token or "." in token) and not token.islower()
+
+
+def identifier_terms(query: str) -> List[str]:
+    """
+    Query tokens that look like exact identifiers: part numbers,
+    error codes (contain a digit) or compound names (internal "_", or
+    "-" / "." with capitals). Plain acronyms ("HR", "CEO") and
+    all-caps words are ordinary terms.
+    """
+    terms = []
+    for match in _TOKEN_RE.finditer(query):
+        token = match.group(0)
+        if token.lower() in STOPWORDS:
+            continue
+        if _is_identifier(token):
+            terms.append(token.lower())
+    return list(dict.fromkeys(terms))
+
+
+def _rbac_sql(user: Dict) -> Tuple[str, List]:
+    """
+    SQL version of retrieve.build_rbac_filter over the chunks table.
+    """
+    clause = "c.min_role_level <= ? AND c.min_clearance_level <= ?"
+    params: List = [user["role_level"], user["clearance_level"]]
+
+    if user["department"] != "shared":
+        clause += " AND c.owner_department IN (?, 'shared')"
+        params.append(user["department"])
+
+    return clause, params
+
+
+class LexicalIndex:
+    """
+    Persistent BM25 inverted index over chunk text (SQLite, WAL).
+
+    - terms:    term_id, term, df
+    - chunks:   doc_id, chunk_id, source, RBAC metadata, token length,
+                and its term ids (packed int32, used to delete postings)
+    - postings: (term_id, doc_id, tf), clustered by term — integer
+                keys only, no secondary index, so posting lists stay
+                small and one term lookup is a single range scan
+    - stats:    chunk count and total token length (for avgdl)
+
+    Every writer (ingest, delete, re-permission) updates it in
+    place; uvicorn workers share the file.
+    """
+
+    def __init__(self, path: str = LEXICAL_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS terms (
+                term_id INTEGER PRIMARY KEY,
+                term TEXT NOT NULL UNIQUE,
+                df INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                doc_id INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL UNIQUE,
+                source TEXT,
+                owner_department TEXT,
+                min_role_level INTEGER,
+                min_clearance_level INTEGER,
+                length INTEGER NOT NULL,
+                term_ids BLOB
+            );
+            CREATE INDEX IF NOT EXISTS ix_chunks_source ON chunks (source);
+            CREATE TABLE IF NOT EXISTS postings (
+                term_id INTEGER NOT NULL,
+                doc_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term_id, doc_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                n_chunks INTEGER NOT NULL,
+                total_length INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO stats (id, n_chunks, total_length) VALUES (1, 0, 0);
+            """
+        )
+        self._conn.commit()
+
+    # -------------------------
+    # writes
+    # -------------------------
+    def add(self, chunk_ids: Sequence[str], texts: Sequence[str], metadatas: Sequence[Dict]):
+        """
+        Indexes chunks. Ids already indexed keep their postings (ids
+        are content-derived) and only get their metadata refreshed.
+        """
+        if not chunk_ids:
+            return
+
+        with self._lock:
+            existing = self._doc_ids(chunk_ids)
+
+            refreshed = [
+                (i, existing[cid]) for i, cid in enumerate(chunk_ids) if cid in existing
+            ]
+            if refreshed:
+                self._conn.executemany(
+                    """
+                    UPDATE chunks SET source = ?, owner_department = ?,
+                        min_role_level = ?, min_clearance_level = ?
+                    WHERE doc_id = ?
+                    """,
+                    [(*self._meta_row(metadatas[i]), doc_id) for i, doc_id in refreshed],
+                )
+
+            new_chunks = [
+                (cid, Counter(tokenize(text)), meta)
+                for cid, text, meta in zip(chunk_ids, texts, metadatas)
+                if cid not in existing
+            ]
+            if new_chunks:
+                df: Counter = Counter()
+                for _, counts, _ in new_chunks:
+                    df.update(counts.keys())
+
+                self._conn.executemany(
+                    """
+                    INSERT INTO terms (term, df) VALUES (?, ?)
+                    ON CONFLICT (term) DO UPDATE SET df = df + excluded.df
+                    """,
+                    df.items(),
+                )
+                term_ids = self._term_ids(list(df))
+
+                postings: List[Tuple[int, int, int]] = []
+                total_length = 0
+                for cid, counts, meta in new_chunks:
+                    length = sum(counts.values())
+                    ids = np.array([term_ids[term] for term in counts], dtype=np.int32)
+                    doc_id = self._conn.execute(
+                        """
+                        INSERT INTO chunks (chunk_id, source, owner_department,
+                            min_role_level, min_clearance_level, length, term_ids)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (cid, *self._meta_row(meta), length, ids.tobytes()),
+                    ).lastrowid
+                    postings.extend(
+                        (term_ids[term], doc_id, tf) for term, tf in counts.items()
+                    )
+                    total_length += length
+
+                # Sorted by the clustered key: appends instead of random inserts.
+                postings.sort()
+                self._conn.executemany(
+                    "INSERT INTO postings (term_id, doc_id, tf) VALUES (?, ?, ?)",
+                    postings,
+                )
+                self._conn.execute(
+                    "UPDATE stats SET n_chunks = n_chunks + ?, total_length = total_length + ?",
+                    (len(new_chunks), total_length),
+                )
+
+            self._conn.commit()
+
+    def delete(self, chunk_ids: Sequence[str]):
+        if not chunk_ids:
+            return
+
+        with self._lock:
+            self._delete_doc_ids(list(self._doc_ids(chunk_ids).values()))
+            self._conn.commit()
+
+    def delete_source(self, source: str):
+        with self._lock:
+            doc_ids = [
+                doc_id
+                for (doc_id,) in self._conn.execute(
+                    "SELECT doc_id FROM chunks WHERE source = ?", (source,)
+                )
+            ]
+            self._delete_doc_ids(doc_ids)
+            self._conn.commit()
+
+    def update_metadata(self, chunk_ids: Sequence[str], metadatas: Sequence[Dict]):
+        with self._lock:
+            self._conn.executemany(
+                """
+                UPDATE chunks SET source = ?, owner_department = ?,
+                    min_role_level = ?, min_clearance_level = ?
+                WHERE chunk_id = ?
+                """,
+                [(*self._meta_row(meta), cid) for cid, meta in zip(chunk_ids, metadatas)],
+            )
+            self._conn.commit()
+
+    def update_source_metadata(self, source: str, changes: Dict):
+        columns = [c for c in ("owner_department", "min_role_level", "min_clearance_level") if c in changes]
+        if not columns:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE chunks SET {', '.join(f'{c} = ?' for c in columns)} WHERE source = ?",
+                [changes[c] for c in columns] + [source],
+            )
+            self._conn.commit()
+
+    # -------------------------
+    # search
+    # -------------------------
+    def search(self, query: str, user: Dict, top_k: int) -> List[Dict]:
+        """
+        BM25 top-k over the chunks `user` may read. Each hit:
+        {id, score, exact_match, metadata}; exact_match is True when
+        the chunk contains every identifier-like query term.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        if not terms:
+            return []
+
+        identifiers = set(identifier_terms(query))
+        rbac_clause, rbac_params = _rbac_sql(user)
+
+        with self._lock:
+            n_chunks, total_length = self._conn.execute(
+                "SELECT n_chunks, total_length FROM stats"
+            ).fetchone()
+            if not n_chunks:
+                return []
+            avgdl = total_length / n_chunks
+
+            placeholders = ",".join("?" * len(terms))
+            term_rows = self._conn.execute(
+                f"SELECT term_id, term, df FROM terms WHERE term IN ({placeholders})",
+                terms,
+            ).fetchall()
+
+            scores: Dict[int, float] = {}
+            matched: Dict[int, set] = {}
+            lengths: Dict[int, int] = {}
+
+            for term_id, term, df in term_rows:
+                if df > n_chunks * MAX_DF_RATIO and term not in identifiers:
+                    continue
+                idf = math.log(1 + (n_chunks - df + 0.5) / (df + 0.5))
+
+                for doc_id, tf, length in self._conn.execute(
+                    f"""
+                    SELECT p.doc_id, p.tf, c.length
+                    FROM postings p JOIN chunks c ON c.doc_id = p.doc_id
+                    WHERE p.term_id = ? AND {rbac_clause}
+                    """,
+                    [term_id, *rbac_params],
+                ):
+                    norm = tf + K1 * (1 - B + B * length / avgdl)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (K1 + 1) / norm
+                    lengths[doc_id] = length
+                    if term in identifiers:
+                        matched.setdefault(doc_id, set()).add(term)
+
+            if not scores:
+                return []
+
+            top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            placeholders = ",".join("?" * len(top))
+            meta_rows = {
+                row[0]: row[1:]
+                for row in self._conn.execute(
+                    f"""
+                    SELECT doc_id, chunk_id, source, owner_department,
+                        min_role_level, min_clearance_level
+                    FROM chunks WHERE doc_id IN ({placeholders})
+                    """,
+                    [doc_id for doc_id, _ in top],
+                )
+            }
+
+        return [
+            {
+                "id": meta_rows[doc_id][0],
+                "score": round(score, 4),
+                "exact_match": bool(identifiers) and matched.get(doc_id, set()) == identifiers,
+                "metadata": {
+                    "source": meta_rows[doc_id][1],
+                    "owner_department": meta_rows[doc_id][2],
+                    "min_role_level": meta_rows[doc_id][3],
+                    "min_clearance_level": meta_rows[doc_id][4],
+                },
+            }
+            for doc_id, score in top
+            if doc_id in meta_rows
+        ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            n_chunks, total_length = self._conn.execute(
+                "SELECT n_chunks, total_length FROM stats"
+            ).fetchone()
+            n_terms = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        return {
+            "chunks": n_chunks,
+            "terms": n_terms,
+            "avg_chunk_tokens": round(total_length / n_chunks, 1) if n_chunks else None,
+        }
+
+    # -------------------------
+    # helpers (caller holds the lock)
+    # -------------------------
+    @staticmethod
+    def _meta_row(meta: Dict) -> Tuple:
+        return (
+            meta.get("source"),
+            meta.get("owner_department"),
+            meta.get("min_role_level"),
+            meta.get("min_clearance_level"),
+        )
+
+    def _doc_ids(self, chunk_ids: Sequence[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        for start in range(0, len(chunk_ids), _SQL_CHUNK):
+            chunk = list(chunk_ids[start:start + _SQL_CHUNK])
+            placeholders = ",".join("?" * len(chunk))
+            found.update(
+                self._conn.execute(
+                    f"SELECT chunk_id, doc_id FROM chunks WHERE chunk_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            )
+        return found
+
+    def _term_ids(self, terms: Sequence[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        for start in range(0, len(terms), _SQL_CHUNK):
+            chunk = list(terms[start:start + _SQL_CHUNK])
+            placeholders = ",".join("?" * len(chunk))
+            found.update(
+                self._conn.execute(
+                    f"SELECT term, term_id FROM terms WHERE term IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            )
+        return found
+
+    def _delete_doc_ids(self, doc_ids: List[int]):
+        for start in range(0, len(doc_ids), _SQL_CHUNK):
+            chunk = doc_ids[start:start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+
+            rows = self._conn.execute(
+                f"SELECT doc_id, length, term_ids FROM chunks WHERE doc_id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+
+            df_drop: Counter = Counter()
+            keys: List[Tuple[int, int]] = []
+            for doc_id, _, blob in rows:
+                ids = np.frombuffer(blob, dtype=np.int32).tolist() if blob else []
+                df_drop.update(ids)
+                keys.extend((term_id, doc_id) for term_id in ids)
+            keys.sort()
+            removed = len(rows)
+            removed_length = sum(length for _, length, _ in rows)
+
+            self._conn.executemany(
+                "DELETE FROM postings WHERE term_id = ? AND doc_id = ?",
+                keys,
+            )
+            self._conn.execute(f"DELETE FROM chunks WHERE doc_id IN ({placeholders})", chunk)
+            self._conn.executemany(
+                "UPDATE terms SET df = df - ? WHERE term_id = ?",
+                [(count, term_id) for term_id, count in df_drop.items()],
+            )
+            self._conn.executemany(
+                "DELETE FROM terms WHERE term_id = ? AND df <= 0",
+                [(term_id,) for term_id in df_drop],
+            )
+            self._conn.execute(
+                "UPDATE stats SET n_chunks = n_chunks - ?, total_length = total_length - ?",
+                (removed, removed_length),
+            )
+
+
+_index: Optional[LexicalIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_lexical_index() -> LexicalIndex:
+    """
+    Returns the process-wide lexical index.
+    """
+    global _index
+
+    if _index is not None:
+        return _index
+
+    with _index_lock:
+        if _index is None:
+            _index = LexicalIndex()
+
+    return _index
+
+
+def rebuild_from_chroma() -> int:
+    """
+    Indexes every chunk already stored in Chroma (one-off backfill
+    for corpora ingested before the lexical index existed).
+    """
+    from app.config import CHROMA_WRITE_BATCH_SIZE
+    from .partitions import all_collections
+
+    index = get_lexical_index()
+    indexed = 0
+
+    for collection in all_collections():
+        offset = 0
+        while True:
+            results = collection.get(
+                include=["documents", "metadatas"],
+                limit=CHROMA_WRITE_BATCH_SIZE,
+                offset=offset,
+            )
+            ids = results.get("ids") or []
+            if not ids:
+                break
+            index.add(ids, results["documents"], results["metadatas"])
+            indexed += len(ids)
+            offset += len(ids)
+
+    return indexed
+
+
+if __name__ == "__main__":
+    print(f"✅ Indexed {rebuild_from_chroma()} chunks")
+    print("📊", get_lexical_index().stats())
@@ -0,0 +1,187 @@
+import hashlib
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.config import CHROMA_PARTITIONED, CHROMA_WRITE_BATCH_SIZE
+from .chroma_client import COLLECTION_NAME, get_chroma_client, get_chroma_collection
+from .corpus import bump_corpus_version, corpus_version
+
+# (owner_department, min_role_level, min_clearance_level)
+PartitionKey = Tuple[str, int, int]
+
+_partitions: Optional[Dict[PartitionKey, object]] = None
+_partitions_version: Optional[str] = None
+_partitions_lock = threading.Lock()
+
+
+def partition_key(metadata: Dict) -> PartitionKey:
+    return (
+        str(metadata["owner_department"]),
+        int(metadata["min_role_level"]),
+        int(metadata["min_clearance_level"]),
+    )
+
+
+def partition_name(key: PartitionKey) -> str:
+    """
+    Chroma-safe collection name for a partition. The department is
+    slugged, plus a short hash so distinct departments never collide.
+    """
+    department, role_level, clearance_level = key
+    slug = re.sub(r"[^a-z0-9]+", "-", department.lower()).strip("-") or "dept"
+    suffix = hashlib.sha1(department.encode("utf-8")).hexdigest()[:6]
+    return f"{COLLECTION_NAME}__{slug}-{suffix}__r{role_level}c{clearance_level}"
+
+
+def can_read(user: Dict, key: PartitionKey) -> bool:
+    """
+    Same rules as build_rbac_filter, applied to a whole partition.
+    """
+    department, role_level, clearance_level = key
+
+    if user["department"] != "shared" and department not in (user["department"], "shared"):
+        return False
+
+    return role_level <= user["role_level"] and clearance_level <= user["clearance_level"]
+
+
+def _load_partitions() -> Dict[PartitionKey, object]:
+    partitions = {}
+    for collection in get_chroma_client().list_collections():
+        meta = collection.metadata or {}
+        if meta.get("partition_of") != COLLECTION_NAME:
+            continue
+        partitions[partition_key(meta)] = collection
+    return partitions
+
+
+def list_partitions() -> Dict[PartitionKey, object]:
+    """
+    All partition collections by key.
+
+    Cached per process; reloaded when the corpus version changes, so
+    partitions created by another worker's ingest show up here too.
+    """
+    global _partitions, _partitions_version
+
+    version = corpus_version()
+    if _partitions is not None and _partitions_version == version:
+        return _partitions
+
+    with _partitions_lock:
+        if _partitions is None or _partitions_version != version:
+            _partitions = _load_partitions()
+            _partitions_version = version
+
+    return _partitions
+
+
+def get_partition(key: PartitionKey):
+    """
+    Partition collection for `key`, created on first write.
+    """
+    partitions = list_partitions()
+    if key in partitions:
+        return partitions[key]
+
+    department, role_level, clearance_level = key
+    collection = get_chroma_client().get_or_create_collection(
+        name=partition_name(key),
+        metadata={
+            "partition_of": COLLECTION_NAME,
+            "owner_department": department,
+            "min_role_level": role_level,
+            "min_clearance_level": clearance_level,
+        },
+    )
+
+    with _partitions_lock:
+        if _partitions is not None:
+            _partitions[key] = collection
+
+    return collection
+
+
+def readable_collections(user: Dict) -> List:
+    """
+    Collections a query from `user` has to search: only the readable
+    partitions in partitioned mode, else the single collection.
+    """
+    if not CHROMA_PARTITIONED:
+        return [get_chroma_collection()]
+
+    return [
+        collection
+        for key, collection in list_partitions().items()
+        if can_read(user, key)
+    ]
+
+
+def write_collection(metadata: Dict):
+    """
+    Collection that chunks with this RBAC metadata are written to.
+    """
+    if not CHROMA_PARTITIONED:
+        return get_chroma_collection()
+
+    return get_partition(partition_key(metadata))
+
+
+def all_collections() -> List:
+    """
+    Every collection that may hold chunks (admin delete / re-scan).
+    """
+    if not CHROMA_PARTITIONED:
+        return [get_chroma_collection()]
+
+    return list(list_partitions().values())
+
+
+def corpus_count() -> int:
+    return sum(collection.count() for collection in all_collections())
+
+
+def repartition() -> Dict[str, int]:
+    """
+    One-off migration: copies every chunk of the single collection
+    (embeddings included, nothing is re-embedded) into its partition.
+    The single collection is left untouched.
+    """
+    source = get_chroma_collection()
+    copied: Dict[str, int] = {}
+
+    offset = 0
+    while True:
+        results = source.get(
+            include=["documents", "metadatas", "embeddings"],
+            limit=CHROMA_WRITE_BATCH_SIZE,
+            offset=offset,
+        )
+        ids = results.get("ids") or []
+        if not ids:
+            break
+
+        groups: Dict[PartitionKey, List[int]] = {}
+        for i, meta in enumerate(results["metadatas"]):
+            groups.setdefault(partition_key(meta), []).append(i)
+
+        for key, rows in groups.items():
+            get_partition(key).upsert(
+                ids=[ids[i] for i in rows],
+                documents=[results["documents"][i] for i in rows],
+                embeddings=[results["embeddings"][i] for i in rows],
+                metadatas=[results["metadatas"][i] for i in rows],
+            )
+            name = partition_name(key)
+            copied[name] = copied.get(name, 0) + len(rows)
+
+        offset += len(ids)
+
+    bump_corpus_version()
+    return copied
+
+
+if __name__ == "__main__":
+    for name, count in sorted(repartition().items()):
+        print(f"✅ {name}: {count} chunks")
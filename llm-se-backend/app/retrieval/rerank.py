@@ -0,0 +1,193 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import (
+    RERANK_BUDGET_MS,
+    RERANK_MAX_LENGTH,
+    RERANK_ONNX_DIR,
+    RERANK_THREADS,
+)
+from app.llm.invoke import select_documents_for_prompt
+from app.telemetry.tracing import stage
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_TOKENIZER_FILE = "tokenizer.json"
+
+_session = None
+_tokenizer = None
+_executor = None
+_load_lock = threading.Lock()
+
+_counters = {"reranked": 0, "timeouts": 0, "errors": 0}
+_counters_lock = threading.Lock()
+
+
+def _count(outcome: str) -> int:
+    """
+    Increments an outcome counter; returns its previous value.
+    """
+    with _counters_lock:
+        previous = _counters[outcome]
+        _counters[outcome] = previous + 1
+    return previous
+
+
+def _load():
+    """
+    Loads the cross-encoder session, tokenizer and inference pool once.
+
+    RERANK_ONNX_DIR must contain an ONNX export of a cross-encoder
+    (query, passage) → relevance logit model:
+      - model.onnx      (outputs (n, 1) logits, or (n, 2) classes)
+      - tokenizer.json  (HF fast tokenizer)
+    """
+    global _session, _tokenizer, _executor
+
+    if _session is not None:
+        return
+
+    with _load_lock:
+        if _session is not None:
+            return
+
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(RERANK_ONNX_DIR, ONNX_MODEL_FILE)
+        tokenizer_path = os.path.join(RERANK_ONNX_DIR, ONNX_TOKENIZER_FILE)
+
+        if not os.path.exists(model_path) or not os.path.exists(tokenizer_path):
+            raise RuntimeError(
+                f"Rerank model not found in {RERANK_ONNX_DIR} "
+                f"(expected {ONNX_MODEL_FILE} and {ONNX_TOKENIZER_FILE})"
+            )
+
+        tokenizer = Tokenizer.from_file(tokenizer_path)
+        tokenizer.enable_truncation(max_length=RERANK_MAX_LENGTH)
+        tokenizer.enable_padding()
+
+        workers = max(1, RERANK_THREADS)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // workers)
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+
+        _tokenizer = tokenizer
+        _executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="rerank",
+        )
+        _session = session
+
+        print("🧠 ONNX rerank model loaded:", model_path)
+
+
+def score(query: str, passages: List[str]) -> np.ndarray:
+    """
+    Relevance of each passage to `query`: one batched inference
+    call over all (query, passage) pairs. Higher is better.
+    """
+    _load()
+
+    encodings = _tokenizer.encode_batch([(query, passage) for passage in passages])
+
+    input_ids = np.asarray([e.ids for e in encodings], dtype=np.int64)
+    attention_mask = np.asarray([e.attention_mask for e in encodings], dtype=np.int64)
+    token_type_ids = np.asarray([e.type_ids for e in encodings], dtype=np.int64)
+
+    feeds = {}
+    for model_input in _session.get_inputs():
+        if model_input.name == "input_ids":
+            feeds["input_ids"] = input_ids
+        elif model_input.name == "attention_mask":
+            feeds["attention_mask"] = attention_mask
+        elif model_input.name == "token_type_ids":
+            feeds["token_type_ids"] = token_type_ids
+
+    logits = np.asarray(_session.run(None, feeds)[0], dtype=np.float32)
+
+    if logits.ndim == 1:
+        return logits
+    if logits.ndim == 2 and logits.shape[1] == 1:
+        return logits[:, 0]
+    if logits.ndim == 2:
+        # Classifier head: the last class is "relevant".
+        return logits[:, -1] - logits[:, 0]
+
+    raise RuntimeError(f"Invalid rerank output shape: {logits.shape}")
+
+
+def _apply(documents: List[Dict], scores: np.ndarray, top_n: int) -> List[Dict]:
+    order = np.argsort(-scores, kind="stable")[:top_n]
+    return [
+        {**documents[i], "rerank_score": round(float(scores[i]), 4)}
+        for i in order
+    ]
+
+
+async def _ascore(query: str, passages: List[str]) -> np.ndarray:
+    # The first call loads the model in a worker thread (never on the
+    # event loop); a load cut short by the budget carries on there.
+    if _session is None:
+        await asyncio.to_thread(_load)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, score, query, passages)
+
+
+def _fallback(documents: List[Dict], top_n: int) -> List[Dict]:
+    return select_documents_for_prompt(documents, max_docs=top_n)
+
+
+async def arerank(
+    query: str,
+    documents: List[Dict],
+    top_n: int,
+    budget_ms: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Best `top_n` of `documents` by cross-encoder score.
+
+    Model loading (first call) and inference run off the event loop;
+    if they do not finish within `budget_ms` (default
+    RERANK_BUDGET_MS), or fail, the request uses
+    the usual similarity order instead. A late inference finishes in
+    the background and is discarded.
+    """
+    if len(documents) <= 1:
+        return documents[:top_n]
+
+    budget = (RERANK_BUDGET_MS if budget_ms is None else budget_ms) / 1000.0
+
+    try:
+        with stage("query", "rerank", candidates=len(documents)):
+            scores = await asyncio.wait_for(
+                _ascore(query, [doc["content"] for doc in documents]),
+                timeout=budget,
+            )
+    except asyncio.TimeoutError:
+        _count("timeouts")
+        return _fallback(documents, top_n)
+    except Exception as e:
+        if not _count("errors"):
+            print("⚠️ Rerank failed, using similarity order:", e)
+        return _fallback(documents, top_n)
+
+    _count("reranked")
+    return _apply(documents, scores, top_n)
+
+
+def rerank_stats() -> Dict:
+    with _counters_lock:
+        return dict(_counters)
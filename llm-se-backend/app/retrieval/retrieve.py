@@ -1,72 +1,408 @@
+import asyncio
 from typing import Dict, List
-from app.embeddings.hf_client import embed_text
-from .chroma_client import get_chroma_collection
+
+import numpy as np
+
+from app.config import CHROMA_PARTITIONED, LEXICAL_ENABLED, LEXICAL_TOP_K, RRF_K
+from app.embeddings.embedder import aembed_batch, embed_batch
+from app.telemetry.tracing import stage
+from .chroma_client import _get_executor, get_chroma_collection, run_in_chroma_executor
+from .partitions import list_partitions, partition_key, readable_collections
 
 TOP_K = 7
 
 
-def retrieve_authorized_documents(
-    query: str,
-    user: Dict,
-) -> List[Dict]:
+def build_rbac_filter(user: Dict) -> Dict:
     """
-    Retrieve top-K relevant documents with:
-    - Query embeddings
-    - RBAC enforced
-    - Similarity scores returned
+    Chroma where-filter for the documents a user may read.
 
     RBAC rules:
     - shared users → can see ALL documents
     - dept users → can see their dept + shared docs
     """
 
-    collection = get_chroma_collection()
-
     if user["department"] == "shared":
-        where_filter = {
+        return {
             "$and": [
                 {"min_role_level": {"$lte": user["role_level"]}},
                 {"min_clearance_level": {"$lte": user["clearance_level"]}},
             ]
         }
-    else:
-        where_filter = {
-            "$and": [
-                {
-                    "$or": [
-                        {"owner_department": {"$eq": user["department"]}},
-                        {"owner_department": {"$eq": "shared"}},
-                    ]
-                },
-                {"min_role_level": {"$lte": user["role_level"]}},
-                {"min_clearance_level": {"$lte": user["clearance_level"]}},
-            ]
-        }
 
-    query_embedding = embed_text(query)
+    return {
+        "$and": [
+            {
+                "$or": [
+                    {"owner_department": {"$eq": user["department"]}},
+                    {"owner_department": {"$eq": "shared"}},
+                ]
+            },
+            {"min_role_level": {"$lte": user["role_level"]}},
+            {"min_clearance_level": {"$lte": user["clearance_level"]}},
+        ]
+    }
+
 
-    results = collection.query(
-        query_embeddings=[query_embedding],
-        n_results=TOP_K,
-        where=where_filter,
-        include=["documents", "metadatas", "distances"],
-    )
+def _query_collection(collection, query_embedding, where_filter: Dict, top_k: int = TOP_K) -> Dict:
+    with stage("query", "vector_search"):
+        return collection.query(
+            query_embeddings=[query_embedding],
+            n_results=top_k,
+            where=where_filter,
+            include=["documents", "metadatas", "distances", "embeddings"],
+        )
+
+
+def _query_collection_many(collection, query_embeddings: List, where_filter: Dict, top_k: int = TOP_K) -> List[Dict]:
+    """
+    One Chroma query for several embeddings (same filter); returns
+    one single-query result per embedding.
+    """
+    with stage("query", "vector_search", batch=len(query_embeddings)):
+        results = collection.query(
+            query_embeddings=list(query_embeddings),
+            n_results=top_k,
+            where=where_filter,
+            include=["documents", "metadatas", "distances", "embeddings"],
+        )
+    embeddings = results.get("embeddings")
+
+    rows = []
+    for i in range(len(query_embeddings)):
+        rows.append({
+            "ids": [results["ids"][i]],
+            "documents": [results["documents"][i]],
+            "metadatas": [results["metadatas"][i]],
+            "distances": [results["distances"][i]],
+            "embeddings": [embeddings[i]] if embeddings is not None and len(embeddings) else None,
+        })
+    return rows
+
+
+def _merge_results(results_list: List[Dict], top_k: int = TOP_K) -> Dict:
+    """
+    Merges per-partition results into one Chroma-shaped result,
+    keeping the global top-K by distance.
+    """
+    if len(results_list) == 1:
+        return results_list[0]
 
+    rows = []
+    for results in results_list:
+        rows.extend(zip(
+            results.get("ids", [[]])[0],
+            results.get("documents", [[]])[0],
+            results.get("metadatas", [[]])[0],
+            results.get("distances", [[]])[0],
+            _embeddings(results),
+        ))
+
+    rows.sort(key=lambda row: row[3])
+    rows = rows[:top_k]
+
+    return {
+        "ids": [[row[0] for row in rows]],
+        "documents": [[row[1] for row in rows]],
+        "metadatas": [[row[2] for row in rows]],
+        "distances": [[row[3] for row in rows]],
+        "embeddings": [[row[4] for row in rows]],
+    }
+
+
+def _embeddings(results: Dict) -> List:
+    """
+    Per-row embeddings of a query result (None rows if not included).
+    """
+    embeddings = results.get("embeddings")
+    ids = results.get("ids", [[]])[0]
+    if embeddings is None or len(embeddings) == 0:
+        return [None] * len(ids)
+    return list(embeddings[0])
+
+
+def _to_retrieved(results: Dict) -> List[Dict]:
+    ids = results.get("ids", [[]])[0]
     documents = results.get("documents", [[]])[0]
     metadatas = results.get("metadatas", [[]])[0]
     distances = results.get("distances", [[]])[0]
+    embeddings = _embeddings(results)
 
     retrieved: List[Dict] = []
 
-    for doc, meta, dist in zip(documents, metadatas, distances):
+    for chunk_id, doc, meta, dist, embedding in zip(ids, documents, metadatas, distances, embeddings):
         similarity = 1.0 - (float(dist) / 2.0)
 
         retrieved.append(
             {
+                "id": chunk_id,
                 "content": doc,
                 "metadata": meta,
                 "similarity": round(similarity, 4),
+                # internal: used by app.retrieval.diversify, never returned to clients
+                "embedding": embedding,
             }
         )
 
     return retrieved
+
+
+def _lexical_search(query: str, user: Dict) -> List[Dict]:
+    if not LEXICAL_ENABLED:
+        return []
+
+    from .lexical import get_lexical_index
+
+    with stage("query", "lexical_search"):
+        return get_lexical_index().search(query, user, LEXICAL_TOP_K)
+
+
+def _fetch_lexical_only(hits: List[Dict], query_embedding, where_filter: Dict) -> List[Dict]:
+    """
+    Loads chunks found only by BM25 from Chroma (RBAC filter applied
+    again) and gives them the same similarity the vector search would.
+    """
+    groups: Dict[str, List] = {}
+    for hit in hits:
+        # Read path: never create a partition for a (stale) BM25 hit.
+        if CHROMA_PARTITIONED:
+            collection = list_partitions().get(partition_key(hit["metadata"]))
+            if collection is None:
+                continue
+        else:
+            collection = get_chroma_collection()
+        groups.setdefault(collection.name, [collection, []])[1].append(hit["id"])
+
+    query_vector = np.asarray(query_embedding, dtype=np.float32)
+    retrieved: List[Dict] = []
+
+    for collection, ids in groups.values():
+        with stage("query", "lexical_fetch"):
+            results = collection.get(
+                ids=ids,
+                where=where_filter,
+                include=["documents", "metadatas", "embeddings"],
+            )
+        for chunk_id, doc, meta, embedding in zip(
+            results.get("ids", []),
+            results.get("documents", []),
+            results.get("metadatas", []),
+            results.get("embeddings", []),
+        ):
+            embedding = np.asarray(embedding, dtype=np.float32)
+            dist = float(np.sum((query_vector - embedding) ** 2))
+            retrieved.append(
+                {
+                    "id": chunk_id,
+                    "content": doc,
+                    "metadata": meta,
+                    "similarity": round(1.0 - dist / 2.0, 4),
+                    "embedding": embedding,
+                }
+            )
+
+    return retrieved
+
+
+def _fuse(
+    vector_docs: List[Dict],
+    lexical_hits: List[Dict],
+    lexical_only: List[Dict],
+    top_k: int = TOP_K,
+) -> List[Dict]:
+    """
+    Reciprocal rank fusion of the vector and BM25 rankings:
+    score = sum over rankings of 1 / (RRF_K + rank). Top-K by fused
+    score; each chunk keeps its vector similarity and gains
+    lexical_score / exact_match / rrf_score.
+    """
+    docs = {doc["id"]: doc for doc in vector_docs}
+    docs.update({doc["id"]: doc for doc in lexical_only if doc["id"] not in docs})
+
+    scores: Dict[str, float] = {}
+    for rank, doc in enumerate(vector_docs, start=1):
+        scores[doc["id"]] = 1.0 / (RRF_K + rank)
+
+    lexical = {}
+    for rank, hit in enumerate(lexical_hits, start=1):
+        if hit["id"] not in docs:
+            continue  # dropped by the Chroma-side RBAC check
+        lexical[hit["id"]] = hit
+        scores[hit["id"]] = scores.get(hit["id"], 0.0) + 1.0 / (RRF_K + rank)
+
+    fused = []
+    for chunk_id in sorted(scores, key=scores.get, reverse=True)[:top_k]:
+        hit = lexical.get(chunk_id)
+        fused.append(
+            {
+                **docs[chunk_id],
+                "lexical_score": hit["score"] if hit else None,
+                "exact_match": hit["exact_match"] if hit else False,
+                "rrf_score": round(scores[chunk_id], 6),
+            }
+        )
+
+    return fused
+
+
+def retrieve_authorized_documents(
+    query: str,
+    user: Dict,
+    query_embedding=None,
+    top_k: int = TOP_K,
+) -> List[Dict]:
+    """
+    Retrieve top-K relevant documents with:
+    - Query embeddings
+    - RBAC enforced
+    - Similarity scores returned
+
+    With CHROMA_PARTITIONED the search fans out (in parallel) to the
+    partitions the user may read and the top-K are merged; the RBAC
+    filter is still applied inside each partition.
+
+    With LEXICAL_ENABLED a BM25 search (same RBAC predicate) runs
+    alongside and both rankings are fused (see _fuse), so exact part
+    numbers / error codes / acronyms are found even when the
+    embedding misses them.
+
+    Pass `query_embedding` when the caller already embedded the query,
+    and `top_k` to get more candidates (e.g. for reranking).
+    """
+
+    where_filter = build_rbac_filter(user)
+
+    if query_embedding is None:
+        query_embedding = embed_batch([query])[0]
+
+    collections = readable_collections(user)
+    if not collections:
+        return []
+
+    executor = _get_executor()
+    lexical_future = executor.submit(_lexical_search, query, user)
+
+    results_list = list(executor.map(
+        lambda collection: _query_collection(collection, query_embedding, where_filter, top_k),
+        collections,
+    ))
+    vector_docs = _to_retrieved(_merge_results(results_list, top_k))
+
+    lexical_hits = lexical_future.result()
+    if not lexical_hits:
+        return vector_docs
+
+    known = {doc["id"] for doc in vector_docs}
+    lexical_only = _fetch_lexical_only(
+        [hit for hit in lexical_hits if hit["id"] not in known],
+        query_embedding,
+        where_filter,
+    )
+
+    return _fuse(vector_docs, lexical_hits, lexical_only, top_k)
+
+
+async def aretrieve_authorized_documents(
+    query: str,
+    user: Dict,
+    query_embedding=None,
+    top_k: int = TOP_K,
+) -> List[Dict]:
+    """
+    Async variant of retrieve_authorized_documents.
+
+    - Embedding goes through the async embedding client
+    - The Chroma search(es) and the BM25 lookup run concurrently on
+      the bounded Chroma executor
+    """
+
+    where_filter = build_rbac_filter(user)
+
+    if query_embedding is None:
+        query_embedding = (await aembed_batch([query]))[0]
+
+    # Opens the client / lists partitions (or asks the sidecar): blocking.
+    collections = await run_in_chroma_executor(readable_collections, user)
+    if not collections:
+        return []
+
+    lexical_hits, *results_list = await asyncio.gather(
+        run_in_chroma_executor(_lexical_search, query, user),
+        *(
+            run_in_chroma_executor(_query_collection, collection, query_embedding, where_filter, top_k)
+            for collection in collections
+        ),
+    )
+    vector_docs = _to_retrieved(_merge_results(results_list, top_k))
+
+    return await _afuse_lexical(vector_docs, lexical_hits, query_embedding, where_filter, top_k)
+
+
+async def _afuse_lexical(
+    vector_docs: List[Dict],
+    lexical_hits: List[Dict],
+    query_embedding,
+    where_filter: Dict,
+    top_k: int,
+) -> List[Dict]:
+    if not lexical_hits:
+        return vector_docs
+
+    known = {doc["id"] for doc in vector_docs}
+    lexical_only = await run_in_chroma_executor(
+        _fetch_lexical_only,
+        [hit for hit in lexical_hits if hit["id"] not in known],
+        query_embedding,
+        where_filter,
+    )
+
+    return _fuse(vector_docs, lexical_hits, lexical_only, top_k)
+
+
+async def aretrieve_authorized_documents_batch(
+    queries: List[str],
+    user: Dict,
+    query_embeddings=None,
+    top_k: int = TOP_K,
+) -> List[List[Dict]]:
+    """
+    aretrieve_authorized_documents for many queries of one user.
+
+    All queries are embedded in one batched call (unless
+    `query_embeddings` is given) and each readable collection is
+    searched once with every embedding under the shared RBAC filter.
+    BM25 lookups still run per query, concurrently.
+
+    Returns the documents of each query, in input order.
+    """
+    if not queries:
+        return []
+
+    where_filter = build_rbac_filter(user)
+
+    if query_embeddings is None:
+        query_embeddings = await aembed_batch(list(queries))
+
+    collections = await run_in_chroma_executor(readable_collections, user)
+    if not collections:
+        return [[] for _ in queries]
+
+    gathered = await asyncio.gather(
+        *(
+            run_in_chroma_executor(_query_collection_many, collection, query_embeddings, where_filter, top_k)
+            for collection in collections
+        ),
+        *(run_in_chroma_executor(_lexical_search, query, user) for query in queries),
+    )
+    per_collection, lexical_hits = gathered[:len(collections)], gathered[len(collections):]
+
+    vector_docs = [
+        _to_retrieved(_merge_results([rows[i] for rows in per_collection], top_k))
+        for i in range(len(queries))
+    ]
+
+    return list(await asyncio.gather(
+        *(
+            _afuse_lexical(vector_docs[i], lexical_hits[i], query_embeddings[i], where_filter, top_k)
+            for i in range(len(queries))
+        )
+    ))
@@ -0,0 +1,246 @@
+import os
+import signal
+import socket
+import socketserver
+import stat
+import threading
+from typing import Dict, Tuple
+
+from app.config import CHROMA_SIDECAR_SOCKET
+from .chroma_client import open_persistent_client
+from .sidecar_protocol import (
+    OP_ADD,
+    OP_COLLECTION,
+    OP_COUNT,
+    OP_DELETE,
+    OP_GET,
+    OP_LIST,
+    OP_PING,
+    OP_QUERY,
+    OP_UPDATE,
+    OP_UPSERT,
+    STATUS_ERROR,
+    STATUS_OK,
+    ProtocolError,
+    decode_matrix,
+    encode_matrix,
+    recv_frame,
+    send_frame,
+)
+
+_RESULT_FIELDS = ("ids", "documents", "metadatas", "distances", "included")
+
+
+class _Store:
+    """
+    The one PersistentClient of the deployment plus its collections
+    by name (opened once, shared by every connection thread).
+    """
+
+    def __init__(self):
+        self.client = open_persistent_client()
+        self._collections: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name: str):
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.get(name)
+                if collection is None:
+                    collection = self.client.get_collection(name=name)
+                    self._collections[name] = collection
+        return collection
+
+    def get_or_create(self, name: str, metadata):
+        with self._lock:
+            collection = self.client.get_or_create_collection(name=name, metadata=metadata)
+            self._collections[name] = collection
+        return collection
+
+
+def _pack_result(results: Dict) -> Tuple[Dict, bytes]:
+    """
+    Chroma query / get result → (JSON meta, embeddings blob). Query
+    embeddings (one block per query embedding) are flattened; the
+    client splits them again by the number of ids per query.
+    """
+    meta = {field: results[field] for field in _RESULT_FIELDS if results.get(field) is not None}
+
+    embeddings = results.get("embeddings")
+    if embeddings is None:
+        return meta, b""
+
+    if meta.get("ids") and isinstance(meta["ids"][0], list):
+        rows = [row for block in embeddings for row in block]
+    else:
+        rows = list(embeddings)
+
+    blob, dim = encode_matrix(rows) if rows else (b"", 0)
+    meta["embeddings"] = True
+    meta["dim"] = dim
+    return meta, blob
+
+
+def _embeddings(meta: Dict, blob: bytes):
+    if "dim" not in meta:
+        return None
+    return decode_matrix(blob, meta["dim"])
+
+
+def _dispatch(store: _Store, op: int, meta: Dict, blob: bytes) -> Tuple[Dict, bytes]:
+    if op == OP_PING:
+        return {"pid": os.getpid()}, b""
+
+    if op == OP_LIST:
+        return {
+            "collections": [
+                {"name": collection.name, "metadata": collection.metadata}
+                for collection in store.client.list_collections()
+            ]
+        }, b""
+
+    if op == OP_COLLECTION:
+        collection = store.get_or_create(meta["name"], meta.get("metadata"))
+        return {"name": collection.name, "metadata": collection.metadata}, b""
+
+    collection = store.collection(meta["collection"])
+
+    if op == OP_COUNT:
+        return {"count": collection.count()}, b""
+
+    if op == OP_QUERY:
+        return _pack_result(collection.query(
+            query_embeddings=_embeddings(meta, blob),
+            n_results=meta["n_results"],
+            where=meta.get("where"),
+            include=meta["include"],
+        ))
+
+    if op == OP_GET:
+        return _pack_result(collection.get(
+            ids=meta.get("ids"),
+            where=meta.get("where"),
+            limit=meta.get("limit"),
+            offset=meta.get("offset"),
+            include=meta["include"],
+        ))
+
+    if op in (OP_ADD, OP_UPSERT, OP_UPDATE):
+        write = {
+            OP_ADD: collection.add,
+            OP_UPSERT: collection.upsert,
+            OP_UPDATE: collection.update,
+        }[op]
+        write(
+            ids=meta["ids"],
+            embeddings=_embeddings(meta, blob),
+            documents=meta.get("documents"),
+            metadatas=meta.get("metadatas"),
+        )
+        return {}, b""
+
+    if op == OP_DELETE:
+        collection.delete(ids=meta.get("ids"), where=meta.get("where"))
+        return {}, b""
+
+    raise ProtocolError(f"unknown sidecar operation {op}")
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """
+    One worker connection: requests are answered in order until the
+    worker closes it.
+    """
+
+    def handle(self):
+        while True:
+            try:
+                op, meta, blob = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            except ProtocolError as e:
+                send_frame(self.request, STATUS_ERROR, {"error": str(e)})
+                return
+
+            try:
+                result, result_blob = _dispatch(self.server.store, op, meta, blob)
+            except Exception as e:
+                send_frame(self.request, STATUS_ERROR, {"error": f"{type(e).__name__}: {e}"})
+                continue
+
+            send_frame(self.request, STATUS_OK, result, result_blob)
+
+
+class SidecarServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, store: _Store):
+        self.store = store
+        _claim_socket_path(path)
+
+        # Owner-only socket: RBAC filters are applied by the workers, so
+        # nobody else on the host may talk to the collection directly.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+
+
+def _claim_socket_path(path: str):
+    """
+    Removes a socket file left behind by a crashed sidecar; refuses to
+    start when another sidecar is still listening on it.
+    """
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return
+
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        raise RuntimeError(f"{path} exists and is not a socket")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"A retrieval sidecar is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(path: str = CHROMA_SIDECAR_SOCKET):
+    """
+    Opens the Chroma directory and serves it on the Unix socket `path`
+    until SIGINT / SIGTERM.
+    """
+    if not path:
+        raise RuntimeError("CHROMA_SIDECAR_SOCKET not set")
+
+    store = _Store()
+    for collection in store.client.list_collections():
+        print(f"🔍 {collection.name}: {store.collection(collection.name).count()} chunks")
+
+    server = SidecarServer(path, store)
+    signal.signal(signal.SIGTERM, _stop)
+
+    print("🔌 Retrieval sidecar listening on", path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        print("🔌 Retrieval sidecar stopped")
+
+
+if __name__ == "__main__":
+    serve()
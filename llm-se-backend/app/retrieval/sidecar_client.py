@@ -0,0 +1,256 @@
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import CHROMA_SIDECAR_POOL_SIZE, CHROMA_SIDECAR_TIMEOUT_SECONDS
+from .sidecar_protocol import (
+    OP_ADD,
+    OP_COLLECTION,
+    OP_COUNT,
+    OP_DELETE,
+    OP_GET,
+    OP_LIST,
+    OP_PING,
+    OP_QUERY,
+    OP_UPDATE,
+    OP_UPSERT,
+    STATUS_OK,
+    ProtocolError,
+    decode_matrix,
+    encode_matrix,
+    recv_frame,
+    send_frame,
+)
+
+# Safe to resend on a fresh connection when a pooled one turns out to
+# be dead (sidecar restarted); add is not (duplicate ids fail).
+_IDEMPOTENT = {OP_PING, OP_COLLECTION, OP_LIST, OP_COUNT, OP_QUERY, OP_GET, OP_UPSERT, OP_UPDATE, OP_DELETE}
+
+
+class SidecarError(RuntimeError):
+    pass
+
+
+class SidecarClient:
+    """
+    Stand-in for chromadb's PersistentClient in a worker when
+    CHROMA_SIDECAR_SOCKET is set: same calls, served by the retrieval
+    sidecar (app.retrieval.sidecar) over its Unix socket.
+
+    Connections are pooled; each call holds one connection for a
+    single request / response, so the Chroma executor threads run
+    their calls concurrently on separate connections.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        timeout: float = CHROMA_SIDECAR_TIMEOUT_SECONDS,
+        pool_size: int = CHROMA_SIDECAR_POOL_SIZE,
+    ):
+        self.path = path
+        self.timeout = timeout
+        self.pool_size = max(1, pool_size)
+        self._idle: List[socket.socket] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        """
+        New connection; waits up to `timeout` for the sidecar to come
+        up (workers may start before it).
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+                return sock
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                sock.close()
+                if time.monotonic() >= deadline:
+                    raise SidecarError(f"Retrieval sidecar not reachable at {self.path}: {e}") from e
+                time.sleep(0.1)
+
+    def _acquire(self) -> Tuple[socket.socket, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _release(self, sock: socket.socket):
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(sock)
+                return
+        sock.close()
+
+    def call(self, op: int, meta: Optional[Dict] = None, blob: bytes = b"") -> Tuple[Dict, bytes]:
+        """
+        One request / response. Sidecar-side errors raise SidecarError
+        (the connection stays usable); broken connections are dropped.
+        """
+        while True:
+            sock, pooled = self._acquire()
+            try:
+                send_frame(sock, op, meta, blob)
+                status, result, result_blob = recv_frame(sock)
+            except socket.timeout:
+                sock.close()
+                raise
+            except (OSError, ConnectionError, ProtocolError):
+                sock.close()
+                if pooled and op in _IDEMPOTENT:
+                    continue
+                raise
+
+            self._release(sock)
+            if status != STATUS_OK:
+                raise SidecarError(f"Retrieval sidecar: {result.get('error')}")
+            return result, result_blob
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
+
+    # chromadb.ClientAPI subset used by app.retrieval / app.admin
+
+    def heartbeat(self) -> int:
+        return self.call(OP_PING)[0]["pid"]
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None) -> "RemoteCollection":
+        result, _ = self.call(OP_COLLECTION, {"name": name, "metadata": metadata})
+        return RemoteCollection(self, result["name"], result.get("metadata"))
+
+    def list_collections(self) -> List["RemoteCollection"]:
+        result, _ = self.call(OP_LIST)
+        return [
+            RemoteCollection(self, item["name"], item.get("metadata"))
+            for item in result["collections"]
+        ]
+
+
+def _unpack_embeddings(meta: Dict, blob: bytes, nested: bool):
+    if not meta.pop("embeddings", False):
+        return None
+
+    matrix = decode_matrix(blob, meta.pop("dim", 0))
+    if not nested:
+        return matrix
+
+    # One block per query embedding, sized by its number of hits.
+    blocks = []
+    start = 0
+    for ids in meta["ids"]:
+        blocks.append(matrix[start:start + len(ids)])
+        start += len(ids)
+    return blocks
+
+
+def _result(meta: Dict, blob: bytes, nested: bool) -> Dict:
+    embeddings = _unpack_embeddings(meta, blob, nested)
+    return {
+        "ids": meta.get("ids", []),
+        "embeddings": embeddings,
+        "documents": meta.get("documents"),
+        "uris": None,
+        "data": None,
+        "metadatas": meta.get("metadatas"),
+        "distances": meta.get("distances"),
+        "included": meta.get("included", []),
+    }
+
+
+class RemoteCollection:
+    """
+    A Chroma collection living in the retrieval sidecar; mirrors the
+    chromadb Collection methods the app calls. Embeddings come back
+    as float32 arrays.
+    """
+
+    def __init__(self, client: SidecarClient, name: str, metadata: Optional[Dict]):
+        self._client = client
+        self.name = name
+        self.metadata = metadata
+
+    def _write(self, op: int, ids, embeddings=None, documents=None, metadatas=None):
+        meta = {"collection": self.name, "ids": list(ids)}
+        if documents is not None:
+            meta["documents"] = list(documents)
+        if metadatas is not None:
+            meta["metadatas"] = list(metadatas)
+
+        blob = b""
+        if embeddings is not None:
+            blob, meta["dim"] = encode_matrix(embeddings)
+
+        self._client.call(op, meta, blob)
+
+    def count(self) -> int:
+        return self._client.call(OP_COUNT, {"collection": self.name})[0]["count"]
+
+    def query(
+        self,
+        query_embeddings,
+        n_results: int = 10,
+        where: Optional[Dict] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict:
+        blob, dim = encode_matrix(np.asarray(query_embeddings, dtype=np.float32))
+        meta, result_blob = self._client.call(
+            OP_QUERY,
+            {
+                "collection": self.name,
+                "dim": dim,
+                "n_results": n_results,
+                "where": where,
+                "include": list(["metadatas", "documents", "distances"] if include is None else include),
+            },
+            blob,
+        )
+        return _result(meta, result_blob, nested=True)
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict:
+        meta, result_blob = self._client.call(
+            OP_GET,
+            {
+                "collection": self.name,
+                "ids": list(ids) if ids is not None else None,
+                "where": where,
+                "limit": limit,
+                "offset": offset,
+                "include": list(["metadatas", "documents"] if include is None else include),
+            },
+        )
+        return _result(meta, result_blob, nested=False)
+
+    def add(self, ids, embeddings=None, documents=None, metadatas=None):
+        self._write(OP_ADD, ids, embeddings, documents, metadatas)
+
+    def upsert(self, ids, embeddings=None, documents=None, metadatas=None):
+        self._write(OP_UPSERT, ids, embeddings, documents, metadatas)
+
+    def update(self, ids, embeddings=None, documents=None, metadatas=None):
+        self._write(OP_UPDATE, ids, embeddings, documents, metadatas)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None):
+        self._client.call(
+            OP_DELETE,
+            {
+                "collection": self.name,
+                "ids": list(ids) if ids is not None else None,
+                "where": where,
+            },
+        )
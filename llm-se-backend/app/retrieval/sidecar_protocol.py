@@ -0,0 +1,110 @@
+import json
+import socket
+import struct
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Wire format between workers and the retrieval sidecar.
+#
+# Every request and response is one frame:
+#
+#     header   >BBII  version, code, meta length, blob length
+#     meta     UTF-8 JSON (ids, documents, metadatas, where, ...)
+#     blob     float32 matrix, row-major, little-endian (embeddings)
+#
+# Embeddings are the bulk of the traffic, so they travel as raw float32
+# (3 KB per 768-dim vector instead of ~15 KB of JSON); the JSON part
+# carries `dim` and the rows are matched to the ids on the other side.
+#
+# For requests `code` is the operation (OP_*), for responses a status
+# (STATUS_OK / STATUS_ERROR, meta {"error": ...}).
+PROTOCOL_VERSION = 1
+
+OP_PING = 0
+OP_COLLECTION = 1  # get_or_create_collection
+OP_LIST = 2
+OP_COUNT = 3
+OP_QUERY = 4
+OP_GET = 5
+OP_ADD = 6
+OP_UPSERT = 7
+OP_UPDATE = 8
+OP_DELETE = 9
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+_HEADER = struct.Struct(">BBII")
+
+# Refuse frames larger than this (corrupt stream or foreign client).
+MAX_FRAME_BYTES = 512 * 1024 * 1024
+
+_FLOAT32 = np.dtype("<f4")
+
+
+class ProtocolError(RuntimeError):
+    pass
+
+
+def encode_matrix(rows) -> Tuple[bytes, int]:
+    """
+    (blob, dim) for a list / array of equal-length vectors.
+    """
+    if rows is None:
+        return b"", 0
+    matrix = np.asarray(rows, dtype=_FLOAT32)
+    if matrix.size == 0:
+        return b"", 0
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    return np.ascontiguousarray(matrix).tobytes(), int(matrix.shape[1])
+
+
+def decode_matrix(blob: bytes, dim: int) -> np.ndarray:
+    if not blob or not dim:
+        return np.empty((0, dim or 0), dtype=np.float32)
+    return np.frombuffer(blob, dtype=_FLOAT32).reshape(-1, dim)
+
+
+def _json_default(value):
+    # numpy scalars in metadatas / distances
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def send_frame(sock: socket.socket, code: int, meta: Optional[Dict] = None, blob: bytes = b""):
+    payload = json.dumps(meta or {}, separators=(",", ":"), default=_json_default).encode("utf-8")
+    sock.sendall(_HEADER.pack(PROTOCOL_VERSION, code, len(payload), len(blob)) + payload)
+    if blob:
+        sock.sendall(blob)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:], size - received)
+        if n == 0:
+            raise ConnectionError("retrieval sidecar connection closed")
+        received += n
+    return bytes(buffer)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[int, Dict, bytes]:
+    """
+    Reads one frame; raises ConnectionError when the peer has closed
+    the connection.
+    """
+    version, code, meta_length, blob_length = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"unsupported sidecar protocol version {version}")
+    if meta_length + blob_length > MAX_FRAME_BYTES:
+        raise ProtocolError(f"sidecar frame too large ({meta_length + blob_length} bytes)")
+
+    meta = json.loads(_recv_exact(sock, meta_length)) if meta_length else {}
+    blob = _recv_exact(sock, blob_length) if blob_length else b""
+    return code, meta, blob
@@ -0,0 +1,211 @@
+import math
+from typing import Dict, Iterable, List
+
+from opentelemetry.metrics import CallbackOptions, NoOpMeterProvider, Observation
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import Gauge, Histogram, InMemoryMetricReader, Sum
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+
+from app.config import (
+    ANSWER_CACHE_ENABLED,
+    EMBED_CACHE_ENABLED,
+    METRICS_ENABLED,
+    RERANK_ENABLED,
+    USER_CACHE_ENABLED,
+)
+
+PREFIX = "sentinel"
+
+# Seconds; covers a 1 ms cache hit up to a slow LLM answer / ingest batch.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+STAGE_SECONDS = f"{PREFIX}_stage_duration_seconds"
+HTTP_SECONDS = f"{PREFIX}_http_request_duration_seconds"
+
+
+def _cache_stats() -> Dict[str, Dict]:
+    stats = {}
+    if EMBED_CACHE_ENABLED:
+        from app.embeddings.cache import get_embedding_cache
+
+        s = get_embedding_cache().stats()
+        stats["embeddings"] = {"hits": s["memory_hits"] + s["disk_hits"], "misses": s["misses"]}
+    if ANSWER_CACHE_ENABLED:
+        from app.llm.answer_cache import get_answer_cache
+
+        stats["answers"] = get_answer_cache().stats()
+    if USER_CACHE_ENABLED:
+        from app.auth.user_cache import get_user_cache
+
+        stats["users"] = get_user_cache().stats()
+    return stats
+
+
+def _observe_cache_lookups(options: CallbackOptions) -> Iterable[Observation]:
+    for cache, s in _cache_stats().items():
+        yield Observation(s["hits"], {"cache": cache, "result": "hit"})
+        yield Observation(s["misses"], {"cache": cache, "result": "miss"})
+
+
+def _observe_cache_hit_ratio(options: CallbackOptions) -> Iterable[Observation]:
+    for cache, s in _cache_stats().items():
+        lookups = s["hits"] + s["misses"]
+        if lookups:
+            yield Observation(s["hits"] / lookups, {"cache": cache})
+
+
+def _audit_stats() -> Dict:
+    from app.audit.logger import audit_writer_stats
+
+    return audit_writer_stats()
+
+
+def _observe_audit_queue(options: CallbackOptions) -> Iterable[Observation]:
+    yield Observation(_audit_stats()["queue_depth"])
+
+
+def _observe_audit_events(options: CallbackOptions) -> Iterable[Observation]:
+    stats = _audit_stats()
+    for outcome in ("written", "dropped"):
+        yield Observation(stats[outcome], {"outcome": outcome})
+
+
+def _observe_rerank(options: CallbackOptions) -> Iterable[Observation]:
+    from app.retrieval.rerank import rerank_stats
+
+    for outcome, count in rerank_stats().items():
+        yield Observation(count, {"outcome": outcome})
+
+
+if METRICS_ENABLED:
+    _reader = InMemoryMetricReader()
+    _provider = MeterProvider(
+        metric_readers=[_reader],
+        views=[
+            View(instrument_name="*_seconds", aggregation=ExplicitBucketHistogramAggregation(LATENCY_BUCKETS)),
+        ],
+    )
+else:
+    _reader = None
+    _provider = NoOpMeterProvider()
+
+_meter = _provider.get_meter("app")
+
+stage_seconds = _meter.create_histogram(
+    STAGE_SECONDS,
+    unit="s",
+    description="Time spent in one stage of the query / ingest / audit pipelines.",
+)
+http_seconds = _meter.create_histogram(
+    HTTP_SECONDS,
+    unit="s",
+    description="HTTP request duration until the last response byte.",
+)
+decisions = _meter.create_counter(
+    f"{PREFIX}_query_decisions_total",
+    description="decision_mode outcome per query.",
+)
+llm_in_flight = _meter.create_up_down_counter(
+    f"{PREFIX}_llm_calls_in_flight",
+    description="LLM completions currently running.",
+)
+llm_calls = _meter.create_counter(
+    f"{PREFIX}_llm_calls_total",
+    description="Finished LLM completions by outcome.",
+)
+_meter.create_observable_counter(
+    f"{PREFIX}_cache_lookups_total",
+    callbacks=[_observe_cache_lookups],
+    description="Cache lookups by cache and result (hit / miss).",
+)
+_meter.create_observable_gauge(
+    f"{PREFIX}_cache_hit_ratio",
+    callbacks=[_observe_cache_hit_ratio],
+    description="Hit ratio of each cache since process start.",
+)
+_meter.create_observable_gauge(
+    f"{PREFIX}_audit_queue_depth",
+    callbacks=[_observe_audit_queue],
+    description="Audit events waiting for the background writer.",
+)
+_meter.create_observable_counter(
+    f"{PREFIX}_audit_events_total",
+    callbacks=[_observe_audit_events],
+    description="Audit events written or dropped (queue full).",
+)
+if RERANK_ENABLED:
+    _meter.create_observable_counter(
+        f"{PREFIX}_rerank_total",
+        callbacks=[_observe_rerank],
+        description="Rerank requests by outcome (reranked / timeouts / errors).",
+    )
+
+
+def _labels(attributes) -> str:
+    if not attributes:
+        return ""
+    pairs = []
+    for key, value in sorted(attributes.items()):
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+def render_prometheus() -> str:
+    """
+    Collects every instrument (running the observable callbacks) and
+    renders it in the Prometheus text exposition format.
+    """
+    if _reader is None:
+        return ""
+
+    lines: List[str] = []
+    data = _reader.get_metrics_data()
+
+    for resource_metrics in data.resource_metrics if data else []:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                name = metric.name
+                points = metric.data.data_points
+
+                if isinstance(metric.data, Histogram):
+                    lines.append(f"# HELP {name} {metric.description}")
+                    lines.append(f"# TYPE {name} histogram")
+                    for point in points:
+                        attributes = dict(point.attributes or {})
+                        cumulative = 0
+                        for bound, count in zip(point.explicit_bounds, point.bucket_counts):
+                            cumulative += count
+                            labels = _labels({**attributes, "le": _number(float(bound))})
+                            lines.append(f"{name}_bucket{labels} {cumulative}")
+                        labels = _labels({**attributes, "le": "+Inf"})
+                        lines.append(f"{name}_bucket{labels} {point.count}")
+                        lines.append(f"{name}_sum{_labels(attributes)} {_number(point.sum)}")
+                        lines.append(f"{name}_count{_labels(attributes)} {point.count}")
+
+                elif isinstance(metric.data, Sum) and metric.data.is_monotonic:
+                    lines.append(f"# HELP {name} {metric.description}")
+                    lines.append(f"# TYPE {name} counter")
+                    for point in points:
+                        lines.append(f"{name}{_labels(point.attributes)} {_number(point.value)}")
+
+                elif isinstance(metric.data, (Sum, Gauge)):
+                    lines.append(f"# HELP {name} {metric.description}")
+                    lines.append(f"# TYPE {name} gauge")
+                    for point in points:
+                        lines.append(f"{name}{_labels(point.attributes)} {_number(point.value)}")
+
+    return "\n".join(lines) + "\n"
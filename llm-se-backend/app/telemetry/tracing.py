@@ -0,0 +1,161 @@
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TypeVar
+
+from opentelemetry import context, trace
+
+from app.config import OTEL_SERVICE_NAME, TRACING_ENABLED
+from .metrics import http_seconds, llm_calls, llm_in_flight, stage_seconds
+
+T = TypeVar("T")
+
+_tracer = trace.get_tracer("app")
+_tracing_configured = False
+
+
+def setup_tracing():
+    """
+    Installs the SDK tracer provider with a batching OTLP exporter
+    (TRACING_ENABLED). Without it spans are no-ops and only the stage
+    histograms are recorded.
+    """
+    global _tracing_configured
+
+    if not TRACING_ENABLED or _tracing_configured:
+        return
+
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _tracing_configured = True
+
+    print("📡 Tracing enabled (OTLP), service:", OTEL_SERVICE_NAME)
+
+
+def record_stage(pipeline: str, name: str, seconds: float):
+    stage_seconds.record(seconds, {"pipeline": pipeline, "stage": name})
+
+
+@contextmanager
+def stage(pipeline: str, name: str, attach: bool = True, **attributes):
+    """
+    Times one pipeline stage into the stage histogram and, when
+    tracing is on, wraps it in a span "<pipeline>.<name>" (nested
+    under the current span).
+
+        with stage("query", "retrieve"):
+            ...
+
+    attach=False keeps the span out of the current context; needed
+    when the block spans the yields of an async generator.
+    """
+    start = time.perf_counter()
+    try:
+        if TRACING_ENABLED and attach:
+            with _tracer.start_as_current_span(f"{pipeline}.{name}", attributes=attributes or None) as span:
+                yield span
+        elif TRACING_ENABLED:
+            span = _tracer.start_span(f"{pipeline}.{name}", attributes=attributes or None)
+            try:
+                yield span
+            finally:
+                span.end()
+        else:
+            yield trace.INVALID_SPAN
+    finally:
+        record_stage(pipeline, name, time.perf_counter() - start)
+
+
+def timed_iter(pipeline: str, name: str, iterable: Iterable[T]) -> Iterator[T]:
+    """
+    Yields from `iterable` and records the time spent producing items
+    (not the caller's time between them) as one stage, once exhausted.
+    """
+    iterator = iter(iterable)
+    elapsed = 0.0
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            elapsed += time.perf_counter() - start
+            break
+        elapsed += time.perf_counter() - start
+        yield item
+    record_stage(pipeline, name, elapsed)
+
+
+def annotate(**attributes):
+    """
+    Adds attributes to the current span (no-op when not traced).
+    """
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attributes(attributes)
+
+
+@contextmanager
+def llm_call(stream: bool = False):
+    """
+    Tracks one LLM completion: in-flight gauge, outcome counter and
+    the query.llm stage.
+    """
+    mode = {"stream": stream}
+    llm_in_flight.add(1, mode)
+    outcome = "error"
+    try:
+        with stage("query", "llm", attach=not stream, stream=stream):
+            yield
+        outcome = "ok"
+    finally:
+        llm_in_flight.add(-1, mode)
+        llm_calls.add(1, {**mode, "outcome": outcome})
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording HTTP request duration (until the last
+    body chunk, so streamed answers count in full) by endpoint,
+    method and status code. With tracing on it also opens the server
+    span every stage span of the request nests under.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        method = scope.get("method", "")
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        span = None
+        if TRACING_ENABLED:
+            span = _tracer.start_span(f"{method} {scope.get('path', '')}", kind=trace.SpanKind.SERVER)
+            token = context.attach(trace.set_span_in_context(span))
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            http_seconds.record(
+                time.perf_counter() - start,
+                {"endpoint": endpoint, "method": method, "status": status["code"]},
+            )
+            if span is not None:
+                span.set_attribute("http.response.status_code", status["code"])
+                span.set_attribute("http.route.endpoint", endpoint)
+                span.end()
+                context.detach(token)
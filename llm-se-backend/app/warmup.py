@@ -0,0 +1,143 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+from app.config import (
+    RERANK_ENABLED,
+    WARMUP_BLOCKING,
+    WARMUP_ENABLED,
+    WARMUP_QUERY,
+    WARMUP_STEPS,
+)
+from app.telemetry.tracing import stage
+
+# Reads every partition, like a shared admin; results are discarded.
+WARMUP_USER = {
+    "username": "warmup",
+    "department": "shared",
+    "role_level": 3,
+    "clearance_level": 3,
+}
+
+# "starting" → "warming" → "ready" → "stopping"
+_state: Dict = {"status": "starting", "steps": {}, "seconds": None}
+_task: Optional[asyncio.Task] = None
+
+
+async def _chroma():
+    from app.retrieval.chroma_client import run_in_chroma_executor
+    from app.retrieval.partitions import corpus_count
+
+    count = await run_in_chroma_executor(corpus_count)
+    print("🔍 Corpus chunks (warm-up):", count)
+
+
+async def _step(name: str, fn):
+    start = time.perf_counter()
+    try:
+        with stage("startup", name):
+            result = await fn()
+        _state["steps"][name] = {"seconds": round(time.perf_counter() - start, 3)}
+        return result
+    except Exception as e:
+        _state["steps"][name] = {"seconds": round(time.perf_counter() - start, 3), "error": str(e)}
+        print(f"⚠️ Warm-up step {name} failed:", e)
+        return None
+
+
+async def warm_up():
+    """
+    Runs the enabled WARMUP_STEPS in order:
+
+    - chroma:    open the PersistentClient / partitions and count chunks
+    - embedding: embed WARMUP_QUERY through the backend (bypasses the cache)
+    - search:    one authorized retrieval (loads the HNSW index, BM25)
+    - tokenizer: load the prompt tokenizer
+    - rerank:    load the cross-encoder (RERANK_ENABLED only)
+    - llm:       import and create the Groq client
+
+    A failed step is reported by /ready but does not hold readiness
+    back: that component is then initialized by the first request,
+    as without warm-up.
+    """
+    _state["status"] = "warming"
+    start = time.perf_counter()
+    vector = None
+
+    if "chroma" in WARMUP_STEPS:
+        await _step("chroma", _chroma)
+
+    if "embedding" in WARMUP_STEPS:
+        from app.embeddings.embedder import aprime_backend
+
+        vector = await _step("embedding", lambda: aprime_backend(WARMUP_QUERY))
+
+    if "search" in WARMUP_STEPS:
+        from app.retrieval.retrieve import aretrieve_authorized_documents
+
+        await _step("search", lambda: aretrieve_authorized_documents(
+            WARMUP_QUERY, WARMUP_USER, query_embedding=vector,
+        ))
+
+    if "tokenizer" in WARMUP_STEPS:
+        from app.llm.context import count_tokens
+
+        await _step("tokenizer", lambda: asyncio.to_thread(count_tokens, WARMUP_QUERY))
+
+    if "rerank" in WARMUP_STEPS and RERANK_ENABLED:
+        from app.retrieval.rerank import score
+
+        await _step("rerank", lambda: asyncio.to_thread(score, WARMUP_QUERY, [WARMUP_QUERY]))
+
+    if "llm" in WARMUP_STEPS:
+        from app.llm.invoke import get_async_groq_client
+
+        async def _llm():
+            get_async_groq_client()
+
+        await _step("llm", _llm)
+
+    _state["seconds"] = round(time.perf_counter() - start, 3)
+    _state["status"] = "ready"
+
+    print(f"🔥 Warm-up done in {_state['seconds']}s")
+
+
+async def start_warmup():
+    """
+    Startup hook: runs the warm-up in the background (or inline with
+    WARMUP_BLOCKING). Without WARMUP_ENABLED the app is ready at once.
+    """
+    global _task
+
+    if not WARMUP_ENABLED:
+        _state["status"] = "ready"
+        return
+
+    if WARMUP_BLOCKING:
+        await warm_up()
+        return
+
+    _task = asyncio.get_running_loop().create_task(warm_up())
+
+
+def stop_warmup():
+    """
+    Shutdown hook: /ready turns 503 so the load balancer drains this
+    worker, and an unfinished warm-up is cancelled.
+    """
+    _state["status"] = "stopping"
+
+    if _task is not None and not _task.done():
+        _task.cancel()
+
+
+def readiness() -> Dict:
+    return {
+        "ready": _state["status"] == "ready",
+        "status": _state["status"],
+        "warmup": {
+            "seconds": _state["seconds"],
+            "steps": dict(_state["steps"]),
+        },
+    }
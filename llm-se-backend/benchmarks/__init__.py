@@ -0,0 +1,12 @@
+"""
+Offline benchmarks: no Hugging Face or Groq calls.
+
+Embeddings come from a deterministic hashing fake, completions from a
+local OpenAI-compatible fake server, both with configurable latency.
+All app state lives in a scratch directory (DATA_DIR / SAMPLES_DIR).
+
+Run from llm-se-backend/:
+    python -m benchmarks                       # all scenarios
+    python -m benchmarks --quick --scenarios retrieval,query
+    python -m benchmarks compare results/a.json results/b.json
+"""
@@ -0,0 +1,10 @@
+import sys
+
+if len(sys.argv) > 1 and sys.argv[1] == "compare":
+    from .compare import main
+
+    main(sys.argv[2:])
+else:
+    from .run import main
+
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, Tuple
+
+
+def metrics(node, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """
+    Flattens the comparable numbers of a result file: latencies
+    (*_ms, lower is better) and rates (*_per_s, higher is better).
+    Retrieval sizes are keyed by their corpus size.
+    """
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from metrics(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(node, list):
+        for i, value in enumerate(node):
+            label = value.get("corpus_chunks", i) if isinstance(value, dict) else i
+            yield from metrics(value, f"{prefix}[{label}]")
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        if prefix.endswith("_ms") or prefix.endswith("_per_s"):
+            yield prefix, float(node)
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float):
+    """
+    Returns (rows, regressions); a regression is a metric that got
+    worse by more than `threshold` (fraction).
+    """
+    base = dict(metrics(baseline["scenarios"]))
+    new = dict(metrics(candidate["scenarios"]))
+
+    rows, regressions = [], []
+    for name in sorted(base.keys() & new.keys()):
+        before, after = base[name], new[name]
+        change = (after - before) / before if before else 0.0
+        worse = change > threshold if name.endswith("_ms") else change < -threshold
+        rows.append((name, before, after, change, worse))
+        if worse:
+            regressions.append(name)
+
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks compare",
+        description="Compare two benchmark result files.",
+    )
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change counted as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    rows, regressions = compare(baseline, candidate, args.threshold)
+
+    print(f"{baseline.get('commit', '')[:12]} → {candidate.get('commit', '')[:12]}")
+    for name, before, after, change, worse in rows:
+        marker = "❌" if worse else "  "
+        print(f"{marker} {name:<45} {before:>12.3f} {after:>12.3f} {change:>+8.1%}")
+
+    if regressions:
+        print(f"⚠️ {len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
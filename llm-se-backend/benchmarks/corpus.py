@@ -0,0 +1,235 @@
+import os
+import random
+import textwrap
+import zlib
+from typing import Dict, Iterator, List, Tuple
+
+# Share of documents per owning department (roughly a mid-size company).
+DEPARTMENTS: List[Tuple[str, float]] = [
+    ("Engineering", 0.25),
+    ("AI", 0.15),
+    ("Finance", 0.15),
+    ("HR", 0.12),
+    ("Legal", 0.08),
+    ("Sales", 0.10),
+    ("shared", 0.15),
+]
+
+# Most documents are open to everyone in the department, few are restricted.
+ROLE_LEVELS: List[Tuple[int, float]] = [(1, 0.60), (2, 0.30), (3, 0.10)]
+CLEARANCE_LEVELS: List[Tuple[int, float]] = [(1, 0.55), (2, 0.30), (3, 0.15)]
+
+COMMON_WORDS = (
+    "the system process policy team review report update request access "
+    "service customer quarter annual release version document section "
+    "procedure approval owner schedule budget risk requirement support "
+    "incident change deadline summary overview guideline standard"
+).split()
+
+TOPIC_WORDS: Dict[str, List[str]] = {
+    "Engineering": (
+        "deployment pipeline latency throughput cluster kubernetes database "
+        "replication failover rollback firmware sensor calibration tolerance "
+        "assembly torque bearing schematic voltage controller"
+    ).split(),
+    "AI": (
+        "model training inference embedding transformer attention dataset "
+        "evaluation benchmark gradient checkpoint tokenizer prompt retrieval "
+        "fine-tuning accuracy precision recall drift"
+    ).split(),
+    "Finance": (
+        "invoice ledger revenue expense forecast audit reconciliation accrual "
+        "depreciation payroll tax capital margin cashflow vendor payment "
+        "procurement reimbursement"
+    ).split(),
+    "HR": (
+        "onboarding benefits leave vacation performance promotion hiring "
+        "interview compensation training handbook conduct grievance wellness "
+        "relocation contract probation"
+    ).split(),
+    "Legal": (
+        "contract liability compliance regulation clause indemnity litigation "
+        "trademark patent confidentiality agreement jurisdiction arbitration "
+        "privacy consent retention"
+    ).split(),
+    "Sales": (
+        "pipeline lead opportunity quota discount pricing renewal churn "
+        "territory forecast account partner proposal demo onboarding "
+        "upsell commission"
+    ).split(),
+    "shared": (
+        "office security password badge travel expense holiday calendar "
+        "emergency evacuation network printer helpdesk laptop vpn "
+        "cafeteria parking"
+    ).split(),
+}
+
+IDENTIFIER_PREFIX = {
+    "Engineering": "ENG",
+    "AI": "AIX",
+    "Finance": "FIN",
+    "HR": "HRP",
+    "Legal": "LGL",
+    "Sales": "SLS",
+    "shared": "GEN",
+}
+
+
+def _weighted(rng: random.Random, choices: List[Tuple]) -> object:
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def random_metadata(rng: random.Random) -> Dict:
+    return {
+        "owner_department": _weighted(rng, DEPARTMENTS),
+        "min_role_level": _weighted(rng, ROLE_LEVELS),
+        "min_clearance_level": _weighted(rng, CLEARANCE_LEVELS),
+    }
+
+
+def identifier(rng: random.Random, department: str) -> str:
+    """
+    Part number / error code style token, e.g. ENG-4821.
+    """
+    return f"{IDENTIFIER_PREFIX[department]}-{rng.randint(1000, 9999)}"
+
+
+def sentence(rng: random.Random, department: str) -> str:
+    topic = TOPIC_WORDS[department]
+    words = [
+        rng.choice(topic) if rng.random() < 0.45 else rng.choice(COMMON_WORDS)
+        for _ in range(rng.randint(8, 18))
+    ]
+    if rng.random() < 0.15:
+        words.insert(rng.randrange(len(words)), identifier(rng, department))
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraph(rng: random.Random, department: str, chars: int) -> str:
+    parts: List[str] = []
+    size = 0
+    while size < chars:
+        parts.append(sentence(rng, department))
+        size += len(parts[-1]) + 1
+    return " ".join(parts)
+
+
+def synthetic_documents(count: int, pages: int, seed: int = 0) -> Iterator[Dict]:
+    """
+    `count` documents of `pages` pages (~1.8k characters each), with
+    the department / role / clearance mix above. Deterministic per seed.
+
+    Yields {"filename", "metadata", "pages"}.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        metadata = random_metadata(rng)
+        department = metadata["owner_department"]
+        yield {
+            "filename": f"bench-{department.lower()}-{i:04d}.pdf",
+            "metadata": metadata,
+            "pages": [paragraph(rng, department, 1800) for _ in range(pages)],
+        }
+
+
+def synthetic_chunks(count: int, seed: int = 0, start: int = 0) -> Iterator[Dict]:
+    """
+    Chunk-sized records (~900 characters, like app.admin.ingest) for
+    filling a collection directly without PDF extraction.
+
+    Yields {"id", "content", "metadata"}; ids start at `start`.
+    """
+    rng = random.Random(f"{seed}:{start}")
+    per_source = 10
+    metadata = None
+    for i in range(start, start + count):
+        if metadata is None or i % per_source == 0:
+            metadata = random_metadata(rng)
+            source = f"bench-chunks-{i // per_source:06d}.pdf"
+        department = metadata["owner_department"]
+        yield {
+            "id": f"bench-{i:08d}",
+            "content": paragraph(rng, department, 900),
+            "metadata": {
+                **metadata,
+                "source": source,
+                "page_start": i % per_source + 1,
+                "page_end": i % per_source + 1,
+            },
+        }
+
+
+def synthetic_queries(count: int, seed: int = 0) -> Iterator[Tuple[str, str]]:
+    """
+    (department, question) pairs; some carry an identifier so the
+    lexical path is exercised too.
+    """
+    rng = random.Random(f"queries:{seed}")
+    for _ in range(count):
+        department = _weighted(rng, DEPARTMENTS)
+        words = rng.sample(TOPIC_WORDS[department], rng.randint(3, 5))
+        question = f"How is {' '.join(words[:-1])} handled for {words[-1]}?"
+        if rng.random() < 0.2:
+            question = f"{identifier(rng, department)} {question}"
+        yield department, question
+
+
+def _pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages: List[str], line_chars: int = 95):
+    """
+    Minimal text PDF (Helvetica, one content stream per page) that
+    pypdf extracts back to the same words.
+    """
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = 1 + 2 * len(pages) + 1
+
+    page_ids = []
+    for text in pages:
+        lines = textwrap.wrap(text, line_chars) or [""]
+        ops = ["BT /F1 9 Tf 36 806 Td 11 TL"]
+        ops.extend(f"({_pdf_string(line)}) Tj T*" for line in lines)
+        ops.append("ET")
+        stream = zlib.compress("\n".join(ops).encode("latin-1", "replace"))
+        content_id = add(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)
+            + stream
+            + b"\nendstream"
+        )
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 612 842] "
+            f"/Contents {content_id} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>".encode()
+        ))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    assert add(f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()) == pages_id
+    catalog_id = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(out)
@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Sequence
+
+import numpy as np
+
+# Same size as sentence-transformers/all-mpnet-base-v2.
+EMBEDDING_DIM = 768
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9\-]*")
+
+# Carry no topic, like in a trained embedding model.
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from how in is it of on or "
+    "say the this to what when where which who why with handled".split()
+)
+
+
+def _word_vector(word: str) -> np.ndarray:
+    """
+    Sparse signed vector of one word: 4 hashed dimensions.
+    """
+    digest = hashlib.blake2b(word.encode("utf-8"), digest_size=16).digest()
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for i in range(4):
+        index = int.from_bytes(digest[i * 4:i * 4 + 3], "little") % EMBEDDING_DIM
+        vector[index] += 1.0 if digest[i * 4 + 3] & 1 else -1.0
+    return vector
+
+
+class FakeEmbedder:
+    """
+    Deterministic stand-in for the HF / ONNX embedding backends.
+
+    A text is the normalized sum of its hashed words, so texts that
+    share vocabulary are close (retrieval behaves plausibly) and the
+    same text always gets the same vector.
+
+    Every backend call sleeps `latency_ms` plus `per_text_ms` per text,
+    like one remote batch request.
+    """
+
+    def __init__(self, latency_ms: float = 20.0, per_text_ms: float = 0.5):
+        self.latency_ms = latency_ms
+        self.per_text_ms = per_text_ms
+        self.calls = 0
+        self.texts = 0
+        self._words = {}
+        self._lock = threading.Lock()
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+        for word in _WORD.findall(text.lower()):
+            if word in _STOPWORDS:
+                continue
+            word_vector = self._words.get(word)
+            if word_vector is None:
+                word_vector = self._words.setdefault(word, _word_vector(word))
+            vector += word_vector
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _delay(self, count: int) -> float:
+        with self._lock:
+            self.calls += 1
+            self.texts += count
+        return (self.latency_ms + self.per_text_ms * count) / 1000.0
+
+    def embed_batch(self, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        texts = list(texts)
+        time.sleep(self._delay(len(texts)))
+        if not texts:
+            return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        return np.vstack([self._vector(text) for text in texts])
+
+    async def aembed_batch(self, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        texts = list(texts)
+        await asyncio.sleep(self._delay(len(texts)))
+        if not texts:
+            return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        return np.vstack([self._vector(text) for text in texts])
+
+    def install(self):
+        """
+        Routes app.embeddings.embedder through this fake (both the sync
+        and the async backend hooks); the embedding cache still applies.
+        """
+        from app.embeddings import embedder
+
+        embedder._backend_embed_batch = lambda: self.embed_batch
+        embedder._abackend_embed_batch = self.aembed_batch
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        messages = body.get("messages") or [{"content": ""}]
+        seed = hashlib.sha1(messages[-1]["content"].encode("utf-8")).hexdigest()[:8]
+        words = [f"answer-{seed}"] + ["grounded"] * (server.answer_tokens - 1)
+
+        with server.lock:
+            server.requests += 1
+
+        time.sleep(server.latency_ms / 1000.0)
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for word in words:
+                time.sleep(server.per_token_ms / 1000.0)
+                chunk = {
+                    "id": f"bench-{seed}",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": body.get("model", "bench"),
+                    "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+            return
+
+        time.sleep(server.per_token_ms * len(words) / 1000.0)
+        payload = json.dumps({
+            "id": f"bench-{seed}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body.get("model", "bench"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": " ".join(words)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(words), "total_tokens": len(words)},
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeLLMServer:
+    """
+    Local OpenAI-compatible chat completions endpoint standing in for
+    Groq (the Groq SDK is pointed at it through GROQ_BASE_URL).
+
+    Each completion waits `latency_ms` (time to first token) plus
+    `per_token_ms` per generated token; the answer is derived from the
+    prompt, so it is deterministic.
+    """
+
+    def __init__(self, latency_ms: float = 300.0, per_token_ms: float = 2.0, answer_tokens: int = 40):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+        self._server.daemon_threads = True
+        self._server.latency_ms = latency_ms
+        self._server.per_token_ms = per_token_ms
+        self._server.answer_tokens = max(1, answer_tokens)
+        self._server.requests = 0
+        self._server.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="fake-llm",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+SCENARIOS = ("ingest", "retrieval", "query")
+
+# App settings recorded with every result (they change what is measured).
+RECORDED_SETTINGS = (
+    "CHROMA_PARTITIONED",
+    "LEXICAL_ENABLED",
+    "RERANK_ENABLED",
+    "EMBED_CACHE_ENABLED",
+    "ANSWER_CACHE_ENABLED",
+    "MERGE_ADJACENT_CHUNKS",
+    "PROMPT_CONTEXT_TOKENS",
+    "CHROMA_WRITE_BATCH_SIZE",
+    "CHROMA_MAX_WORKERS",
+    "EMBED_BATCH_SIZE",
+)
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Offline benchmarks with fake embedding / LLM backends.",
+    )
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--workdir", help="scratch data directory (default: a temp dir, removed afterwards)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="small sizes, for a smoke run")
+
+    parser.add_argument("--ingest-docs", type=int, default=6)
+    parser.add_argument("--ingest-pages", type=int, default=40)
+
+    parser.add_argument("--sizes", default="1000,5000,20000",
+                        help="corpus sizes (chunks) for the retrieval scenario")
+    parser.add_argument("--retrieval-queries", type=int, default=200)
+
+    parser.add_argument("--query-requests", type=int, default=300)
+    parser.add_argument("--query-concurrency", type=int, default=8)
+
+    parser.add_argument("--embed-latency-ms", type=float, default=20.0)
+    parser.add_argument("--embed-per-text-ms", type=float, default=0.5)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-per-token-ms", type=float, default=2.0)
+
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.ingest_docs, args.ingest_pages = 2, 8
+        args.sizes = "500,2000"
+        args.retrieval_queries = 50
+        args.query_requests = 40
+
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    args.sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    return args
+
+
+def _isolate(workdir: str, llm_base_url: str):
+    """
+    Points every piece of app state at `workdir` and the LLM client at
+    the fake server. Must run before anything under app/ is imported.
+    """
+    os.environ["DATA_DIR"] = os.path.join(workdir, "data")
+    os.environ["SAMPLES_DIR"] = os.path.join(workdir, "samples")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(workdir, "data", "users.db")
+    os.environ["GROQ_BASE_URL"] = llm_base_url
+    os.environ["GROQ_API_KEY"] = "benchmark"
+
+    os.makedirs(os.environ["DATA_DIR"], exist_ok=True)
+    os.makedirs(os.environ["SAMPLES_DIR"], exist_ok=True)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from .fakes import FakeEmbedder, FakeLLMServer
+
+    llm = FakeLLMServer(
+        latency_ms=args.llm_latency_ms,
+        per_token_ms=args.llm_per_token_ms,
+    ).start()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="llm-se-bench-")
+    _isolate(workdir, llm.base_url)
+
+    import app.config as config
+    from app.audit.logger import close_audit_writer
+    from app.db.init_db import init_db
+    from app.db.seed import seed_users_if_empty
+
+    from . import scenarios
+
+    embedder = FakeEmbedder(
+        latency_ms=args.embed_latency_ms,
+        per_text_ms=args.embed_per_text_ms,
+    )
+    embedder.install()
+
+    init_db()
+    seed_users_if_empty()
+
+    commit = _git("rev-parse", "HEAD")
+    results = {
+        "schema_version": 1,
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--", ".")),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "workdir")},
+        "settings": {name: getattr(config, name) for name in RECORDED_SETTINGS},
+        "scenarios": {},
+    }
+
+    started = time.perf_counter()
+    try:
+        if "ingest" in args.scenarios:
+            print("⏱️ ingest ...")
+            results["scenarios"]["ingest"] = scenarios.ingest_scenario(
+                args.ingest_docs, args.ingest_pages, args.seed, embedder,
+            )
+            print("✅ ingest:", results["scenarios"]["ingest"])
+
+        if "retrieval" in args.scenarios:
+            print("⏱️ retrieval ...")
+            results["scenarios"]["retrieval"] = scenarios.retrieval_scenario(
+                args.sizes, args.retrieval_queries, args.seed,
+            )
+
+        if "query" in args.scenarios:
+            from app.main import app
+
+            print("⏱️ query ...")
+            results["scenarios"]["query"] = scenarios.query_scenario(
+                app, args.query_requests, args.query_concurrency, args.seed, llm,
+            )
+            print("✅ query:", results["scenarios"]["query"])
+    finally:
+        close_audit_writer()
+        llm.stop()
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results["seconds"] = round(time.perf_counter() - started, 3)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit[:12] or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    print("📄 Results written to", output)
+    return results
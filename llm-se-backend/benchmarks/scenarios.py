@@ -0,0 +1,261 @@
+import asyncio
+import os
+import random
+import time
+from typing import Dict, List
+
+import httpx
+import numpy as np
+
+from app.admin.ingest import run_pdf_ingest
+from app.config import CHROMA_WRITE_BATCH_SIZE, LEXICAL_ENABLED, SAMPLES_DIR
+from app.db.database import SessionLocal
+from app.db.models import User
+from app.retrieval.corpus import bump_corpus_version
+from app.retrieval.lexical import get_lexical_index
+from app.retrieval.partitions import corpus_count, write_collection
+from app.retrieval.retrieve import retrieve_authorized_documents
+
+from .corpus import DEPARTMENTS, synthetic_chunks, synthetic_documents, synthetic_queries, write_pdf
+from .fakes import FakeEmbedder
+
+# (role_level, clearance_level) of the benchmark users in every department.
+USER_LEVELS = [(1, 1), (2, 2), (3, 3)]
+
+
+def latency_summary(samples_ms: List[float]) -> Dict:
+    if not samples_ms:
+        return {"count": 0}
+
+    values = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def bench_users() -> List[Dict]:
+    return [
+        {
+            "username": f"bench_{department.lower()}_{role_level}{clearance_level}",
+            "department": department,
+            "role_level": role_level,
+            "clearance_level": clearance_level,
+        }
+        for department, _ in DEPARTMENTS
+        for role_level, clearance_level in USER_LEVELS
+    ]
+
+
+def seed_bench_users() -> List[Dict]:
+    users = bench_users()
+    db = SessionLocal()
+    try:
+        existing = {u.username for u in db.query(User.username).all()}
+        for user in users:
+            if user["username"] not in existing:
+                db.add(User(**user))
+        db.commit()
+    finally:
+        db.close()
+    return users
+
+
+def _users_by_department(users: List[Dict]) -> Dict[str, List[Dict]]:
+    grouped: Dict[str, List[Dict]] = {}
+    for user in users:
+        grouped.setdefault(user["department"], []).append(user)
+    return grouped
+
+
+def ingest_scenario(documents: int, pages: int, seed: int, embedder: FakeEmbedder) -> Dict:
+    """
+    run_pdf_ingest (the work behind POST /admin/ingest/pdf) over
+    freshly generated PDFs: pages and chunks per second end to end.
+    """
+    docs = list(synthetic_documents(documents, pages, seed=seed))
+    for doc in docs:
+        write_pdf(os.path.join(SAMPLES_DIR, doc["filename"]), doc["pages"])
+
+    calls_before = embedder.calls
+    per_document_ms = []
+    totals = {"pages": 0, "chunks": 0}
+
+    started = time.perf_counter()
+    for doc in docs:
+        t0 = time.perf_counter()
+        result = run_pdf_ingest(doc["filename"], doc["metadata"])
+        per_document_ms.append((time.perf_counter() - t0) * 1000)
+        totals["pages"] += result["pages"]
+        totals["chunks"] += result["chunks_total"]
+    elapsed = time.perf_counter() - started
+
+    return {
+        "documents": len(docs),
+        "pages": totals["pages"],
+        "chunks": totals["chunks"],
+        "seconds": round(elapsed, 3),
+        "pages_per_s": round(totals["pages"] / elapsed, 2),
+        "chunks_per_s": round(totals["chunks"] / elapsed, 2),
+        "embed_calls": embedder.calls - calls_before,
+        "per_document": latency_summary(per_document_ms),
+    }
+
+
+def fill_corpus(target: int, seed: int) -> int:
+    """
+    Adds synthetic chunks (embedded without simulated latency) until
+    the corpus holds `target` chunks. Returns the number added.
+    """
+    missing = target - corpus_count()
+    if missing <= 0:
+        return 0
+
+    vectors = FakeEmbedder(latency_ms=0, per_text_ms=0)
+    lexical = get_lexical_index() if LEXICAL_ENABLED else None
+    start = target - missing
+
+    batch: List[Dict] = []
+
+    def flush():
+        groups: Dict[str, List] = {}
+        for chunk in batch:
+            collection = write_collection(chunk["metadata"])
+            groups.setdefault(collection.name, [collection, []])[1].append(chunk)
+
+        for collection, chunks in groups.values():
+            texts = [c["content"] for c in chunks]
+            collection.add(
+                ids=[c["id"] for c in chunks],
+                documents=texts,
+                embeddings=vectors.embed_batch(texts),
+                metadatas=[c["metadata"] for c in chunks],
+            )
+            if lexical is not None:
+                lexical.add([c["id"] for c in chunks], texts, [c["metadata"] for c in chunks])
+        batch.clear()
+
+    for chunk in synthetic_chunks(missing, seed=seed, start=start):
+        batch.append(chunk)
+        if len(batch) >= CHROMA_WRITE_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+    bump_corpus_version()
+    return missing
+
+
+def retrieval_scenario(sizes: List[int], queries: int, seed: int) -> Dict:
+    """
+    retrieve_authorized_documents latency as the corpus grows. Query
+    embeddings are computed up front, so the numbers cover the RBAC
+    filtered vector search (+ BM25 fusion), not the embedding call.
+    """
+    users = _users_by_department(bench_users())
+    vectors = FakeEmbedder(latency_ms=0, per_text_ms=0)
+    rng = random.Random(f"retrieval:{seed}")
+
+    workload = []
+    for department, question in synthetic_queries(queries, seed=seed):
+        workload.append((question, rng.choice(users[department]), vectors.embed_batch([question])[0]))
+
+    results = []
+    for size in sorted(sizes):
+        t0 = time.perf_counter()
+        added = fill_corpus(size, seed)
+        fill_seconds = time.perf_counter() - t0
+
+        for question, user, embedding in workload[:5]:
+            retrieve_authorized_documents(question, user, query_embedding=embedding)
+
+        samples_ms = []
+        returned = 0
+        for question, user, embedding in workload:
+            t0 = time.perf_counter()
+            docs = retrieve_authorized_documents(question, user, query_embedding=embedding)
+            samples_ms.append((time.perf_counter() - t0) * 1000)
+            returned += len(docs)
+
+        results.append({
+            "corpus_chunks": corpus_count(),
+            "chunks_added": added,
+            "fill_seconds": round(fill_seconds, 3),
+            "avg_documents": round(returned / max(1, len(workload)), 2),
+            "latency": latency_summary(samples_ms),
+        })
+        print(f"📏 retrieval @ {results[-1]['corpus_chunks']} chunks:", results[-1]["latency"])
+
+    return {"queries": len(workload), "sizes": results}
+
+
+async def _run_queries(app, requests: List[Dict], concurrency: int) -> Dict:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    samples_ms: List[float] = []
+    outcomes: Dict[str, int] = {}
+    cached = 0
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+
+        async def one(item):
+            nonlocal cached
+            async with semaphore:
+                t0 = time.perf_counter()
+                response = await client.post(
+                    "/query",
+                    headers={"Authorization": f"Bearer {item['username']}"},
+                    json={"request_id": item["request_id"], "query": item["query"]},
+                )
+                samples_ms.append((time.perf_counter() - t0) * 1000)
+
+            if response.status_code != 200:
+                outcome = f"http_{response.status_code}"
+            else:
+                body = response.json()
+                outcome = body["type"]
+                cached += bool(body.get("data", {}).get("cached"))
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(item) for item in requests))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(requests),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(requests) / elapsed, 2),
+        "outcomes": outcomes,
+        "cached": cached,
+        "latency": latency_summary(samples_ms),
+    }
+
+
+def query_scenario(app, requests: int, concurrency: int, seed: int, llm) -> Dict:
+    """
+    POST /query end to end (auth, embedding, retrieval, decision,
+    prompt packing, LLM, audit) through the ASGI app in-process:
+    p50 / p95 / p99 under `concurrency` concurrent clients.
+    """
+    users = _users_by_department(seed_bench_users())
+    rng = random.Random(f"query:{seed}")
+
+    workload = [
+        {
+            "request_id": f"bench-{i}",
+            "query": question,
+            "username": rng.choice(users[department])["username"],
+        }
+        for i, (department, question) in enumerate(synthetic_queries(requests, seed=seed + 1))
+    ]
+
+    llm_before = llm.requests
+    result = asyncio.run(_run_queries(app, workload, concurrency))
+    result["llm_calls"] = llm.requests - llm_before
+    return result
@@ -16,11 +16,15 @@ interface IngestForm {
   min_clearance_level: number;
 }
 
+// Rows per /admin/documents page.
+const PAGE_SIZE = 50;
 
 export default function AdminDocs() {
   const navigate = useNavigate();
 
   const [documents, setDocuments] = useState<DocumentRow[]>([]);
+  const [page, setPage] = useState(1);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
 
@@ -47,9 +51,10 @@ export default function AdminDocs() {
     setError("");
 
     try {
-      const res = await fetch(`${API_BASE}/admin/documents`, {
-        headers: { Authorization: `Bearer ${token}` },
-      });
+      const res = await fetch(
+        `${API_BASE}/admin/documents?page=${page}&page_size=${PAGE_SIZE}`,
+        { headers: { Authorization: `Bearer ${token}` } }
+      );
 
       if (!res.ok) throw new Error("Failed to fetch documents");
 
@@ -66,14 +71,27 @@ export default function AdminDocs() {
         })
       );
 
+      const count: number = data?.total ?? rows.length;
+      const lastPage = Math.max(1, Math.ceil(count / PAGE_SIZE));
+
+      // Page emptied by a delete → step back to the new last page
+      if (page > lastPage) {
+        setPage(lastPage);
+        return;
+      }
+
       setDocuments(rows);
+      setTotal(count);
     } catch (e: any) {
       setError(e.message || "Failed to fetch documents");
       setDocuments([]);
+      setTotal(0);
     } finally {
       setLoading(false);
     }
-  }, [token]);
+  }, [token, page]);
+
+  const pageCount = Math.max(1, Math.ceil(total / PAGE_SIZE));
 
   useEffect(() => {
     if (token) fetchDocuments();
@@ -303,6 +321,27 @@ export default function AdminDocs() {
           </table>
         </div>
       )}
+
+      {/* PAGINATION */}
+      <div style={styles.pager}>
+        <button
+          style={styles.backBtn}
+          disabled={loading || page <= 1}
+          onClick={() => setPage(page - 1)}
+        >
+          ← Prev
+        </button>
+        <span>
+          Page {page} of {pageCount} · {total} documents
+        </span>
+        <button
+          style={styles.backBtn}
+          disabled={loading || page >= pageCount}
+          onClick={() => setPage(page + 1)}
+        >
+          Next →
+        </button>
+      </div>
     </div>
   );
 }
@@ -394,6 +433,14 @@ const styles: Record<string, React.CSSProperties> = {
     borderRadius: 4,
     cursor: "pointer",
   },
+  pager: {
+    display: "flex",
+    alignItems: "center",
+    justifyContent: "flex-end",
+    gap: "1rem",
+    marginTop: "1rem",
+    color: "#9ca3af",
+  },
   empty: {
     textAlign: "center",
     padding: "1.5rem",